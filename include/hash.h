@@ -29,9 +29,49 @@ void init_hash(void);
 
 unsigned long long get_keylength(unsigned long long inlen);
 
+unsigned long long get_outputsize(void);
+
+// Returns the number of key bytes hash reads for a message of inlen bytes.
+// Configurations with a key generator need a key that grows with the message,
+// the others a fixed key of NUM_KEYS keys.
+unsigned long long hash_keylength(unsigned long long inlen);
+
+// Sets the number of threads used to hash a single large message. Returns -1
+// if the polynomial has no multi-threaded mode, hashing then stays on one
+// thread. The setting applies to all later calls.
+int hash_set_threads(unsigned int threads);
+
 void hash(unsigned char *out, const unsigned char *in, unsigned long long inlen,
           unsigned char *key, unsigned long long keylen);
 
+// Hashes count messages under the same key. Polynomials with a batched variant
+// (POLY_EVAL_MANY) unpack (and precompute) the key only once, the others are
+// evaluated once per message. Tag i is written to out + i * CRYPTO_HASH.
+void hash_many(unsigned char *out, const unsigned char *const *in,
+               const unsigned long long *inlen, unsigned long long count,
+               const unsigned char *key, unsigned long long keylen);
+
+// Same as hash_many for messages stored back to back in one buffer, message i
+// is in[offsets[i]] to in[offsets[i + 1] - 1] (offsets has count + 1 entries).
+void hash_many_packed(unsigned char *out, const unsigned char *in,
+                      const unsigned long long *offsets,
+                      unsigned long long count, const unsigned char *key,
+                      unsigned long long keylen);
+
+// Incremental interface for messages that arrive in pieces. hash_init returns
+// NULL if the state could not be allocated, or with errno set to ENOSYS if the
+// polynomial has no streaming form. hash_final writes the tag and frees the
+// state. The key must stay valid until hash_final. hash_update returns 0 on
+// success.
+typedef struct hash_state hash_state_t;
+
+hash_state_t *hash_init(const unsigned char *key, unsigned long long keylen);
+
+int hash_update(hash_state_t *state, const unsigned char *in,
+                unsigned long long inlen);
+
+void hash_final(hash_state_t *state, unsigned char *out);
+
 int hash_verify(unsigned char *out, const unsigned char *in,
                 unsigned long long inlen, const unsigned char *key);
 
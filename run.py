@@ -25,26 +25,26 @@
 
 import os
 import sys
+import importlib.util
 import subprocess
 import unittest
 import textwrap
 from datetime import datetime
 from warnings import warn
 from math import ceil
+from functools import partial
 from pathlib import Path
 from typing import Callable, Optional
 
-from cpuinfo import get_cpu_info
-
-from tests.test_binary_field_arithmetic import TestArith as BFTestArith
-from tests.test_prime_field_arithmetic import TestArith as PFTestArith
-from tests.transform import MessageTransform
-import src.plot_results as pltrs
+from tests.transform import MessageTransform, KeyTransform, identity
 from src.length_encoding import length_encoding_settings
 from src.settings import Settings
 from src.field_arithmetic.bf_polynomial_coeffs import polynomials
 from src.reference_params import reference_params
+from src.build_cache import BuildCache
+from src.build_jobs import BuildJob, run_builds
 from src.field_arithmetic.generate_field_arithmetic import (
+    ArithmeticGenerator,
     BinaryFieldArithmeticGenerator,
     MersenneArithmeticGenerator,
     CrandallArithmeticGenerator,
@@ -58,6 +58,7 @@ from src.framework_encodings import (
 )
 from src.config_parser import LegacyParser, ConfigParser, ParsingError
 from src.config_spec import (
+    Config,
     ConfigurationFile,
     FieldSpec,
     InnerPolynomialSpec,
@@ -70,7 +71,7 @@ from src.config_spec import (
     is_CrandallPrimeFieldSpec,
     is_BinaryFieldSpec,
 )
-from src.util import integer_to_hex
+from src.util import integer_to_hex, cpu_info
 
 config_files: list[str]
 
@@ -90,15 +91,44 @@ def red(s: str) -> str:
     return "\033[91m" + s + "\033[0m"
 
 
-try:
-    import sage
+if settings.replot is not None:
+    # renders the figures of an earlier run from its aggregates, without configs
+    import src.plot_results as pltrs
+
+    try:
+        plot_entries = pltrs.read_manifest(settings.replot)
+    except FileNotFoundError:
+        print(red(f"no {pltrs.MANIFEST} in {settings.replot}"))
+        sys.exit(-1)
+    plot_dir_path = settings.plot_dir / settings.replot.name
+    plot_tasks = pltrs.manifest_tasks(
+        plot_entries,
+        settings.replot,
+        plot_dir_path,
+        title=settings.plot_titles,
+        y_cutoff=settings.plot_y_cutoff,
+        formats=settings.plot_formats,
+        variants=settings.plot_variants,
+    )
+    print(f"rendering {len(plot_tasks)} figures")
+    pltrs.render(
+        plot_tasks,
+        processes=settings.plot_processes,
+        show_plots=settings.show_plots,
+        latex=settings.latex,
+        fontsize=settings.fontsize,
+    )
+    print(f"Plots saved in: {plot_dir_path}")
+    sys.exit(0)
+
+
+def generate_arithmetic(
+    path: str, generator: type[ArithmeticGenerator], **kwargs
+) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as outfile:
+        generator(file=outfile, **kwargs).print_fieldmul()
 
-    os.system("sage --preparse tests/polynomial.sage")
-    settings.sage = True
-except ModuleNotFoundError:
-    warn(yellow("Could not find Sage. Full integration tests will be skipped!"))
-finally:
-    from tests.test_polynomial import *
 
 if len(config_files) == 0:
     config_files.append("config")
@@ -131,6 +161,39 @@ if settings.convert:
 if settings.convert_only:
     sys.exit(0)
 
+# the reference implementations are loaded once the first hash test runs
+settings.sage = importlib.util.find_spec("sage") is not None
+if settings.test and settings.test_hash and not settings.sage:
+    warn(
+        yellow(
+            "Could not find Sage. Hash tests use the pure Python reference implementations!"
+        )
+    )
+
+# the test modules and the plotting stack are only imported for enabled phases
+if settings.test and settings.test_arith:
+    from tests.test_binary_field_arithmetic import TestArith as BFTestArith
+    from tests.test_prime_field_arithmetic import TestArith as PFTestArith
+if settings.test and settings.test_hash:
+    from tests.test_polynomial import BfPolynomial, PfPolynomial
+if settings.plot:
+    import src.plot_results as pltrs
+if settings.bench and settings.scaling:
+    from src.bench_scaling import bench_scaling
+    from src.hash_library import HashLibrary
+if settings.bench and settings.store:
+    from src.results_store import ResultsStore, compiler_version, host_cpu
+
+    results_store = ResultsStore(settings.bench_dir / "results.sqlite")
+if settings.bench and settings.compare_to is not None:
+    from src.regression import compare_runs, resolve_run, summary, write_report
+
+    try:
+        baseline_dir: Path = resolve_run(settings.compare_to, settings.bench_dir)
+    except FileNotFoundError as err:
+        print(red(str(err)))
+        sys.exit(-1)
+
 
 bench_dir_path: Path = settings.bench_dir
 plot_dir_path: Path = settings.plot_dir
@@ -138,13 +201,30 @@ if settings.bench:
     bench_dir_path = bench_dir_path / Path(timestamp.strftime(DATE_FORMAT))
 if settings.plot:
     plot_dir_path = plot_dir_path / Path(timestamp.strftime(DATE_FORMAT))
+    # the figures are rendered once all benchmarks are done
+    plot_entries: list[dict] = []
 benchdir = f"{bench_dir_path}/"
+if settings.bench:
+    # builds restored from the cache do not run make dir
+    bench_dir_path.mkdir(parents=True, exist_ok=True)
 
-os.system("make clean")
+# a left over shared header would shadow the per-build ones
+Path("src/field_arithmetic/field_arithmetic.h").unlink(missing_ok=True)
+has_clang_format: bool = os.system("which clang-format > /dev/null") == 0
+build_jobs: list[BuildJob] = []
+planned_configs: list[
+    tuple[
+        ConfigurationFile,
+        Path,
+        list[tuple[int, Config, BuildJob, unittest.TestSuite, unittest.TestSuite]],
+    ]
+] = []
 for config, file in configs:
     print(f"Starting with {file}")
-    linenums: list[int] = []
-    labels: list[str] = []
+    planned: list[
+        tuple[int, Config, BuildJob, unittest.TestSuite, unittest.TestSuite]
+    ] = []
+    planned_configs.append((config, file, planned))
     for config_number, current_config in enumerate(config.configurations):
         if current_config.skip:
             print(f"Skipping config: {file}:{config_number}: {current_config.name}")
@@ -152,17 +232,26 @@ for config, file in configs:
         make_cmd: list[str] = ["make"]
         hash_TestSuite = unittest.TestSuite()
         arithmetic_TestSuite = unittest.TestSuite()
+        generate: Optional[Callable[[], None]] = None
         ccflag: str = ""
         if settings.tune:
             ccflag += "-mtune=native"
         print(f"Working on config: {file}:{config_number}: {current_config.name}")
-        linenums.append(config_number)
         make_cmd.append(f"BENCHDIR={benchdir}")
         macro_defs: list[str] = []
         ref = False
         macro_defs.append(f"-DREPETITIONS={settings.iterations}")
         macro_defs.append(f"-DMAXINPUTSIZE={settings.max_message_size}")
         macro_defs.append(f"-DSTEPSIZE={settings.stepsize}")
+        if settings.adaptive_ci is not None:
+            macro_defs.append(f"-DBENCH_CI={settings.adaptive_ci}")
+            macro_defs.append(f"-DBENCH_TIME_BUDGET={settings.time_budget}")
+        if settings.perf_counters:
+            macro_defs.append("-DPERF_COUNTERS")
+            if settings.uops_event is not None:
+                macro_defs.append(f"-DPERF_UOPS_EVENT={settings.uops_event}")
+        if settings.message_pool:
+            macro_defs.append(f"-DMESSAGE_POOL={settings.message_pool}")
         if settings.ctgrind:
             make_cmd.append("USE_CTGRIND=0")
         additional_includes = map(
@@ -171,12 +260,12 @@ for config, file in configs:
         )
         make_cmd.append('ADDDEPS="' + " ".join(additional_includes) + '"')
         if is_ReferenceConfig(current_config):
-            labels.append(current_config.name)
             ref = True
             key: str = f"{current_config.lib}_{current_config.mac}"
             if current_config.implementation is not None:
                 key += f"_{current_config.implementation}"
-            macro_defs.append(f'-DBLOCKSIZE={reference_params[key]["blocksize"]}')
+            blocksize: int = reference_params[key]["blocksize"]
+            macro_defs.append(f"-DBLOCKSIZE={blocksize}")
             macro_defs.append(f'-DKEYSIZE={reference_params[key]["keysize"]}')
             macro_defs.append(f'-DOUTPUTSIZE={reference_params[key]["outputsize"]}')
             macro_defs.append(f"-DNUM_KEYS=1")
@@ -193,7 +282,8 @@ for config, file in configs:
                     macro_defs.append(
                         f"-DMAX_RAND_BYTES={current_config.keygenerator.number_of_bytes}"
                     )
-            macro_defs.append(f"-DBLOCKSIZE={current_config.blocksize}")
+            blocksize = current_config.blocksize
+            macro_defs.append(f"-DBLOCKSIZE={blocksize}")
             macro_defs.append(f"-DKEYSIZE={current_config.keysize}")
             macro_defs.append(f"-DOUTPUTSIZE={current_config.tagsize}")
             wordsize = current_config.wordsize
@@ -329,7 +419,6 @@ for config, file in configs:
                 innerpoly_name = None
                 superblocksize = None
                 superkeysize = None
-            labels.append(current_config.name)
             field: FieldSpec = current_config.field
             multiplication_options: list[
                 MultiplicationOptions
@@ -349,76 +438,52 @@ for config, file in configs:
                     delta: int = field.delta
                     buffsize: int = ceil(pi / wordsize) * 8
                     macro_defs.append(f"-DBUFFSIZE={buffsize}")
-                    print("generating Field Arithmetic")
-                    with open(
-                        f"src/field_arithmetic/pf_arithmetic_{prime_type}_"
+                    arithmetic_path = (
+                        f"obj/{binname}/pf_arithmetic_{prime_type}_"
                         + f"{pi}_{delta}_"
                         + "_".join(map(str, current_config.limbs))
-                        + f"_{current_config.wordsize}_{method}.h",
-                        "w",
-                        encoding="utf-8",
-                    ) as outfile:
-                        if (
-                            current_config.multiplication.option == "precompute"
-                            or "precompute" in multiplication_options
-                        ):
-                            make_cmd.append("PC=_pc")
-                            arithGen = PrecomputingCrandallArithmeticGenerator(
-                                pi=pi,
-                                delta=delta,
-                                limbbits=limbbits,
-                                num_limbs=num_limbs,
-                                wordsize=wordsize,
-                                buffsize=buffsize,
-                                file=outfile,
-                                blocksize=current_config.blocksize,
-                                keysize=current_config.keysize,
-                                explicitKeyTransform=explicitKeyTransform,
-                                encodingMSB=encodingMSB,
-                                lowerEncode=lowerEncode,
-                                lastOnlyEnc=lastOnlyEnc,
-                                encodingMask=encodingMask,
-                                explicitEncoding=explicitEncoding,
-                                nocheck=not settings.check_overflow,
-                                doublecarry="doublecarry" in multiplication_options,
-                                doublecarryover="doublecarryover"
-                                in multiplication_options,
-                                doublecarry_temp="doublecarrytemp"
-                                in multiplication_options,
-                                keyClamp=key_clamp_mask,
-                            )
-                        else:
-                            make_cmd.append("PC=")
-                            arithGen = CrandallArithmeticGenerator(
-                                pi=pi,
-                                delta=delta,
-                                limbbits=limbbits,
-                                num_limbs=num_limbs,
-                                wordsize=wordsize,
-                                buffsize=buffsize,
-                                file=outfile,
-                                blocksize=current_config.blocksize,
-                                keysize=current_config.keysize,
-                                explicitKeyTransform=explicitKeyTransform,
-                                encodingMSB=encodingMSB,
-                                lowerEncode=lowerEncode,
-                                lastOnlyEnc=lastOnlyEnc,
-                                encodingMask=encodingMask,
-                                explicitEncoding=explicitEncoding,
-                                nocheck=not settings.check_overflow,
-                                doublecarry="doublecarry" in multiplication_options,
-                                doublecarryover="doublecarryover"
-                                in multiplication_options,
-                                doublecarry_temp="doublecarrytemp"
-                                in multiplication_options,
-                                keyClamp=key_clamp_mask,
-                            )
-                        arithGen.print_fieldmul()
+                        + f"_{current_config.wordsize}_{method}.h"
+                    )
+                    if (
+                        current_config.multiplication.option == "precompute"
+                        or "precompute" in multiplication_options
+                    ):
+                        make_cmd.append("PC=_pc")
+                        arithmetic_generator: type[
+                            ArithmeticGenerator
+                        ] = PrecomputingCrandallArithmeticGenerator
+                    else:
+                        make_cmd.append("PC=")
+                        arithmetic_generator = CrandallArithmeticGenerator
+                    generate = partial(
+                        generate_arithmetic,
+                        arithmetic_path,
+                        arithmetic_generator,
+                        pi=pi,
+                        delta=delta,
+                        limbbits=limbbits,
+                        num_limbs=num_limbs,
+                        wordsize=wordsize,
+                        buffsize=buffsize,
+                        blocksize=current_config.blocksize,
+                        keysize=current_config.keysize,
+                        explicitKeyTransform=explicitKeyTransform,
+                        encodingMSB=encodingMSB,
+                        lowerEncode=lowerEncode,
+                        lastOnlyEnc=lastOnlyEnc,
+                        encodingMask=encodingMask,
+                        explicitEncoding=explicitEncoding,
+                        nocheck=not settings.check_overflow,
+                        doublecarry="doublecarry" in multiplication_options,
+                        doublecarryover="doublecarryover" in multiplication_options,
+                        doublecarry_temp="doublecarrytemp" in multiplication_options,
+                        keyClamp=key_clamp_mask,
+                    )
                     make_cmd.append(
                         f"PRIMETYPE={prime_type} PI={pi} DELTA={delta} PRIMENAME={pi}_{delta}"
                     )
                     make_cmd.append("pf_arithmetic")
-                    if settings.test_arith:
+                    if settings.test and settings.test_arith:
                         arithmetic_TestSuite.addTests(
                             [
                                 PFTestArith(
@@ -434,6 +499,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_unpack_key",
@@ -448,6 +514,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_unpack_msg",
@@ -462,6 +529,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_mul",
@@ -476,6 +544,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_add",
@@ -490,6 +559,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_add_mix",
@@ -504,6 +574,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_sqr",
@@ -518,6 +589,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_carry_round",
@@ -532,6 +604,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_sqr_no_carry",
@@ -546,6 +619,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_add_dbl",
@@ -560,6 +634,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_mul_no_carry",
@@ -574,6 +649,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_reduce",
@@ -588,6 +664,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                             ]
                         )
@@ -610,6 +687,7 @@ for config, file in configs:
                                         blocksize=current_config.blocksize,
                                         keysize=current_config.keysize,
                                         iterations=settings.numtests,
+                                        batch_size=settings.arith_batch_size,
                                     ),
                                     PFTestArith(
                                         name="test_mul_precomputed_no_carry",
@@ -624,6 +702,7 @@ for config, file in configs:
                                         blocksize=current_config.blocksize,
                                         keysize=current_config.keysize,
                                         iterations=settings.numtests,
+                                        batch_size=settings.arith_batch_size,
                                     ),
                                     PFTestArith(
                                         name="test_sqr_precomputed",
@@ -638,6 +717,7 @@ for config, file in configs:
                                         blocksize=current_config.blocksize,
                                         keysize=current_config.keysize,
                                         iterations=settings.numtests,
+                                        batch_size=settings.arith_batch_size,
                                     ),
                                     PFTestArith(
                                         name="test_sqr_precomputed_no_carry",
@@ -652,10 +732,11 @@ for config, file in configs:
                                         blocksize=current_config.blocksize,
                                         keysize=current_config.keysize,
                                         iterations=settings.numtests,
+                                        batch_size=settings.arith_batch_size,
                                     ),
                                 ]
                             )
-                    if settings.sage and settings.test_hash:
+                    if settings.test and settings.test_hash:
                         if current_config.polynomial.test is None:
                             warn(
                                 yellow(
@@ -689,6 +770,7 @@ for config, file in configs:
                                     key_transform=key_transform,
                                     numtests=settings.numtests,
                                     full_logs=settings.full_logs,
+                                    processes=settings.test_processes,
                                     innerpoly=inner_test_name,
                                     superblocksize=superblocksize,
                                     superkeysize=superkeysize,
@@ -705,41 +787,35 @@ for config, file in configs:
                         exit(-1)
                     buffsize = ceil(pi / wordsize) * 8
                     macro_defs.append(f"-DBUFFSIZE={buffsize}")
-                    print("generating Field Arithmetic")
-                    with open(
-                        f"src/field_arithmetic/mersenne_arithmetic_{prime_type}_"
+                    generate = partial(
+                        generate_arithmetic,
+                        f"obj/{binname}/mersenne_arithmetic_{prime_type}_"
                         + f"{pi}_"
                         + "_".join(map(str, current_config.limbs))
                         + f"_{current_config.wordsize}_{method}.h",
-                        "w",
-                        encoding="utf-8",
-                    ) as outfile:
-                        arithGen = MersenneArithmeticGenerator(
-                            pi=pi,
-                            limbbits=limbbits,
-                            num_limbs=num_limbs,
-                            wordsize=wordsize,
-                            buffsize=buffsize,
-                            blocksize=current_config.blocksize,
-                            keysize=current_config.keysize,
-                            explicitKeyTransform=explicitKeyTransform,
-                            file=outfile,
-                            encodingMSB=encodingMSB,
-                            lowerEncode=lowerEncode,
-                            lastOnlyEnc=lastOnlyEnc,
-                            encodingMask=encodingMask,
-                            explicitEncoding=explicitEncoding,
-                            nocheck=not settings.check_overflow,
-                            doublecarry="doublecarry" in multiplication_options,
-                            doublecarryover="doublecarryover" in multiplication_options,
-                            doublecarry_temp="doublecarrytemp"
-                            in multiplication_options,
-                            keyClamp=key_clamp_mask,
-                        )
-                        arithGen.print_fieldmul()
+                        MersenneArithmeticGenerator,
+                        pi=pi,
+                        limbbits=limbbits,
+                        num_limbs=num_limbs,
+                        wordsize=wordsize,
+                        buffsize=buffsize,
+                        blocksize=current_config.blocksize,
+                        keysize=current_config.keysize,
+                        explicitKeyTransform=explicitKeyTransform,
+                        encodingMSB=encodingMSB,
+                        lowerEncode=lowerEncode,
+                        lastOnlyEnc=lastOnlyEnc,
+                        encodingMask=encodingMask,
+                        explicitEncoding=explicitEncoding,
+                        nocheck=not settings.check_overflow,
+                        doublecarry="doublecarry" in multiplication_options,
+                        doublecarryover="doublecarryover" in multiplication_options,
+                        doublecarry_temp="doublecarrytemp" in multiplication_options,
+                        keyClamp=key_clamp_mask,
+                    )
                     make_cmd.append(f"PRIMETYPE={prime_type} PI={pi} PRIMENAME={pi}")
                     make_cmd.append("mersenne_arithmetic")
-                    if settings.test_arith:
+                    if settings.test and settings.test_arith:
                         arithmetic_TestSuite.addTests(
                             [
                                 PFTestArith(
@@ -755,6 +831,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_unpack_key",
@@ -769,6 +846,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_unpack_msg",
@@ -783,6 +861,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_mul",
@@ -797,6 +876,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_add",
@@ -811,6 +891,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_add_mix",
@@ -825,6 +906,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_sqr",
@@ -839,6 +921,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_carry_round",
@@ -853,6 +936,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_sqr_no_carry",
@@ -867,6 +951,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_add_dbl",
@@ -881,6 +966,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_mul_no_carry",
@@ -895,6 +981,7 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                                 PFTestArith(
                                     name="test_reduce",
@@ -909,10 +996,11 @@ for config, file in configs:
                                     blocksize=current_config.blocksize,
                                     keysize=current_config.keysize,
                                     iterations=settings.numtests,
+                                    batch_size=settings.arith_batch_size,
                                 ),
                             ]
                         )
-                    if settings.sage and settings.test_hash:
+                    if settings.test and settings.test_hash:
                         if current_config.polynomial.test is None:
                             warn(
                                 yellow(
@@ -945,6 +1033,7 @@ for config, file in configs:
                                     transform=message_transform,
                                     key_transform=key_transform,
                                     full_logs=settings.full_logs,
+                                    processes=settings.test_processes,
                                     innerpoly=inner_test_name,
                                     superblocksize=superblocksize,
                                     superkeysize=superkeysize,
@@ -963,9 +1052,8 @@ for config, file in configs:
                 make_cmd.append(f"BINNAME={binname}")
                 make_cmd.append(f"BENCHRESNAME={binname}")
             elif is_BinaryFieldSpec(field):
-                cpu_info = get_cpu_info()
-                if cpu_info["arch"] in ["X86_32", "X86_64"]:
-                    if "pclmulqdq" in cpu_info["flags"]:
+                if cpu_info()["arch"] in ["X86_32", "X86_64"]:
+                    if "pclmulqdq" in cpu_info()["flags"]:
                         ccflag = "-mpclmul"
                 field_size: int = field.size
                 polynomial: list[int] = polynomials[field_size]
@@ -978,35 +1066,30 @@ for config, file in configs:
                     cmulReduction = (
                         "cmulreduction" in current_config.multiplication.options
                     )
-                print("generating Field Arithmetic")
-                with open(
-                    f"src/field_arithmetic/bf_arithmetic_{field.size}_"
+                generate = partial(
+                    generate_arithmetic,
+                    f"obj/{binname}/bf_arithmetic_{field.size}_"
                     + "_".join(map(str, current_config.limbs))
                     + f"_{current_config.wordsize}_{method}.h",
-                    "w",
-                    encoding="utf-8",
-                ) as outfile:
-                    arithGen = BinaryFieldArithmeticGenerator(
-                        polynomial=polynomial,
-                        limbbits=limbbits,
-                        num_limbs=num_limbs,
-                        wordsize=wordsize,
-                        file=outfile,
-                        blocksize=current_config.blocksize,
-                        keysize=current_config.keysize,
-                        explicitKeyTransform=explicitKeyTransform,
-                        encodingMSB=encodingMSB,
-                        lowerEncode=lowerEncode,
-                        lastOnlyEnc=lastOnlyEnc,
-                        encodingMask=encodingMask,
-                        explicitEncoding=explicitEncoding,
-                        cmulReduction=cmulReduction,
-                        keyClamp=key_clamp_mask,
-                    )
-                    arithGen.print_fieldmul()
+                    BinaryFieldArithmeticGenerator,
+                    polynomial=polynomial,
+                    limbbits=limbbits,
+                    num_limbs=num_limbs,
+                    wordsize=wordsize,
+                    blocksize=current_config.blocksize,
+                    keysize=current_config.keysize,
+                    explicitKeyTransform=explicitKeyTransform,
+                    encodingMSB=encodingMSB,
+                    lowerEncode=lowerEncode,
+                    lastOnlyEnc=lastOnlyEnc,
+                    encodingMask=encodingMask,
+                    explicitEncoding=explicitEncoding,
+                    cmulReduction=cmulReduction,
+                    keyClamp=key_clamp_mask,
+                )
                 make_cmd.append("bf_arithmetic")
                 # if '--no_test' not in options:
-                if settings.test_arith:
+                if settings.test and settings.test_arith:
                     arithmetic_TestSuite.addTests(
                         [
                             BFTestArith(
@@ -1095,7 +1178,7 @@ for config, file in configs:
                             ),
                         ]
                     )
-                if settings.sage and settings.test_hash:
+                if settings.test and settings.test_hash:
                     if current_config.polynomial.test is None:
                         warn(
                             yellow("No test polynomial specified. Skipping hash test!")
@@ -1125,6 +1208,7 @@ for config, file in configs:
                                 key_transform=key_transform,
                                 numtests=settings.numtests,
                                 full_logs=settings.full_logs,
+                                processes=settings.test_processes,
                                 innerpoly=inner_test_name,
                                 superblocksize=superblocksize,
                                 superkeysize=superkeysize,
@@ -1162,16 +1246,50 @@ for config, file in configs:
                 else:
                     make_cmd.append("build_arith_test")
                 make_cmd.append("build_lib")
+                make_cmd.append("build_sum")
                 if settings.ctgrind:
                     make_cmd.append("build_ctgrind")
             else:
                 make_cmd.append("build_reference")
-            if os.system("which clang-format > /dev/null") == 0:
+            if has_clang_format:
                 make_cmd.append("pretty_print_intermediary")
-            print("starting Build")
-        if settings.verbose:
-            print(" ".join(make_cmd))
-        failure = os.system(" ".join(make_cmd)) != 0
+        job = BuildJob(
+            name=f"{file.name}_{config_number}",
+            label=current_config.name,
+            binname=binname,
+            make_cmd=make_cmd,
+            generate=generate,
+        )
+        build_jobs.append(job)
+        planned.append(
+            (config_number, current_config, job, arithmetic_TestSuite, hash_TestSuite)
+        )
+
+print("starting Build")
+build_results: dict[str, bool] = run_builds(
+    build_jobs,
+    workers=settings.jobs,
+    verbose=settings.verbose,
+    cache=BuildCache(settings.cache_dir, settings.cache_size)
+    if settings.build and settings.cache
+    else None,
+)
+
+for config, file, planned in planned_configs:
+    linenums: list[int] = []
+    labels: list[str] = []
+    for (
+        config_number,
+        current_config,
+        job,
+        arithmetic_TestSuite,
+        hash_TestSuite,
+    ) in planned:
+        print(f"Evaluating config: {file}:{config_number}: {current_config.name}")
+        binname = job.binname
+        linenums.append(config_number)
+        labels.append(current_config.name)
+        failure = not build_results[job.name]
 
         if settings.ctgrind:
             print("running ctgrind")
@@ -1234,14 +1352,26 @@ for config, file in configs:
             linenums.pop()
             labels.pop()
         else:
+            result_filename: str = f"{benchdir}{file.name}_{config_number}_results.csv"
             if settings.bench:
                 print("starting benchmark")
-                failure = os.system(f"./bin/{binname}_bench") != 0
+                bench_cmd = f"./bin/{binname}_bench"
+                if settings.cpu is not None:
+                    bench_cmd += f" -c {settings.cpu}"
+                if settings.max_drift is not None:
+                    bench_cmd += f" -d {settings.max_drift}"
+                if settings.adaptive_ci is not None:
+                    bench_cmd += (
+                        f" -s {benchdir}{file.name}_{config_number}_repetitions.csv"
+                    )
+                bench_cmd += f" {result_filename}"
+                if settings.raw_samples:
+                    bench_cmd += f" {benchdir}{file.name}_{config_number}_samples.bin"
+                failure = os.system(bench_cmd) != 0
                 if failure:
                     print(yellow("Skipping plot due to failure bench"))
                     linenums.pop()
                     labels.pop()
-            result_filename: str = f"{benchdir}{file.name}_{config_number}_results.csv"
             if settings.bench:
                 with open(result_filename, mode="a") as results_file:
                     print("#", file=results_file)
@@ -1249,45 +1379,101 @@ for config, file in configs:
                         textwrap.indent(current_config.model_dump_json(indent=4), "#"),
                         file=results_file,
                     )
+            if settings.bench and settings.store and not failure:
+                results_store.add(
+                    bench_dir_path.name,
+                    Path(result_filename),
+                    file.name,
+                    config_number,
+                    config_json=current_config.model_dump_json(),
+                    compiler_flags=job.make_variable("CCFLAGS"),
+                    macro_defs=job.make_variable("MDEFS"),
+                    host_cpu=host_cpu(),
+                    compiler=compiler_version(),
+                )
+            if settings.bench and settings.scaling and not failure:
+                print("starting scaling benchmark")
+                if not bench_scaling(
+                    HashLibrary(binname),
+                    Path(f"{benchdir}{file.name}_{config_number}_scaling.csv"),
+                    settings.scaling,
+                    max_size=settings.scaling_max_size,
+                    repetitions=settings.iterations,
+                ):
+                    print(yellow("Polynomial has no multi-threaded mode"))
+            throughput_filename = (
+                f"{benchdir}{file.name}_{config_number}_throughput.csv"
+            )
+            if settings.bench and settings.throughput and not failure:
+                print("starting throughput benchmark")
+                throughput_cmd = f"./bin/{binname}_bench"
+                if settings.cpu is not None:
+                    throughput_cmd += f" -c {settings.cpu}"
+                throughput_cmd += f" -T {settings.throughput}"
+                throughput_cmd += f" -D {settings.throughput_duration}"
+                throughput_cmd += f" -M {settings.throughput_max_size}"
+                throughput_cmd += f" {throughput_filename}"
+                if os.system(throughput_cmd) != 0:
+                    print(yellow("Throughput benchmark failed"))
             if settings.plot and not settings.plot_compare_only and not failure:
                 print("starting plot")
                 keygen = False
                 if is_NewHashConfig(current_config):
                     keygen = current_config.keygenerator.required
-                pltrs.plot(
-                    result_filename,
-                    name=f"{file.name}_{config_number}_{current_config.name}",
-                    show_plots=settings.show_plots,
-                    title=settings.plot_titles,
-                    latex=settings.latex,
-                    maxsize=settings.max_message_size,
-                    fontsize=settings.fontsize,
-                    y_cutoff=settings.plot_y_cutoff,
-                    keygen=keygen,
-                    plot_dir=plot_dir_path,
+                plot_entries.append(
+                    {
+                        "kind": "results",
+                        "results": Path(result_filename).name,
+                        "name": f"{file.name}_{config_number}_{current_config.name}",
+                        "maxsize": settings.max_message_size,
+                        "keygen": keygen,
+                        "blocksize": blocksize,
+                    }
                 )
+                if os.path.exists(throughput_filename):
+                    plot_entries.append(
+                        {
+                            "kind": "throughput",
+                            "results": Path(throughput_filename).name,
+                            "name": f"{file.name}_{config_number}_{current_config.name}",
+                        }
+                    )
     if settings.plot:
         print("starting comparison plot")
         if len(linenums) > 0:
-            plt_title: bool | str = settings.plot_titles
-            if settings.plot_titles and config.name:
-                plt_title = config.name
-            pltrs.plot_compare(
-                linenums,
-                config=file.name,
-                labels=labels,
-                benchdir=benchdir,
-                show_plots=settings.show_plots,
-                title=plt_title,
-                latex=settings.latex,
-                maxsize=settings.max_message_size,
-                fontsize=settings.fontsize,
-                y_cutoff=settings.plot_y_cutoff,
-                plot_dir=plot_dir_path,
+            plot_entries.append(
+                {
+                    "kind": "compare",
+                    "config": file.name,
+                    "linenums": linenums,
+                    "labels": labels,
+                    "title": config.name,
+                    "maxsize": settings.max_message_size,
+                }
             )
         else:
             print(yellow("Nothin to plot!"))
 
+if settings.plot:
+    pltrs.write_manifest(bench_dir_path, plot_entries)
+    plot_tasks = pltrs.manifest_tasks(
+        plot_entries,
+        bench_dir_path,
+        plot_dir_path,
+        title=settings.plot_titles,
+        y_cutoff=settings.plot_y_cutoff,
+        formats=settings.plot_formats,
+        variants=settings.plot_variants,
+    )
+    print(f"rendering {len(plot_tasks)} figures")
+    pltrs.render(
+        plot_tasks,
+        processes=settings.plot_processes,
+        show_plots=settings.show_plots,
+        latex=settings.latex,
+        fontsize=settings.fontsize,
+    )
+
 if settings.ctgrind:
     print("ctgrind:")
     for name, (res, label) in ctgrind_results.items():
@@ -1332,3 +1518,17 @@ if settings.bench:
     print(f"Benchmarks written to: {bench_dir_path}")
 if settings.plot:
     print(f"Plots saved in: {plot_dir_path}")
+if settings.bench and settings.compare_to is not None:
+    report = compare_runs(
+        baseline_dir,
+        bench_dir_path,
+        threshold=settings.regression_threshold,
+        alpha=settings.regression_alpha,
+    )
+    report_path = bench_dir_path / "regressions.json"
+    write_report(report, report_path)
+    print(f"Comparison with {baseline_dir} written to: {report_path}")
+    for status, line in summary(report):
+        print(red(line) if status == "regression" else green(line))
+    if report["regressions"]:
+        sys.exit(1)
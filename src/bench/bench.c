@@ -20,14 +20,24 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
+#define _GNU_SOURCE
 #include "../include/hash.h"
 #include "../key_expansion.h"
 #include "../randombytes.h"
 #include "cyclecount.h"
+#include "isolation.h"
+#ifdef PERF_COUNTERS
+#include "perf_counters.h"
+#endif
 #include <inttypes.h>
+#include <pthread.h>
+#include <stdatomic.h>
 #include <stdint.h>
 #include <stdio.h>
 #include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
 #ifdef COLD_CACHE
 #include <x86intrin.h>
 // #include <asm/cachectl.h>
@@ -50,20 +60,111 @@
 #define NAME "null"
 #endif
 
+#ifdef MESSAGE_POOL
+#define POOL_ALIGN 64
+// Slot size in the message pool, rounded up to a whole cache line
+#define POOL_STRIDE(len) (((len) + POOL_ALIGN - 1) & ~(size_t)(POOL_ALIGN - 1))
+#endif
+
+// With BENCH_CI, every message length is benchmarked until the relative half
+// width of the 95% confidence interval of the median is at most BENCH_CI, at
+// least BENCH_MIN_REPETITIONS and at most REPETITIONS times, or until
+// BENCH_TIME_BUDGET seconds were spent on it.
+#ifdef BENCH_CI
+#ifndef BENCH_MIN_REPETITIONS
+#define BENCH_MIN_REPETITIONS 5
+#endif
+#ifndef BENCH_TIME_BUDGET
+#define BENCH_TIME_BUDGET 10.0
+#endif
+#endif
+
+// A measurement is redone up to BENCH_MAX_REDOS times if the core clock changed
+// by more than the maximal relative drift (-d, default BENCH_MAX_DRIFT) during
+// it.
+#ifndef BENCH_MAX_DRIFT
+#define BENCH_MAX_DRIFT 0.02
+#endif
+#ifndef BENCH_MAX_REDOS
+#define BENCH_MAX_REDOS 3
+#endif
+
 #ifndef FOLDER
 #define FOLDER "./"
 #endif
 
-void do_bench(size_t message_len, FILE *f) {
-    // printf("ML: %zu\n", message_len);
-    unsigned char *message = malloc(message_len);
-    if (!message) {
-        exit(-1);
+// Raw sample files start with a header followed by one record per benchmarked
+// message length: the message length and ITERATIONS cycle counts (followed by
+// ITERATIONS key generation cycle counts if RAW_FLAG_KEYGEN is set), all as
+// little-endian uint64. The records can be mapped as a NumPy array, see
+// src/bench_raw.py. With BENCH_CI the number of repetitions differs between
+// message lengths and is 0 in the header.
+#define RAW_MAGIC "PHRAW001"
+#define RAW_FLAG_KEYGEN 1U
+
+typedef struct raw_header {
+    char magic[8];
+    uint64_t flags;
+    uint64_t iterations;
+    uint64_t repetitions;
+    uint64_t maxinputsize;
+    uint64_t stepsize;
+    char name[80];
+} raw_header_t;
+
+static void write_raw_header(FILE *raw) {
+    raw_header_t header = {0};
+    memcpy(header.magic, RAW_MAGIC, sizeof header.magic);
+#ifdef KEYGENERATOR
+    header.flags |= RAW_FLAG_KEYGEN;
+#endif
+    header.iterations = ITERATIONS;
+#ifdef BENCH_CI
+    header.repetitions = 0;
+#else
+    header.repetitions = REPETITIONS;
+#endif
+    header.maxinputsize = MAXINPUTSIZE;
+    header.stepsize = STEPSIZE;
+    strncpy(header.name, NAME, sizeof header.name - 1);
+    fwrite(&header, sizeof header, 1, raw);
+}
+
+// Subtracts the timing overhead from every sample and appends them to raw.
+static void write_raw_samples(FILE *raw, uint64_t *samples,
+                              uint64_t correction) {
+    for (int i = 0; i < ITERATIONS; i++) {
+        samples[i] = samples[i] > correction ? samples[i] - correction : 0;
     }
+    fwrite(samples, sizeof(uint64_t), ITERATIONS, raw);
+}
 
+// Length of the key used to hash a message of message_len bytes.
+static size_t bench_keylength(size_t message_len) {
 #ifdef KEYGENERATOR
-    unsigned char pre_key[EXPANSION_KEY_SIZE];
-    size_t keylength = get_keylength(message_len);
+    return get_keylength(message_len);
+#elif !defined(SUPERKEYSIZE)
+    (void)message_len;
+    return (unsigned long long)KEYSIZE * NUM_KEYS;
+#else
+    (void)message_len;
+    size_t keylength = (unsigned long long)KEYSIZE * (NUM_KEYS + SUPERKEYSIZE);
+    if (keylength < LE_MIN_KEY * KEYSIZE) {
+        return LE_MIN_KEY * KEYSIZE;
+    }
+    return keylength + LE_EXTRA_KEY * KEYSIZE;
+#endif
+}
+
+// Returns the average number of cycles of a hash call.
+double do_bench(size_t message_len, FILE *f, FILE *raw) {
+    // printf("ML: %zu\n", message_len);
+#ifdef KEYGENERATOR
+    unsigned char pre_key_buf[EXPANSION_KEY_SIZE];
+    unsigned char *pre_key = pre_key_buf;
+#define KEYSOURCE pre_key
+#define KEYSOURCE_LENGTH EXPANSION_KEY_SIZE
+    size_t keylength = bench_keylength(message_len);
     unsigned char *key = malloc(keylength);
     if (!key) {
         exit(-1);
@@ -71,35 +172,63 @@ void do_bench(size_t message_len, FILE *f) {
 #define KEYLENGTH keylength
 // printf("KL: %zu\n", KEYLENGTH);
 #else
-#ifndef SUPERKEYSIZE
-    size_t keylength = (unsigned long long)KEYSIZE * NUM_KEYS;
+    size_t keylength = bench_keylength(message_len);
 #define KEYLENGTH keylength
+    unsigned char key_buf[KEYLENGTH];
+    unsigned char *key = key_buf;
+#define KEYSOURCE key
+#define KEYSOURCE_LENGTH KEYLENGTH
+#endif
+
+#ifdef MESSAGE_POOL
+    // MESSAGE_POOL distinct messages and keys (or key expansion seeds) are
+    // generated in one arena before any measurement, the iterations cycle
+    // through them. Every slot starts on a cache line so that all messages and
+    // keys have the same alignment.
+    const size_t message_stride = POOL_STRIDE(message_len);
+    const size_t key_stride = POOL_STRIDE(KEYSOURCE_LENGTH);
+    const size_t pool_len = MESSAGE_POOL * (message_stride + key_stride);
+    unsigned char *arena = aligned_alloc(POOL_ALIGN, pool_len);
+    if (!arena) {
+        exit(-1);
+    }
+    randbytes(arena, pool_len);
+    unsigned char *message = arena;
+#define NEXT_INPUT(i)                                                          \
+    do {                                                                       \
+        message = arena + ((i) % MESSAGE_POOL) * message_stride;               \
+        KEYSOURCE = arena + MESSAGE_POOL * message_stride +                    \
+                    ((i) % MESSAGE_POOL) * key_stride;                         \
+    } while (0)
 #else
-    size_t keylength = (unsigned long long)KEYSIZE * (NUM_KEYS + SUPERKEYSIZE);
-#define KEYLENGTH keylength
-    if (KEYLENGTH < LE_MIN_KEY * KEYSIZE) {
-        KEYLENGTH = LE_MIN_KEY * KEYSIZE;
-    } else {
-        KEYLENGTH = KEYLENGTH + LE_EXTRA_KEY * KEYSIZE;
+    unsigned char *message = malloc(message_len);
+    if (!message) {
+        exit(-1);
     }
-#endif
-    unsigned char key[KEYLENGTH];
+#define NEXT_INPUT(i)                                                          \
+    do {                                                                       \
+        randbytes(message, message_len);                                      \
+        randbytes(KEYSOURCE, KEYSOURCE_LENGTH);                                \
+    } while (0)
 #endif
     unsigned char mac[CRYPTO_HASH];
     uint64_t start = 0U, stop = 0U, time = 0U;
+    static uint64_t samples[ITERATIONS];
 #ifdef KEYGENERATOR
     uint64_t keygentime = 0U;
+    static uint64_t keygen_samples[ITERATIONS];
+#endif
+#ifdef PERF_COUNTERS
+    uint64_t perf_counts[PERF_NUM_COUNTERS];
+    uint64_t perf_overhead[PERF_NUM_COUNTERS];
 #endif
 
 #ifndef COLD_CACHE
     for (int i = 0; i < 1000; i++) {
-        randbytes(message, message_len);
+        NEXT_INPUT(i);
 #ifdef KEYGENERATOR
-        randbytes(pre_key, EXPANSION_KEY_SIZE);
         init(pre_key);
         get(key, keylength);
-#else
-        randbytes(key, sizeof key);
 #endif
         hash(mac, message, message_len, key, (unsigned long long)KEYLENGTH);
     }
@@ -108,17 +237,18 @@ void do_bench(size_t message_len, FILE *f) {
     // char name[sizeof(ALGORITHM_NAME)+10];
     // sprintf(name, "%s_%zu", ALGORITHM_NAME, message_len);
 
+#ifdef PERF_COUNTERS
+    perf_reset();
+#endif
     for (int i = 0; i < ITERATIONS; i++) {
-        randbytes(message, message_len);
+        NEXT_INPUT(i);
 #ifdef KEYGENERATOR
-        randbytes(pre_key, EXPANSION_KEY_SIZE);
         start = rdtscp_start();
         init(pre_key);
         get(key, keylength);
         stop = rdtscp_stop();
         keygentime += stop - start;
-#else
-        randbytes(key, sizeof key);
+        keygen_samples[i] = stop - start;
 #endif
 
 #ifdef COLD_CACHE
@@ -134,24 +264,53 @@ void do_bench(size_t message_len, FILE *f) {
         }
         _mm_mfence();
         _mm_lfence();
+#endif
+#ifdef PERF_COUNTERS
+        perf_resume();
 #endif
         start = rdtscp_start();
         hash(mac, message, message_len, key, (unsigned long long)KEYLENGTH);
         stop = rdtscp_stop();
+#ifdef PERF_COUNTERS
+        perf_pause();
+#endif
         time += stop - start;
+        samples[i] = stop - start;
     }
+#ifdef PERF_COUNTERS
+    perf_read(perf_counts);
+    perf_reset();
+#endif
     uint64_t correction = 0U;
     for (int i = 0; i < ITERATIONS; i++) {
+#ifdef PERF_COUNTERS
+        perf_resume();
+#endif
         start = rdtscp_start();
         stop = rdtscp_stop();
+#ifdef PERF_COUNTERS
+        perf_pause();
+#endif
         correction += stop - start;
     }
+#ifdef PERF_COUNTERS
+    perf_read(perf_overhead);
+#endif
     time -= correction;
 
 #ifdef KEYGENERATOR
     keygentime -= correction;
 #endif
 
+    if (raw) {
+        uint64_t len = message_len;
+        fwrite(&len, sizeof len, 1, raw);
+        write_raw_samples(raw, samples, correction / ITERATIONS);
+#ifdef KEYGENERATOR
+        write_raw_samples(raw, keygen_samples, correction / ITERATIONS);
+#endif
+    }
+
     // if (message_len < 1024U) {
     //     printf("MessageLength: %zu B\n", message_len);
     // } else if(message_len < (1U<<20)) {
@@ -163,32 +322,375 @@ void do_bench(size_t message_len, FILE *f) {
     // printf("%s:\t%" PRIu64 " Cycles\n", ALGORITHM_NAME, time/ITERATIONS);
 
 #ifdef KEYGENERATOR
-    fprintf(f, "%zu,%f,%f\n", message_len, ((double)time) / ITERATIONS,
+    fprintf(f, "%zu,%f,%f", message_len, ((double)time) / ITERATIONS,
             ((double)keygentime) / ITERATIONS);
 #else
-    fprintf(f, "%zu,%f\n", message_len, ((double)time) / ITERATIONS);
+    fprintf(f, "%zu,%f", message_len, ((double)time) / ITERATIONS);
+#endif
+#ifdef PERF_COUNTERS
+    perf_write(f, perf_counts, perf_overhead, ITERATIONS);
 #endif
+    fprintf(f, "\n");
 
 #ifdef KEYGENERATOR
     free(key);
 #endif
+#ifdef MESSAGE_POOL
+    free(arena);
+#else
     free(message);
+#endif
+#undef NEXT_INPUT
+#undef KEYSOURCE
+#undef KEYSOURCE_LENGTH
+    return ((double)time) / ITERATIONS;
 }
 
+static double max_drift = BENCH_MAX_DRIFT;
+
+static double seconds_since(const struct timespec *begin) {
+    struct timespec now;
+    timespec_get(&now, TIME_UTC);
+    return (now.tv_sec - begin->tv_sec) + (now.tv_nsec - begin->tv_nsec) * 1e-9;
+}
+
+// Drops everything written to f after pos.
+static void truncate_to(FILE *f, long pos) {
+    fflush(f);
+    if (fseek(f, pos, SEEK_SET) != 0 || ftruncate(fileno(f), pos) != 0) {
+        exit(-1);
+    }
+}
+
+// Benchmarks message_len, the measurement is redone if the effective core
+// frequency drifted during it.
+static double bench_stable(size_t message_len, FILE *f, FILE *raw) {
+    long f_pos = ftell(f);
+    long raw_pos = raw ? ftell(raw) : 0;
+    for (int redo = 0;; redo++) {
+        if (max_drift <= 0) {
+            return do_bench(message_len, f, raw);
+        }
+        double before = clock_ratio();
+        double cycles = do_bench(message_len, f, raw);
+        double drift = clock_ratio() / before - 1;
+        if (drift < 0) {
+            drift = -drift;
+        }
+        if (drift <= max_drift) {
+            return cycles;
+        }
+        if (redo == BENCH_MAX_REDOS) {
+            fprintf(stderr,
+                    "MessageLength %zu: core clock drifted by %.1f%%, "
+                    "keeping the measurement\n",
+                    message_len, 100 * drift);
+            return cycles;
+        }
+        truncate_to(f, f_pos);
+        if (raw) {
+            truncate_to(raw, raw_pos);
+        }
+    }
+}
+
+#ifdef BENCH_CI
+static int compare_double(const void *a, const void *b) {
+    double x = *(const double *)a, y = *(const double *)b;
+    return (x > y) - (x < y);
+}
+
+static double square_root(double x) {
+    double r = x > 1 ? x : 1;
+    for (int i = 0; i < 64; i++) {
+        r = (r + x / r) / 2;
+    }
+    return r;
+}
+
+// Relative half width of the distribution-free 95% confidence interval of the
+// median, given by the order statistics n/2 -+ 1.96 sqrt(n)/2.
+static double median_ci_width(const double *results, int n) {
+    static double sorted[REPETITIONS];
+    memcpy(sorted, results, n * sizeof(double));
+    qsort(sorted, n, sizeof(double), compare_double);
+    double d = 1.96 * square_root(n) / 2;
+    int lower = (int)(n / 2.0 - d);
+    int upper = (int)(n / 2.0 + d + 1);
+    if (lower < 0)
+        lower = 0;
+    if (upper > n - 1)
+        upper = n - 1;
+    double median = n % 2 ? sorted[n / 2]
+                          : (sorted[n / 2 - 1] + sorted[n / 2]) / 2;
+    if (median <= 0)
+        return 0;
+    return (sorted[upper] - sorted[lower]) / (2 * median);
+}
+
+// Benchmarks message_len until the median converged, every repetition is a
+// row in the results file. The number of repetitions and the reached relative
+// half width of the confidence interval are a row in summary, if given.
+static void bench_until_converged(size_t message_len, FILE *f, FILE *raw,
+                                  FILE *summary) {
+    static double results[REPETITIONS];
+    struct timespec begin;
+    timespec_get(&begin, TIME_UTC);
+    int n = 0;
+    double width = 1;
+    while (n < REPETITIONS) {
+        results[n++] = bench_stable(message_len, f, raw);
+        if (n >= BENCH_MIN_REPETITIONS) {
+            width = median_ci_width(results, n);
+            if (width <= BENCH_CI)
+                break;
+        }
+        if (seconds_since(&begin) > BENCH_TIME_BUDGET)
+            break;
+    }
+    if (summary) {
+        fprintf(summary, "%zu,%d,%f\n", message_len, n, width);
+    }
+}
+#endif
+
+// In throughput mode (-T), every thread is pinned to its own CPU and hashes its
+// own messages, cycling through THROUGHPUT_POOL_BYTES of them (at least one
+// message), for a fixed time.
+#define THROUGHPUT_POOL_BYTES (1 << 24)
+#define THROUGHPUT_MIN_SIZE 64
+#define THROUGHPUT_MAX_THREADS 1024
+
+typedef struct {
+    int cpu;
+    size_t message_len;
+    int count;
+    unsigned char *messages;
+    size_t keylength;
+    unsigned char *key;
+    uint64_t hashes;
+    uint64_t cycles;
+    double seconds;
+} throughput_thread_t;
+
+static atomic_int throughput_stop;
+static pthread_barrier_t throughput_start;
+
+static void *throughput_worker(void *arg) {
+    throughput_thread_t *t = arg;
+#ifdef __linux__
+    cpu_set_t set;
+    CPU_ZERO(&set);
+    CPU_SET(t->cpu, &set);
+    pthread_setaffinity_np(pthread_self(), sizeof set, &set);
+#endif
+    unsigned char mac[CRYPTO_HASH];
+    uint64_t hashes = 0;
+    pthread_barrier_wait(&throughput_start);
+    struct timespec begin;
+    timespec_get(&begin, TIME_UTC);
+    uint64_t start = rdtscp_start();
+    while (!atomic_load_explicit(&throughput_stop, memory_order_relaxed)) {
+        hash(mac, t->messages + (hashes % t->count) * t->message_len,
+             t->message_len, t->key, t->keylength);
+        hashes++;
+    }
+    t->cycles = rdtscp_stop() - start;
+    t->seconds = seconds_since(&begin);
+    t->hashes = hashes;
+    return NULL;
+}
+
+// Hashes messages of message_len bytes with the given number of threads for
+// duration seconds and writes a row per thread to f.
+static int throughput_run(FILE *f, size_t message_len, int threads,
+                          double duration, int base_cpu) {
+    static throughput_thread_t t[THROUGHPUT_MAX_THREADS];
+    pthread_t ids[THROUGHPUT_MAX_THREADS];
+    long cpus = sysconf(_SC_NPROCESSORS_ONLN);
+    int count = THROUGHPUT_POOL_BYTES / message_len;
+    count = count < 1 ? 1 : count;
+    // keys are expanded up front, as the key generator is not thread safe
+    for (int i = 0; i < threads; i++) {
+        t[i].cpu = (base_cpu + i) % (cpus > 0 ? cpus : 1);
+        t[i].message_len = message_len;
+        t[i].count = count;
+        t[i].messages = malloc(count * message_len);
+        t[i].keylength = bench_keylength(message_len);
+        t[i].key = malloc(t[i].keylength);
+        if (!t[i].messages || !t[i].key) {
+            return -1;
+        }
+        randbytes(t[i].messages, count * message_len);
+#ifdef KEYGENERATOR
+        unsigned char pre_key[EXPANSION_KEY_SIZE];
+        randbytes(pre_key, EXPANSION_KEY_SIZE);
+        init(pre_key);
+        get(t[i].key, t[i].keylength);
+#else
+        randbytes(t[i].key, t[i].keylength);
+#endif
+    }
+    atomic_store(&throughput_stop, 0);
+    pthread_barrier_init(&throughput_start, NULL, threads + 1);
+    for (int i = 0; i < threads; i++) {
+        if (pthread_create(&ids[i], NULL, throughput_worker, &t[i]) != 0) {
+            return -1;
+        }
+    }
+    pthread_barrier_wait(&throughput_start);
+    struct timespec sleep = {.tv_sec = (time_t)duration,
+                             .tv_nsec = (long)((duration - (time_t)duration) *
+                                               1e9)};
+    nanosleep(&sleep, NULL);
+    atomic_store(&throughput_stop, 1);
+    uint64_t bytes = 0;
+    double seconds = 0;
+    for (int i = 0; i < threads; i++) {
+        pthread_join(ids[i], NULL);
+        double thread_bytes = (double)t[i].hashes * message_len;
+        fprintf(f, "%zu,%d,%d,%d,%" PRIu64 ",%" PRIu64 ",%f,%f,%f\n",
+                message_len, threads, i, t[i].cpu, t[i].hashes, t[i].cycles,
+                t[i].seconds, thread_bytes / t[i].cycles,
+                thread_bytes / t[i].seconds / 1e9);
+        bytes += t[i].hashes * message_len;
+        seconds = t[i].seconds > seconds ? t[i].seconds : seconds;
+        free(t[i].messages);
+        free(t[i].key);
+    }
+    pthread_barrier_destroy(&throughput_start);
+    printf("MessageLength %zu, %d threads: %.3f GB/s\n", message_len, threads,
+           bytes / seconds / 1e9);
+    return 0;
+}
+
+// Sweeps message lengths growing by a factor of 4 up to max_size and thread
+// counts doubling up to max_threads.
+static int bench_throughput(FILE *f, int max_threads, double duration,
+                            size_t max_size, int base_cpu) {
+    fprintf(f, "MessageLength,threads,thread,cpu,hashes,cycles,seconds,"
+               "bytes_per_cycle,GBps\n");
+    for (size_t len = THROUGHPUT_MIN_SIZE; len <= max_size; len *= 4) {
+        for (int threads = 1;; threads *= 2) {
+            threads = threads > max_threads ? max_threads : threads;
+            if (throughput_run(f, len, threads, duration, base_cpu) < 0) {
+                return -1;
+            }
+            if (threads == max_threads) {
+                break;
+            }
+        }
+    }
+    return 0;
+}
+
+// Usage: <binname>_bench [-c cpu] [-d max_drift] [-s summary.csv]
+//                        [results.csv [samples.bin]]
+//        (-s only with BENCH_CI)
+//        <binname>_bench [-c cpu] -T max_threads [-D seconds] [-M max_size]
+//                        [throughput.csv]
 int main(int argc, char *argv[]) {
+    int cpu = -1;
+    int isolated = 0;
+    int max_threads = 0;
+    double duration = 1.0;
+    size_t max_size = MAXINPUTSIZE;
+#ifdef BENCH_CI
+    const char *summary_filename = NULL;
+#endif
+    int opt;
+    while ((opt = getopt(argc, argv, "c:d:s:T:D:M:")) != -1) {
+        switch (opt) {
+        case 'c':
+            cpu = atoi(optarg);
+            isolated = 1;
+            break;
+        case 'd':
+            max_drift = atof(optarg);
+            break;
+#ifdef BENCH_CI
+        case 's':
+            summary_filename = optarg;
+            break;
+#endif
+        case 'T':
+            max_threads = atoi(optarg);
+            break;
+        case 'D':
+            duration = atof(optarg);
+            break;
+        case 'M':
+            max_size = strtoull(optarg, NULL, 10);
+            break;
+        default:
+            fprintf(stderr,
+                    "Usage: %s [-c cpu] [-d max_drift] [-s summary.csv] "
+                    "[results.csv [samples.bin]]\n"
+                    "       %s [-c cpu] -T max_threads [-D seconds] "
+                    "[-M max_size] [throughput.csv]\n",
+                    argv[0], argv[0]);
+            return 2;
+        }
+    }
+    if (max_threads < 0 || max_threads > THROUGHPUT_MAX_THREADS) {
+        fprintf(stderr,
+                "-T must be between 1 and %d, or 0 to disable throughput "
+                "mode\n",
+                THROUGHPUT_MAX_THREADS);
+        return 2;
+    }
+    argc -= optind - 1;
+    argv += optind - 1;
+    // the throughput threads are pinned, but not run with SCHED_FIFO, as they
+    // could starve the thread stopping them
+    if (isolated && !max_threads) {
+        isolate(cpu);
+    }
+#ifdef PERF_COUNTERS
+    perf_open();
+#endif
+
     if (init_lib() < 0) {
         return -1;
     }
 
     init_hash();
 
-    FILE *f = fopen(FOLDER "" NAME "_results.csv", "w");
+    // the results file can be given on the command line so that binaries do
+    // not depend on the output folder of a particular run
+    const char *results_filename = FOLDER "" NAME "_results.csv";
+    if (argc > 1) {
+        results_filename = argv[1];
+    }
+    FILE *f = fopen(results_filename, "w");
+    if (!f) {
+        return -1;
+    }
+    if (max_threads) {
+        int res = bench_throughput(f, max_threads, duration, max_size,
+                                   cpu < 0 ? 0 : cpu);
+        fclose(f);
+        return res;
+    }
+    // optionally, every single sample is written to a binary file
+    FILE *raw = NULL;
+    if (argc > 2) {
+        raw = fopen(argv[2], "wb");
+        if (!raw) {
+            return -1;
+        }
+        write_raw_header(raw);
+    }
 
 #ifdef KEYGENERATOR
-    fprintf(f, "MessageLength,cycles,keygen\n");
+    fprintf(f, "MessageLength,cycles,keygen");
 #else
-    fprintf(f, "MessageLength,cycles\n");
+    fprintf(f, "MessageLength,cycles");
 #endif
+#ifdef PERF_COUNTERS
+    fprintf(f, PERF_CSV_HEADER);
+#endif
+    fprintf(f, "\n");
     // size_t inputsize = 0;
     // size_t samplessize = ((MAXINPUTSIZE) / 8) > sizeof(inputsize) ?
     // sizeof(inputsize) : ((MAXINPUTSIZE) / 8);
@@ -197,6 +699,24 @@ int main(int argc, char *argv[]) {
     // if (!mask) {
     //     exit(-1);
     // }
+#ifdef BENCH_CI
+    // the number of repetitions of every message length, with -s
+    FILE *summary = NULL;
+    if (summary_filename) {
+        summary = fopen(summary_filename, "w");
+        if (!summary) {
+            return -1;
+        }
+        fprintf(summary, "MessageLength,repetitions,ci_width\n");
+    }
+    for (int i = 0; i <= MAXINPUTSIZE;) {
+        i += STEPSIZE;
+        bench_until_converged(i, f, raw, summary);
+    }
+    if (summary) {
+        fclose(summary);
+    }
+#else
     for (int j = 0; j < REPETITIONS; j++) {
         for (int i = 0; i <= MAXINPUTSIZE;) {
             // while (!(mask[inputsize >> 3] & (1 << (inputsize & 0x7)))){
@@ -207,9 +727,13 @@ int main(int argc, char *argv[]) {
             // }
             // mask[inputsize >> 3] |= (1 << (inputsize & 0x7));
             i += STEPSIZE;
-            do_bench(i, f);
+            bench_stable(i, f, raw);
         }
     }
+#endif
     fclose(f);
+    if (raw) {
+        fclose(raw);
+    }
     return 0;
 }
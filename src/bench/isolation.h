@@ -0,0 +1,98 @@
+// MIT License
+//
+// Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+// Isolation of the benchmark from the rest of the system and detection of
+// changes of the core clock during a measurement. Needs _GNU_SOURCE to be
+// defined before the first include.
+
+#ifndef ISOLATION_H
+#define ISOLATION_H
+#include "cyclecount.h"
+#include <stdint.h>
+#include <stdio.h>
+#ifdef __linux__
+#include <errno.h>
+#include <sched.h>
+#include <string.h>
+#endif
+
+#ifndef CALIBRATION_OPS
+#define CALIBRATION_OPS (1 << 16)
+#endif
+#ifndef CALIBRATION_ROUNDS
+#define CALIBRATION_ROUNDS 5
+#endif
+
+// Pins the process to cpu (if it is not negative) and switches to SCHED_FIFO
+// if the process is permitted to. Failures are reported, but not fatal.
+static void isolate(int cpu) {
+#ifdef __linux__
+    if (cpu >= 0) {
+        cpu_set_t set;
+        CPU_ZERO(&set);
+        CPU_SET(cpu, &set);
+        if (sched_setaffinity(0, sizeof set, &set) != 0) {
+            fprintf(stderr, "Could not pin the benchmark to CPU %d: %s\n", cpu,
+                    strerror(errno));
+        }
+    }
+    struct sched_param param = {
+        .sched_priority = sched_get_priority_max(SCHED_FIFO)};
+    if (sched_setscheduler(0, SCHED_FIFO, &param) != 0) {
+        fprintf(stderr, "Running without SCHED_FIFO: %s\n", strerror(errno));
+    }
+#else
+    (void)cpu;
+    fprintf(stderr, "CPU pinning is only supported on Linux\n");
+#endif
+}
+
+// Cycle counter ticks per step of a chain of dependent multiplications, the
+// minimum of CALIBRATION_ROUNDS runs. As every step takes a fixed number of
+// core cycles, this is proportional to the ratio of the counter frequency to
+// the effective core frequency, which changes if the core clock does, e.g. due
+// to turbo or thermal throttling. (Chains of additions of immediates can be
+// collapsed by recent cores.)
+static double clock_ratio(void) {
+    double best = 0;
+    for (int r = 0; r < CALIBRATION_ROUNDS; r++) {
+        uint64_t x = r;
+        uint64_t start = rdtscp_start();
+        for (int i = 0; i < CALIBRATION_OPS / 64; i++) {
+            // a fixed chain of 64 dependent multiplications, independent of how
+            // the compiler lays out the loop
+#if defined(__aarch64__)
+            __asm__ volatile(".rept 64\n\tmul %0, %0, %0\n\t.endr" : "+r"(x));
+#else
+            __asm__ volatile(".rept 64\n\timulq %0, %0\n\t.endr" : "+r"(x));
+#endif
+        }
+        uint64_t stop = rdtscp_stop();
+        double ratio = (double)(stop - start) / CALIBRATION_OPS;
+        if (r == 0 || ratio < best) {
+            best = ratio;
+        }
+    }
+    return best;
+}
+
+#endif
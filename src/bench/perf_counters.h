@@ -0,0 +1,162 @@
+// MIT License
+//
+// Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+// Hardware performance counters of the benchmarked hash calls, read with
+// perf_event_open. The counters are only running between perf_resume and
+// perf_pause, so the setup of every iteration is not counted. Needs
+// _GNU_SOURCE to be defined before the first include.
+
+#ifndef PERF_COUNTERS_H
+#define PERF_COUNTERS_H
+#include <errno.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <string.h>
+#ifdef __linux__
+#include <linux/perf_event.h>
+#include <sys/ioctl.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+#endif
+
+// Raw event counting issued uops, the default is UOPS_ISSUED.ANY on Intel
+// cores. Other microarchitectures need their own encoding, see perf list.
+#ifndef PERF_UOPS_EVENT
+#define PERF_UOPS_EVENT 0x010e
+#endif
+
+#define PERF_NUM_COUNTERS 5
+#define PERF_CSV_HEADER                                                        \
+    ",instructions,core_cycles,branch_misses,l1d_misses,uops"
+
+typedef struct {
+    uint32_t type;
+    uint64_t config;
+} perf_counter_t;
+
+// Core cycles are counted instead of reference cycles, so that
+// instructions / core_cycles is the IPC at the actual core clock.
+static const perf_counter_t perf_counters[PERF_NUM_COUNTERS] = {
+    {PERF_TYPE_HARDWARE, PERF_COUNT_HW_INSTRUCTIONS},
+    {PERF_TYPE_HARDWARE, PERF_COUNT_HW_CPU_CYCLES},
+    {PERF_TYPE_HARDWARE, PERF_COUNT_HW_BRANCH_MISSES},
+    {PERF_TYPE_HW_CACHE,
+     PERF_COUNT_HW_CACHE_L1D | (PERF_COUNT_HW_CACHE_OP_READ << 8) |
+         (PERF_COUNT_HW_CACHE_RESULT_MISS << 16)},
+    {PERF_TYPE_RAW, PERF_UOPS_EVENT},
+};
+
+static const char *const perf_counter_names[PERF_NUM_COUNTERS] = {
+    "instructions", "core cycles", "branch misses", "L1D misses", "uops"};
+
+// All counters are in one group, so they are scheduled together. index[i] is
+// the position of counter i in the group, or -1 if it is not available.
+static int perf_leader = -1;
+static int perf_index[PERF_NUM_COUNTERS];
+static int perf_group_size = 0;
+
+static void perf_open(void) {
+#ifdef __linux__
+    for (int i = 0; i < PERF_NUM_COUNTERS; i++) {
+        struct perf_event_attr attr;
+        memset(&attr, 0, sizeof attr);
+        attr.size = sizeof attr;
+        attr.type = perf_counters[i].type;
+        attr.config = perf_counters[i].config;
+        attr.disabled = perf_leader < 0;
+        attr.exclude_kernel = 1;
+        attr.exclude_hv = 1;
+        attr.read_format = PERF_FORMAT_GROUP;
+        int fd = syscall(SYS_perf_event_open, &attr, 0, -1, perf_leader, 0);
+        if (fd < 0) {
+            fprintf(stderr, "Performance counter for %s not available: %s\n",
+                    perf_counter_names[i], strerror(errno));
+            perf_index[i] = -1;
+            continue;
+        }
+        if (perf_leader < 0) {
+            perf_leader = fd;
+        }
+        perf_index[i] = perf_group_size++;
+    }
+#else
+    fprintf(stderr, "Performance counters are only supported on Linux\n");
+    for (int i = 0; i < PERF_NUM_COUNTERS; i++) {
+        perf_index[i] = -1;
+    }
+#endif
+}
+
+static inline void perf_reset(void) {
+#ifdef __linux__
+    if (perf_leader >= 0) {
+        ioctl(perf_leader, PERF_EVENT_IOC_RESET, PERF_IOC_FLAG_GROUP);
+    }
+#endif
+}
+
+static inline void perf_resume(void) {
+#ifdef __linux__
+    if (perf_leader >= 0) {
+        ioctl(perf_leader, PERF_EVENT_IOC_ENABLE, PERF_IOC_FLAG_GROUP);
+    }
+#endif
+}
+
+static inline void perf_pause(void) {
+#ifdef __linux__
+    if (perf_leader >= 0) {
+        ioctl(perf_leader, PERF_EVENT_IOC_DISABLE, PERF_IOC_FLAG_GROUP);
+    }
+#endif
+}
+
+// Reads the counts since the last perf_reset, unavailable counters are 0.
+static void perf_read(uint64_t counts[PERF_NUM_COUNTERS]) {
+    uint64_t group[1 + PERF_NUM_COUNTERS] = {0};
+#ifdef __linux__
+    if (perf_leader >= 0 &&
+        read(perf_leader, group, sizeof group) < (ssize_t)sizeof(uint64_t)) {
+        memset(group, 0, sizeof group);
+    }
+#endif
+    for (int i = 0; i < PERF_NUM_COUNTERS; i++) {
+        counts[i] = perf_index[i] < 0 ? 0 : group[1 + perf_index[i]];
+    }
+}
+
+// Writes the average counts per call minus the ones of the measurement itself
+// as CSV columns, nan for unavailable counters.
+static void perf_write(FILE *f, const uint64_t counts[PERF_NUM_COUNTERS],
+                       const uint64_t overhead[PERF_NUM_COUNTERS],
+                       int calls) {
+    for (int i = 0; i < PERF_NUM_COUNTERS; i++) {
+        if (perf_index[i] < 0) {
+            fprintf(f, ",nan");
+        } else {
+            double diff = counts[i] > overhead[i] ? counts[i] - overhead[i] : 0;
+            fprintf(f, ",%f", diff / calls);
+        }
+    }
+}
+
+#endif
@@ -0,0 +1,133 @@
+# MIT License
+#
+# Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+RAW_MAGIC = b"PHRAW001"
+RAW_FLAG_KEYGEN = 1
+
+HEADER_DTYPE = np.dtype(
+    [
+        ("magic", "S8"),
+        ("flags", "<u8"),
+        ("iterations", "<u8"),
+        ("repetitions", "<u8"),
+        ("maxinputsize", "<u8"),
+        ("stepsize", "<u8"),
+        ("name", "S80"),
+    ]
+)
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+@dataclass
+class RawSamples:
+    """Raw benchmark samples written by a benchmark binary (see src/bench/bench.c).
+
+    records is a read-only memmap with one record per benchmarked message length,
+    the fields are MessageLength, cycles and, if keygen is set, keygen. cycles and
+    keygen hold all iterations samples of the record. repetitions is 0 if the
+    benchmark ran with --adaptive_ci, the number of records then differs between
+    message lengths.
+    """
+
+    name: str
+    iterations: int
+    repetitions: int
+    max_message_size: int
+    stepsize: int
+    keygen: bool
+    records: np.memmap
+
+
+def read_raw(filename: str | Path) -> RawSamples:
+    header = np.fromfile(filename, dtype=HEADER_DTYPE, count=1)
+    if len(header) != 1 or header["magic"][0] != RAW_MAGIC:
+        raise ValueError(f"{filename} is not a raw benchmark sample file")
+    header = header[0]
+    iterations = int(header["iterations"])
+    keygen = bool(int(header["flags"]) & RAW_FLAG_KEYGEN)
+    fields = [
+        ("MessageLength", "<u8"),
+        ("cycles", "<u8", (iterations,)),
+    ]
+    if keygen:
+        fields.append(("keygen", "<u8", (iterations,)))
+    records = np.memmap(
+        filename, dtype=np.dtype(fields), mode="r", offset=HEADER_DTYPE.itemsize
+    )
+    return RawSamples(
+        name=header["name"].decode(),
+        iterations=iterations,
+        repetitions=int(header["repetitions"]),
+        max_message_size=int(header["maxinputsize"]),
+        stepsize=int(header["stepsize"]),
+        keygen=keygen,
+        records=records,
+    )
+
+
+def summarize(raw: RawSamples, field: str = "cycles") -> pd.DataFrame:
+    """Robust statistics over all samples of every message length.
+
+    Returns one row per message length with the number of samples, mean, median,
+    the median absolute deviation and the percentiles in PERCENTILES (p5, p25, ...).
+    """
+    lengths = np.asarray(raw.records["MessageLength"])
+    order = np.argsort(lengths, kind="stable")
+    unique, counts = np.unique(lengths[order], return_counts=True)
+    samples = np.asarray(raw.records[field])[order]
+    if np.all(counts == counts[0]):
+        # every message length has the same number of samples, so they can be
+        # grouped in a single array of shape (lengths, samples)
+        return _summarize_groups(unique, samples.reshape(len(unique), -1))
+    # adaptive runs take a different number of samples per message length
+    groups = np.split(samples, np.cumsum(counts)[:-1])
+    return pd.concat(
+        [
+            _summarize_groups(unique[i : i + 1], group.reshape(1, -1))
+            for i, group in enumerate(groups)
+        ],
+        ignore_index=True,
+    )
+
+
+def _summarize_groups(lengths: np.ndarray, samples: np.ndarray) -> pd.DataFrame:
+    median = np.median(samples, axis=1)
+    summary = pd.DataFrame(
+        {
+            "MessageLength": lengths,
+            "samples": samples.shape[1],
+            "mean": samples.mean(axis=1),
+            "median": median,
+            "mad": np.median(np.abs(samples - median[:, None]), axis=1),
+        }
+    )
+    for p, values in zip(PERCENTILES, np.percentile(samples, PERCENTILES, axis=1)):
+        summary[f"p{p}"] = values
+    return summary
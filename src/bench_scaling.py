@@ -0,0 +1,100 @@
+# MIT License
+#
+# Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import csv
+import ctypes
+import os
+import statistics
+import time
+from pathlib import Path
+
+from src.hash_library import HashLibrary
+
+SCALING_MIN_SIZE = 1 << 16
+SCALING_MAX_SIZE = 1 << 30
+
+
+def thread_counts(max_threads: int) -> list[int]:
+    """Powers of two up to max_threads, and max_threads itself."""
+    counts = []
+    threads = 1
+    while threads < max_threads:
+        counts.append(threads)
+        threads *= 2
+    counts.append(max_threads)
+    return counts
+
+
+def message_sizes(min_size: int, max_size: int) -> list[int]:
+    """Message sizes from min_size to max_size, growing by a factor of 4."""
+    sizes = []
+    size = min_size
+    while size <= max_size:
+        sizes.append(size)
+        size *= 4
+    return sizes
+
+
+def bench_scaling(
+    lib: HashLibrary,
+    result_file: Path,
+    max_threads: int,
+    min_size: int = SCALING_MIN_SIZE,
+    max_size: int = SCALING_MAX_SIZE,
+    repetitions: int = 15,
+) -> bool:
+    """Measures the wall-clock time to hash a single message with 1 to max_threads
+    threads and writes the median times and speedups to result_file.
+
+    Returns False without writing anything if the polynomial has no multi-threaded
+    mode. Large messages are repeated less often, so that every size takes about the
+    same time.
+    """
+    if not lib.set_threads(2):
+        return False
+    lib.lib.get_keylength.argtypes = [ctypes.c_ulonglong]
+    lib.lib.get_keylength.restype = ctypes.c_ulonglong
+
+    with open(result_file, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["MessageLength", "threads", "seconds", "speedup"])
+        for size in message_sizes(min_size, max_size):
+            message = os.urandom(size)
+            key = os.urandom(lib.lib.get_keylength(size))
+            runs = max(3, min(repetitions, (64 << 20) // size))
+            single = None
+            for threads in thread_counts(max_threads):
+                lib.set_threads(threads)
+                lib.hash(key, message)
+                times = []
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    lib.hash(key, message)
+                    times.append(time.perf_counter() - start)
+                median = statistics.median(times)
+                if single is None:
+                    single = median
+                writer.writerow([size, threads, median, single / median])
+            del message
+    lib.set_threads(1)
+    return True
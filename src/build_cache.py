@@ -0,0 +1,160 @@
+# MIT License
+#
+# Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+from functools import partial
+from itertools import chain
+from pathlib import Path
+
+from src.build_jobs import BuildJob
+
+BINDIR = Path("bin")
+OBJDIR = Path("obj")
+ASMDIR = Path("asm")
+BINARY_SUFFIXES = ["", "_bench", ".so", "_arithmetic.so", "_ctgrind", "_sum"]
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class BuildCache:
+    """Persistent cache of the generated arithmetic, objects and binaries of a build.
+
+    Entries are keyed on a hash of everything that is passed to the build: the
+    make command (including all macro definitions and compiler flags), the
+    parameters of the field-arithmetic generator, the generator sources, the
+    Makefile and the compiler version. Each entry records the source files the
+    compiler read (taken from the dependency files written with -MMD) together
+    with their hashes, an entry is only reused if none of them changed.
+
+    At most max_entries entries are kept, storing a new entry evicts the least
+    recently stored or restored ones.
+    """
+
+    def __init__(self, cache_dir: Path = Path("cache"), max_entries: int = 256) -> None:
+        self.cache_dir: Path = cache_dir
+        self.max_entries: int = max_entries
+        self.compiler_version: str = subprocess.run(
+            "${CC:-gcc} --version",
+            shell=True,
+            capture_output=True,
+            text=True,
+            check=False,
+        ).stdout
+
+    def key(self, job: BuildJob) -> str:
+        h = hashlib.sha256()
+        # the benchmark output folder is passed to the binary at runtime
+        make_cmd = [arg for arg in job.make_cmd if not arg.startswith("BENCHDIR=")]
+        h.update(" ".join(make_cmd).encode())
+        h.update(self.compiler_version.encode())
+        h.update(file_digest(Path("Makefile")).encode())
+        if isinstance(job.generate, partial):
+            h.update(repr(job.generate.args).encode())
+            h.update(repr(sorted(job.generate.keywords.items())).encode())
+            for generator_source in sorted(Path("src/field_arithmetic").glob("*.py")):
+                h.update(file_digest(generator_source).encode())
+        return h.hexdigest()
+
+    def _entry(self, job: BuildJob) -> Path:
+        return self.cache_dir / self.key(job)
+
+    @staticmethod
+    def _dependencies(binname: str) -> set[Path]:
+        dependencies: set[Path] = set()
+        for depfile in chain(
+            (OBJDIR / binname).rglob("*.d"), (ASMDIR / binname).rglob("*.d")
+        ):
+            rules = depfile.read_text().replace("\\\n", " ")
+            for rule in rules.splitlines():
+                if ":" in rule:
+                    dependencies.update(map(Path, rule.split(":", 1)[1].split()))
+        # generated files are covered by the key
+        return {
+            dependency
+            for dependency in dependencies
+            if not dependency.is_relative_to(OBJDIR / binname)
+        }
+
+    def restore(self, job: BuildJob) -> bool:
+        """Restores the build outputs of job, returns False on a cache miss."""
+        entry = self._entry(job)
+        try:
+            with open(entry / "manifest.json", "r", encoding="utf-8") as f:
+                manifest: dict[str, str] = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        for dependency, digest in manifest.items():
+            try:
+                if file_digest(Path(dependency)) != digest:
+                    return False
+            except FileNotFoundError:
+                return False
+        for directory in [OBJDIR, ASMDIR]:
+            shutil.rmtree(directory / job.binname, ignore_errors=True)
+            if (entry / directory).exists():
+                shutil.copytree(entry / directory, directory / job.binname)
+        BINDIR.mkdir(exist_ok=True)
+        for binary in (entry / BINDIR).iterdir():
+            shutil.copy2(binary, BINDIR / binary.name)
+        # the modification time of the manifest marks the last use of the entry
+        os.utime(entry / "manifest.json")
+        return True
+
+    def store(self, job: BuildJob) -> None:
+        entry = self._entry(job)
+        shutil.rmtree(entry, ignore_errors=True)
+        (entry / BINDIR).mkdir(parents=True)
+        for directory in [OBJDIR, ASMDIR]:
+            if (directory / job.binname).exists():
+                shutil.copytree(directory / job.binname, entry / directory)
+        for suffix in BINARY_SUFFIXES:
+            binary = BINDIR / f"{job.binname}{suffix}"
+            if binary.exists():
+                shutil.copy2(binary, entry / BINDIR / binary.name)
+        manifest: dict[str, str] = {
+            str(dependency): file_digest(dependency)
+            for dependency in sorted(self._dependencies(job.binname))
+        }
+        # written last, an interrupted store leaves no valid entry behind
+        with open(entry / "manifest.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=4)
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries beyond max_entries."""
+        entries: list[tuple[float, Path]] = []
+        for entry in self.cache_dir.iterdir():
+            try:
+                entries.append(((entry / "manifest.json").stat().st_mtime, entry))
+            except (FileNotFoundError, NotADirectoryError):
+                # an interrupted or concurrent store, it is overwritten or
+                # completed by the next store of the same key
+                continue
+        entries.sort(reverse=True)
+        for _, entry in entries[self.max_entries :]:
+            shutil.rmtree(entry, ignore_errors=True)
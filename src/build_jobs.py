@@ -0,0 +1,120 @@
+# MIT License
+#
+# Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from src.build_cache import BuildCache
+
+
+class BuildJob:
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        binname: str,
+        make_cmd: list[str],
+        generate: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.name: str = name
+        self.label: str = label
+        self.binname: str = binname
+        self.make_cmd: list[str] = make_cmd
+        self.generate: Optional[Callable[[], None]] = generate
+
+    def make_variable(self, name: str) -> Optional[str]:
+        """Returns the value make_cmd assigns to the make variable name."""
+        for arg in self.make_cmd:
+            if arg.startswith(f"{name}="):
+                return arg.split("=", 1)[1].strip('"').strip()
+        return None
+
+    def run(
+        self, capture_output: bool = False, cache: Optional["BuildCache"] = None
+    ) -> subprocess.CompletedProcess:
+        if cache is not None and cache.restore(self):
+            restored = "restored from cache\n"
+            if not capture_output:
+                print(restored, end="")
+            return subprocess.CompletedProcess(self.make_cmd, 0, restored, "")
+        # objects of earlier builds may have been compiled with other definitions
+        shutil.rmtree(Path("obj") / self.binname, ignore_errors=True)
+        shutil.rmtree(Path("asm") / self.binname, ignore_errors=True)
+        if self.generate is not None:
+            if not capture_output:
+                print("generating Field Arithmetic")
+            self.generate()
+        res = subprocess.run(
+            " ".join(self.make_cmd),
+            shell=True,
+            capture_output=capture_output,
+            text=True,
+            check=False,
+        )
+        if cache is not None and res.returncode == 0:
+            cache.store(self)
+        return res
+
+
+def run_builds(
+    jobs: list[BuildJob],
+    workers: int = 1,
+    verbose: bool = False,
+    cache: Optional["BuildCache"] = None,
+) -> dict[str, bool]:
+    """Generates and builds all jobs, returns for each job name whether it succeeded.
+
+    With more than one worker the output of each build is collected and printed
+    once the build is done so that the logs of concurrent builds do not interleave.
+    If a cache is given, builds whose inputs did not change are restored from it.
+    """
+    binname_locks: dict[str, threading.Lock] = {
+        job.binname: threading.Lock() for job in jobs
+    }
+    capture_output = workers > 1
+    print_lock = threading.Lock()
+
+    def build(job: BuildJob) -> bool:
+        with binname_locks[job.binname]:
+            if not capture_output:
+                print(f"Building: {job.label} ({job.name})")
+            if verbose:
+                print(" ".join(job.make_cmd))
+            res = job.run(capture_output=capture_output, cache=cache)
+        if capture_output:
+            with print_lock:
+                print(f"Built: {job.label} ({job.name})")
+                if verbose or res.returncode != 0:
+                    print(res.stdout, end="")
+                    print(res.stderr, end="")
+        return res.returncode == 0
+
+    if workers <= 1:
+        return {job.name: build(job) for job in jobs}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(build, jobs)
+        return {job.name: success for job, success in zip(jobs, results)}
@@ -23,7 +23,7 @@
 #ifndef field_arithmetic_key_clamping_32_H_
 #define field_arithmetic_key_clamping_32_H_
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 
 #define LAST_MSG_BLOCKSIZE (8 * BLOCKSIZE - 128)
 #define LAST_FIELDELEM_BLOCKSIZE (PI - 128)
@@ -345,7 +345,7 @@ class ArithmeticGenerator(ABC):
         print("#include <inttypes.h>", file=self.file)
         print("#include <stddef.h>", file=self.file)
         print("#include <string.h>", file=self.file)
-        print('#include "../transform/transform.h"', file=self.file)
+        print('#include "transform/transform.h"', file=self.file)
 
     def need_doublecarry(self) -> Tuple[bool, bool]:
         return False, False
@@ -26,7 +26,7 @@ from math import ceil
 from typing import List, Optional
 import itertools
 from typing_extensions import override
-from cpuinfo import get_cpu_info
+from src.util import cpu_info
 from src.field_arithmetic.ArithmeticGenerator import ArithmeticGenerator
 
 
@@ -46,11 +46,11 @@ class BinaryFieldArithmeticGenerator(ArithmeticGenerator):
     ) -> None:
         super().__init__(*args, **kwargs)
         self.fieldsize: int = polynomial[0]
-        cpu_info = get_cpu_info()
-        if cpu_info["arch"] not in ["X86_32", "X86_64"]:
+        info = cpu_info()
+        if info["arch"] not in ["X86_32", "X86_64"]:
             raise NotImplementedError()
-        if "pclmulqdq" not in cpu_info["flags"]:
-            print(cpu_info["flags"])
+        if "pclmulqdq" not in info["flags"]:
+            print(info["flags"])
             raise ValueError("Unsupported Platform")
         self.cmul: str = "pclmulqdq"
         self.limbbits = [64]
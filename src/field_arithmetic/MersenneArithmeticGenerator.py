@@ -25,7 +25,7 @@ import sys
 from collections import Counter
 from typing import FrozenSet, List, Optional
 from typing_extensions import override
-from numpy import cumsum
+from itertools import accumulate
 from src.field_arithmetic.CrandallArithmeticGenerator import CrandallArithmeticGenerator
 
 
@@ -86,7 +86,7 @@ class MersenneArithmeticGenerator(CrandallArithmeticGenerator):
                         len(
                             [
                                 x
-                                for x in cumsum([0] + self.limbbits)
+                                for x in accumulate([0] + self.limbbits)
                                 if x <= (kk - self.pi)
                             ]
                         )
@@ -160,7 +160,7 @@ class MersenneArithmeticGenerator(CrandallArithmeticGenerator):
                         len(
                             [
                                 x
-                                for x in cumsum([0] + self.limbbits)
+                                for x in accumulate([0] + self.limbbits)
                                 if x <= (kk - self.pi)
                             ]
                         )
@@ -283,7 +283,7 @@ class MersenneArithmeticGenerator(CrandallArithmeticGenerator):
         #                 len(
         #                     [
         #                         x
-        #                         for x in cumsum([0] + self.limbbits)
+        #                         for x in accumulate([0] + self.limbbits)
         #                         if x <= (kk - self.pi)
         #                     ]
         #                 )
@@ -308,7 +308,7 @@ class MersenneArithmeticGenerator(CrandallArithmeticGenerator):
         #             )
         #             self._INC(f"d[{k}]", "acc", out_type=self.long_t)
         #         elif (
-        #             len([x for x in cumsum([0] + self.limbbits) if x <= (kk - self.pi)])
+        #             len([x for x in accumulate([0] + self.limbbits) if x <= (kk - self.pi)])
         #             == k + 1
         #         ):
         #             if cnt > 1:
@@ -389,7 +389,7 @@ class MersenneArithmeticGenerator(CrandallArithmeticGenerator):
         #                 len(
         #                     [
         #                         x
-        #                         for x in cumsum([0] + self.limbbits)
+        #                         for x in accumulate([0] + self.limbbits)
         #                         if x <= (kk - self.pi)
         #                     ]
         #                 )
@@ -415,7 +415,7 @@ class MersenneArithmeticGenerator(CrandallArithmeticGenerator):
         #             )
         #             self._INC(f"res->val[{k}]", "acc", out_type=self.long_t)
         #         elif (
-        #             len([x for x in cumsum([0] + self.limbbits) if x <= (kk - self.pi)])
+        #             len([x for x in accumulate([0] + self.limbbits) if x <= (kk - self.pi)])
         #             == k + 1
         #         ):
         #             if cnt > 1:
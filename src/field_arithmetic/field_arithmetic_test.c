@@ -94,3 +94,88 @@ void unpack_and_encode_last_field_elem_test(field_elem_t *res, baseint_t *a,
                                             size_t size) {
     unpack_and_encode_last_field_elem(res, a, size);
 }
+
+/*
+ * Batched wrappers, applying an operation to arrays of n elements in one call.
+ * Packed arrays hold `words` baseint_t words per element.
+ */
+
+void field_mul_batch(field_elem_t *res, field_elem_t *a, field_elem_t *b,
+                     size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        field_mul(&res[i], &a[i], &b[i]);
+    }
+}
+
+void field_add_batch(field_elem_t *res, field_elem_t *a, field_elem_t *b,
+                     size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        field_add(&res[i], &a[i], &b[i]);
+    }
+}
+
+void field_sqr_batch(field_elem_t *res, field_elem_t *a, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        field_sqr(&res[i], &a[i]);
+    }
+}
+
+void field_mul_no_carry_batch(dfield_elem_t *res, field_elem_t *a,
+                              field_elem_t *b, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        field_mul_no_carry(&res[i], &a[i], &b[i]);
+    }
+}
+
+void field_add_mix_batch(dfield_elem_t *res, dfield_elem_t *a, field_elem_t *b,
+                         size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        field_add_mix(&res[i], &a[i], &b[i]);
+    }
+}
+
+void field_add_dbl_batch(dfield_elem_t *res, dfield_elem_t *a,
+                         dfield_elem_t *b, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        field_add_dbl(&res[i], &a[i], &b[i]);
+    }
+}
+
+void field_sqr_no_carry_batch(dfield_elem_t *res, field_elem_t *a, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        field_sqr_no_carry(&res[i], &a[i]);
+    }
+}
+
+void carry_round_batch(field_elem_t *res, dfield_elem_t *a, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        carry_round(&res[i], &a[i]);
+    }
+}
+
+void reduce_batch(field_elem_t *res, field_elem_t *a, size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        reduce(&res[i], &a[i]);
+    }
+}
+
+void pack_field_elem_batch(baseint_t *res, field_elem_t *a, size_t words,
+                           size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        pack_field_elem(&res[i * words], &a[i]);
+    }
+}
+
+void unpack_key_batch(field_elem_t *res, baseint_t *a, size_t words,
+                      size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        unpack_key(&res[i], &a[i * words]);
+    }
+}
+
+void unpack_field_elem_batch(field_elem_t *res, baseint_t *a, size_t words,
+                             size_t n) {
+    for (size_t i = 0; i < n; i++) {
+        unpack_field_elem(&res[i], &a[i * words]);
+    }
+}
@@ -23,6 +23,7 @@
 
 #include "hash.h"
 #include "polynomial/polynomial.h"
+#include <errno.h>
 #include <stdlib.h>
 
 #ifdef USE_CTGRIND
@@ -31,6 +32,27 @@
 
 void init_hash(void) {}
 
+unsigned long long get_outputsize(void) { return CRYPTO_HASH; }
+
+unsigned long long hash_keylength(unsigned long long inlen) {
+#if defined(POLY_MIN_KEYLENGTH)
+    return POLY_MIN_KEYLENGTH(inlen);
+#elif defined(KEYGENERATOR)
+    return get_keylength(inlen);
+#else
+    return (unsigned long long)KEYSIZE * NUM_KEYS;
+#endif
+}
+
+int hash_set_threads(unsigned int threads) {
+#ifdef POLY_SET_THREADS
+    POLY_SET_THREADS(threads);
+    return 0;
+#else
+    return threads > 1 ? -1 : 0;
+#endif
+}
+
 void hash(unsigned char *out, const unsigned char *in, unsigned long long inlen,
           unsigned char *key, unsigned long long keylen) {
 #ifdef USE_CTGRIND
@@ -39,6 +61,109 @@ void hash(unsigned char *out, const unsigned char *in, unsigned long long inlen,
     poly_eval(out, in, inlen, key, keylen);
 }
 
+void hash_many(unsigned char *out, const unsigned char *const *in,
+               const unsigned long long *inlen, unsigned long long count,
+               const unsigned char *key, unsigned long long keylen) {
+#ifdef USE_CTGRIND
+    ct_poison(key, sizeof(KEYSIZE));
+#endif
+#ifdef POLY_EVAL_MANY
+    POLY_EVAL_MANY(out, in, inlen, count, key, keylen);
+#else
+    // polynomials without a batched variant unpack the key for every message
+    for (unsigned long long i = 0; i < count; ++i) {
+        poly_eval(out + i * CRYPTO_HASH, in[i], inlen[i], key, keylen);
+    }
+#endif
+}
+
+void hash_many_packed(unsigned char *out, const unsigned char *in,
+                      const unsigned long long *offsets,
+                      unsigned long long count, const unsigned char *key,
+                      unsigned long long keylen) {
+    // the offsets are converted to pointers for all messages at once, so the
+    // key is unpacked once. If that allocation fails they are converted in
+    // chunks of HASH_MANY_CHUNK messages on the stack.
+#define HASH_MANY_CHUNK 64
+    const unsigned char *chunk_msgs[HASH_MANY_CHUNK];
+    unsigned long long chunk_msglens[HASH_MANY_CHUNK];
+    const unsigned char **msgs = malloc(count * sizeof(*msgs));
+    unsigned long long *msglens = malloc(count * sizeof(*msglens));
+    unsigned long long max = count;
+    if (!msgs || !msglens) {
+        free(msgs);
+        free(msglens);
+        msgs = chunk_msgs;
+        msglens = chunk_msglens;
+        max = HASH_MANY_CHUNK;
+    }
+    while (count > 0) {
+        unsigned long long n = count < max ? count : max;
+        for (unsigned long long i = 0; i < n; ++i) {
+            msgs[i] = in + offsets[i];
+            msglens[i] = offsets[i + 1] - offsets[i];
+        }
+        hash_many(out, msgs, msglens, n, key, keylen);
+        out += n * CRYPTO_HASH;
+        offsets += n;
+        count -= n;
+    }
+    if (msgs != chunk_msgs) {
+        free(msgs);
+        free(msglens);
+    }
+#undef HASH_MANY_CHUNK
+}
+
+#ifdef POLY_STREAM_INIT
+struct hash_state {
+    POLY_STREAM_STATE_T *poly;
+};
+
+hash_state_t *hash_init(const unsigned char *key, unsigned long long keylen) {
+#ifdef USE_CTGRIND
+    ct_poison(key, sizeof(KEYSIZE));
+#endif
+    hash_state_t *state = malloc(sizeof(hash_state_t));
+    if (!state)
+        return NULL;
+    state->poly = POLY_STREAM_INIT(key, keylen);
+    if (!state->poly) {
+        free(state);
+        return NULL;
+    }
+    return state;
+}
+
+int hash_update(hash_state_t *state, const unsigned char *in,
+                unsigned long long inlen) {
+    POLY_STREAM_UPDATE(state->poly, in, inlen);
+    return 0;
+}
+
+void hash_final(hash_state_t *state, unsigned char *out) {
+    POLY_STREAM_FINAL(state->poly, out);
+    free(state);
+}
+#else
+// the polynomial has no streaming form
+struct hash_state {
+    char unused;
+};
+
+hash_state_t *hash_init(const unsigned char *key, unsigned long long keylen) {
+    errno = ENOSYS;
+    return NULL;
+}
+
+int hash_update(hash_state_t *state, const unsigned char *in,
+                unsigned long long inlen) {
+    return -1;
+}
+
+void hash_final(hash_state_t *state, unsigned char *out) {}
+#endif
+
 int hash_verify(unsigned char *out, const unsigned char *in,
                 unsigned long long inlen, const unsigned char *key) {
     // TODO
@@ -0,0 +1,271 @@
+# MIT License
+#
+# Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import ctypes
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from itertools import islice
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+PyBUF_SIMPLE = 0
+
+
+class Py_buffer(ctypes.Structure):
+    _fields_ = [
+        ("buf", ctypes.c_void_p),
+        ("obj", ctypes.c_void_p),
+        ("len", ctypes.c_ssize_t),
+        ("itemsize", ctypes.c_ssize_t),
+        ("readonly", ctypes.c_int),
+        ("ndim", ctypes.c_int),
+        ("format", ctypes.c_char_p),
+        ("shape", ctypes.POINTER(ctypes.c_ssize_t)),
+        ("strides", ctypes.POINTER(ctypes.c_ssize_t)),
+        ("suboffsets", ctypes.POINTER(ctypes.c_ssize_t)),
+        ("internal", ctypes.c_void_p),
+    ]
+
+
+PyObject_GetBuffer = ctypes.pythonapi.PyObject_GetBuffer
+PyObject_GetBuffer.argtypes = [
+    ctypes.py_object,
+    ctypes.POINTER(Py_buffer),
+    ctypes.c_int,
+]
+PyObject_GetBuffer.restype = ctypes.c_int
+PyBuffer_Release = ctypes.pythonapi.PyBuffer_Release
+PyBuffer_Release.argtypes = [ctypes.POINTER(Py_buffer)]
+PyBuffer_Release.restype = None
+
+
+@contextmanager
+def buffer(data: Any) -> Iterator[tuple[int, int]]:
+    """Yields address and length of the memory of a contiguous buffer-protocol object.
+
+    The memory is not copied, the object cannot be resized while the buffer is held.
+    """
+    view = Py_buffer()
+    PyObject_GetBuffer(data, ctypes.byref(view), PyBUF_SIMPLE)
+    try:
+        yield view.buf, view.len
+    finally:
+        PyBuffer_Release(ctypes.byref(view))
+
+
+class HashLibrary:
+    """The hash library of a built configuration, bin/<binname>.so.
+
+    Keys and messages can be any contiguous object supporting the buffer protocol
+    (bytes, bytearray, memoryview, mmap, NumPy arrays); they are passed to the library
+    without copying. The GIL is released while the library hashes, so several threads
+    can hash concurrently.
+    """
+
+    def __init__(self, binname: str, bindir: Path = Path("bin")) -> None:
+        self.binname = binname
+        self.bindir = bindir
+        self.lib: ctypes.CDLL = ctypes.CDLL(str((bindir / f"{binname}.so").absolute()))
+        self.lib.get_outputsize.argtypes = []
+        self.lib.get_outputsize.restype = ctypes.c_ulonglong
+        self.lib.hash_keylength.argtypes = [ctypes.c_ulonglong]
+        self.lib.hash_keylength.restype = ctypes.c_ulonglong
+        self.lib.hash.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_ulonglong,
+            ctypes.c_void_p,
+            ctypes.c_ulonglong,
+        ]
+        self.lib.hash.restype = None
+        self.lib.hash_many.argtypes = [
+            ctypes.c_void_p,
+            ctypes.POINTER(ctypes.c_void_p),
+            ctypes.POINTER(ctypes.c_ulonglong),
+            ctypes.c_ulonglong,
+            ctypes.c_void_p,
+            ctypes.c_ulonglong,
+        ]
+        self.lib.hash_many.restype = None
+        self.lib.hash_many_packed.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_void_p,
+            ctypes.c_ulonglong,
+            ctypes.c_void_p,
+            ctypes.c_ulonglong,
+        ]
+        self.lib.hash_many_packed.restype = None
+        self.tagsize: int = self.lib.get_outputsize()
+
+    def set_threads(self, threads: int) -> bool:
+        """Sets the number of threads used to hash a single large message, returns
+        False if the polynomial has no multi-threaded mode."""
+        if not hasattr(self.lib, "hash_set_threads"):
+            return threads <= 1
+        self.lib.hash_set_threads.argtypes = [ctypes.c_uint]
+        self.lib.hash_set_threads.restype = ctypes.c_int
+        return self.lib.hash_set_threads(threads) == 0
+
+    def keylength(self, length: int) -> int:
+        """Returns the number of key bytes needed to hash a message of length bytes."""
+        return self.lib.hash_keylength(length)
+
+    def _check_key(self, keylen: int, length: int) -> None:
+        required = self.keylength(length)
+        if keylen < required:
+            raise ValueError(
+                f"key of {keylen} bytes is too short, a message of {length} bytes "
+                f"needs {required}"
+            )
+
+    def hash(self, key: Any, data: Any) -> bytes:
+        tag = ctypes.create_string_buffer(self.tagsize)
+        with buffer(key) as (key_ptr, keylen), buffer(data) as (data_ptr, datalen):
+            self._check_key(keylen, datalen)
+            self.lib.hash(tag, data_ptr, datalen, key_ptr, keylen)
+        return tag.raw
+
+    def hash_many(self, key: Any, messages: Iterable[Any]) -> list[bytes]:
+        """Hashes all messages under the same key with a single library call."""
+        with ExitStack() as stack:
+            key_ptr, keylen = stack.enter_context(buffer(key))
+            views = [stack.enter_context(buffer(message)) for message in messages]
+            count = len(views)
+            pointers = (ctypes.c_void_p * count)(*(ptr for ptr, _ in views))
+            lengths = (ctypes.c_ulonglong * count)(*(length for _, length in views))
+            if count:
+                self._check_key(keylen, max(lengths))
+            tags = ctypes.create_string_buffer(self.tagsize * count)
+            self.lib.hash_many(tags, pointers, lengths, count, key_ptr, keylen)
+        raw = tags.raw
+        return [raw[i * self.tagsize : (i + 1) * self.tagsize] for i in range(count)]
+
+    def hash_parallel(
+        self,
+        key: Any,
+        messages: Iterable[Any],
+        workers: Optional[int] = None,
+        processes: bool = False,
+        chunksize: int = 1024,
+    ) -> list[bytes]:
+        """Hashes all messages under the same key on several cores, tags are returned
+        in the order of the messages.
+
+        With threads, chunks of chunksize messages are hashed with hash_many without
+        copying, one chunk per worker at a time. With processes, batches of messages are packed into shared memory and
+        each worker hashes a contiguous range of them with hash_many_packed. Threads are
+        usually faster, processes avoid any contention on the GIL between the chunks.
+        """
+        workers = workers or os.cpu_count() or 1
+        messages = iter(messages)
+        tags = []
+        if not processes:
+            chunks = iter(lambda: list(islice(messages, chunksize)), [])
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # one chunk per worker is submitted at a time, so that at most
+                # chunksize * workers messages are held at once
+                while window := list(islice(chunks, workers)):
+                    for chunk_tags in pool.map(
+                        lambda chunk: self.hash_many(key, chunk), window
+                    ):
+                        tags.extend(chunk_tags)
+            return tags
+
+        key = bytes(key)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.binname, self.bindir, key),
+        ) as pool:
+            while batch := list(islice(messages, chunksize * workers)):
+                tags.extend(self._hash_batch_in_processes(pool, batch, key, workers))
+        return tags
+
+    def _hash_batch_in_processes(
+        self, pool: ProcessPoolExecutor, batch: list[Any], key: bytes, workers: int
+    ) -> list[bytes]:
+        views = [memoryview(message).cast("B") for message in batch]
+        count = len(views)
+        offsets = [0] * (count + 1)
+        for i, view in enumerate(views):
+            offsets[i + 1] = offsets[i] + view.nbytes
+        self._check_key(len(key), max(view.nbytes for view in views))
+        header = (count + 1) * ctypes.sizeof(ctypes.c_ulonglong)
+        messages = SharedMemory(create=True, size=header + max(offsets[-1], 1))
+        out = SharedMemory(create=True, size=count * self.tagsize)
+        try:
+            messages.buf[:header] = memoryview(
+                (ctypes.c_ulonglong * (count + 1))(*offsets)
+            ).cast("B")
+            for view, offset in zip(views, offsets):
+                messages.buf[header + offset : header + offset + view.nbytes] = view
+            step = -(-count // workers)
+            ranges = [(i, min(i + step, count)) for i in range(0, count, step)]
+            for _ in pool.map(
+                _hash_range,
+                [(messages.name, out.name, count, start, end) for start, end in ranges],
+            ):
+                pass
+            raw = bytes(out.buf)
+        finally:
+            for shm in (messages, out):
+                shm.close()
+                shm.unlink()
+        return [raw[i * self.tagsize : (i + 1) * self.tagsize] for i in range(count)]
+
+
+_worker_library: Optional[HashLibrary] = None
+_worker_key: bytes = b""
+
+
+def _init_worker(binname: str, bindir: Path, key: bytes) -> None:
+    global _worker_library, _worker_key
+    _worker_library = HashLibrary(binname, bindir)
+    _worker_key = key
+
+
+def _hash_range(task: tuple[str, str, int, int, int]) -> None:
+    """Hashes messages start to end of a packed batch in shared memory into the shared
+    tag buffer."""
+    messages_name, out_name, count, start, end = task
+    assert _worker_library is not None
+    offset_size = ctypes.sizeof(ctypes.c_ulonglong)
+    with ExitStack() as stack:
+        messages = SharedMemory(name=messages_name)
+        stack.callback(messages.close)
+        out = SharedMemory(name=out_name)
+        stack.callback(out.close)
+        messages_ptr, _ = stack.enter_context(buffer(messages.buf))
+        out_ptr, _ = stack.enter_context(buffer(out.buf))
+        key_ptr, keylen = stack.enter_context(buffer(_worker_key))
+        _worker_library.lib.hash_many_packed(
+            out_ptr + start * _worker_library.tagsize,
+            messages_ptr + (count + 1) * offset_size,
+            messages_ptr + start * offset_size,
+            end - start,
+            key_ptr,
+            keylen,
+        )
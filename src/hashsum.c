@@ -0,0 +1,201 @@
+// MIT License
+//
+// Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+// Hashes files like sha256sum: prints one line "<tag>  <file>" per file.
+//
+// Files are mapped into memory and hashed in place, so the only cost besides
+// the hash itself is paging the file in.
+//
+// usage: <binname>_sum [-k keyfile] [-s] [-t threads] file...
+//   -k keyfile  key to use, by default a fixed key is derived from a zero seed.
+//               For configurations with a key generator the file holds the
+//               seed of the key expansion, otherwise the full key.
+//   -s          use the streaming interface (hash_init/update/final) on
+//               chunks of the mapping instead of a single hash call, fails
+//               for polynomials without a streaming form
+//   -t threads  threads per file for tree polynomials (see hash_set_threads)
+
+#define _DEFAULT_SOURCE
+#include "../include/hash.h"
+#include "key_expansion.h"
+#include <errno.h>
+#include <fcntl.h>
+#include <sodium.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#define STREAM_CHUNK (1UL << 20)
+
+#ifdef KEYGENERATOR
+#define KEYFILE_SIZE EXPANSION_KEY_SIZE
+#elif !defined(SUPERKEYSIZE)
+#define KEYFILE_SIZE ((unsigned long long)KEYSIZE * NUM_KEYS)
+#else
+#define KEYFILE_SIZE                                                           \
+    ((unsigned long long)KEYSIZE * (NUM_KEYS + SUPERKEYSIZE) <                 \
+             LE_MIN_KEY * KEYSIZE                                              \
+         ? LE_MIN_KEY * KEYSIZE                                                \
+         : (unsigned long long)KEYSIZE * (NUM_KEYS + SUPERKEYSIZE) +           \
+               LE_EXTRA_KEY * KEYSIZE)
+#endif
+
+static unsigned char keyfile[KEYFILE_SIZE];
+
+static int read_keyfile(const char *path) {
+    FILE *f = fopen(path, "rb");
+    if (!f)
+        return -1;
+    size_t n = fread(keyfile, 1, sizeof keyfile, f);
+    fclose(f);
+    if (n != sizeof keyfile) {
+        errno = EINVAL;
+        return -1;
+    }
+    return 0;
+}
+
+// Returns the key for a message of inlen bytes, keylen is set to its length.
+static const unsigned char *get_key(unsigned long long inlen,
+                                    unsigned long long *keylen) {
+#ifdef KEYGENERATOR
+    static unsigned char *key = NULL;
+    *keylen = get_keylength(inlen);
+    free(key);
+    key = malloc(*keylen ? *keylen : 1);
+    if (!key)
+        exit(-1);
+    init(keyfile);
+    get(key, *keylen);
+    return key;
+#else
+    *keylen = sizeof keyfile;
+    return keyfile;
+#endif
+}
+
+// Returns -1 with errno set if the streaming interface is not available.
+static int hash_mapped(unsigned char *out, const unsigned char *in,
+                       unsigned long long inlen, int stream) {
+    unsigned long long keylen;
+    const unsigned char *key = get_key(inlen, &keylen);
+    if (!stream) {
+        hash(out, in, inlen, (unsigned char *)key, keylen);
+        return 0;
+    }
+    hash_state_t *state = hash_init(key, keylen);
+    if (!state)
+        return -1;
+    for (unsigned long long i = 0; i < inlen; i += STREAM_CHUNK) {
+        unsigned long long n =
+            inlen - i < STREAM_CHUNK ? inlen - i : STREAM_CHUNK;
+        if (hash_update(state, in + i, n) < 0)
+            exit(-1);
+    }
+    hash_final(state, out);
+    return 0;
+}
+
+static int hash_file(unsigned char *out, const char *path, int stream) {
+    int fd = open(path, O_RDONLY);
+    if (fd < 0)
+        return -1;
+    struct stat st;
+    if (fstat(fd, &st) < 0) {
+        close(fd);
+        return -1;
+    }
+    if (!S_ISREG(st.st_mode)) {
+        close(fd);
+        errno = S_ISDIR(st.st_mode) ? EISDIR : EINVAL;
+        return -1;
+    }
+    unsigned long long inlen = st.st_size;
+    if (inlen == 0) {
+        close(fd);
+        static const unsigned char empty[1] = {0};
+        return hash_mapped(out, empty, 0, stream);
+    }
+    unsigned char *in = mmap(NULL, inlen, PROT_READ, MAP_PRIVATE, fd, 0);
+    close(fd);
+    if (in == MAP_FAILED)
+        return -1;
+    madvise(in, inlen, MADV_SEQUENTIAL);
+    int res = hash_mapped(out, in, inlen, stream);
+    munmap(in, inlen);
+    return res;
+}
+
+int main(int argc, char *argv[]) {
+    if (sodium_init() < 0) {
+        return -1;
+    }
+    init_hash();
+
+    int stream = 0;
+    int opt;
+    unsigned char seed[randombytes_SEEDBYTES] = {0};
+    randombytes_buf_deterministic(keyfile, sizeof keyfile, seed);
+    while ((opt = getopt(argc, argv, "k:st:")) != -1) {
+        switch (opt) {
+        case 'k':
+            if (read_keyfile(optarg) < 0) {
+                fprintf(stderr, "%s: %s: %s (needs %llu bytes)\n", argv[0],
+                        optarg, strerror(errno),
+                        (unsigned long long)KEYFILE_SIZE);
+                return 2;
+            }
+            break;
+        case 's':
+            stream = 1;
+            break;
+        case 't':
+            if (hash_set_threads(atoi(optarg)) < 0)
+                fprintf(stderr, "%s: no multi-threaded mode, using 1 thread\n",
+                        argv[0]);
+            break;
+        default:
+            fprintf(stderr,
+                    "usage: %s [-k keyfile] [-s] [-t threads] file...\n",
+                    argv[0]);
+            return 2;
+        }
+    }
+
+    int status = 0;
+    unsigned char out[CRYPTO_HASH];
+    for (int i = optind; i < argc; i++) {
+        if (hash_file(out, argv[i], stream) < 0) {
+            fprintf(stderr, "%s: %s: %s\n", argv[0], argv[i], strerror(errno));
+            status = 1;
+            continue;
+        }
+        for (int j = 0; j < CRYPTO_HASH; j++) {
+            printf("%02x", out[j]);
+        }
+        printf("  %s\n", argv[i]);
+    }
+    return status;
+}
@@ -22,7 +22,7 @@
 
 #ifndef __LENGTH_ENCODING_H_
 #define __LENGTH_ENCODING_H_
-#include "field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include <stdio.h>
 
 #ifndef LE_MIN_KEY
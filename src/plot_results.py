@@ -21,16 +21,25 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from math import ceil
-from os import makedirs
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, NamedTuple, Optional
+import matplotlib
 import matplotlib.pyplot as plt
 from cycler import cycler
+import numpy as np
 import pandas as pd
-from scipy.stats import zscore
+from matplotlib.axes import Axes
 from matplotlib.ticker import AutoMinorLocator
 
+from src.settings import DEFAULT_PLOT_FORMATS, PLOT_VARIANTS
+
+# the figures of a benchmark directory, see write_manifest()
+MANIFEST = "plots.json"
+
 plot_colors: list[str] = cycler(linestyle=["-", "--", "-."]) * cycler(
     color=[
         "#1F77B4",
@@ -61,18 +70,139 @@ def replace_whitespace(s: str) -> str:
     return "_".join(s.split())
 
 
-def plot(
-    filename: str,
-    name: str = "null",
-    show_plots: bool = False,
-    title: bool = True,
-    latex: bool = False,
-    maxsize: Optional[int] = None,
-    fontsize: Optional[int] = None,
-    y_cutoff: float = 5.0,
-    keygen: bool = False,
-    plot_dir: str = "plots/",
+def aggregate(
+    rawdata: pd.DataFrame, maxsize: Optional[int] = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Aggregates the samples of a benchmark per message length.
+
+    Samples whose cycles are more than 3 standard deviations from the mean of their
+    message length are dropped. Returns the mean and the standard deviation of every
+    column over the remaining samples, the means also contain the median and the
+    5th and 95th percentiles of the cycles.
+    """
+    if maxsize is not None:
+        rawdata = rawdata[rawdata["MessageLength"] <= maxsize]
+    cycles = rawdata.groupby("MessageLength")["cycles"]
+    deviation = (rawdata["cycles"] - cycles.transform("mean")).abs()
+    groups = rawdata[deviation <= 3 * cycles.transform("std", ddof=0)].groupby(
+        "MessageLength"
+    )
+    stats = groups.agg(["mean", "std"])
+    data = stats.xs("mean", axis=1, level=1).reset_index()
+    std = stats.xs("std", axis=1, level=1).reset_index()
+    percentiles = groups["cycles"].quantile([0.5, 0.05, 0.95]).unstack()
+    data["cycles_median"] = percentiles[0.5].to_numpy()
+    data["cycles_p5"] = percentiles[0.05].to_numpy()
+    data["cycles_p95"] = percentiles[0.95].to_numpy()
+    return data, std
+
+
+def aggregate_path(results: Path) -> Path:
+    """The aggregate of <config>_<n>_results.csv is stored in
+    <config>_<n>_aggregate.npz, the one of <config>_<n>_throughput.csv in
+    <config>_<n>_throughput_aggregate.npz."""
+    stem = results.name.removesuffix(".csv").removesuffix("_results")
+    return results.with_name(f"{stem}_aggregate.npz")
+
+
+def save_frames(
+    path: Path, frames: dict[str, pd.DataFrame], params: dict[str, Any]
 ) -> None:
+    arrays = {}
+    columns = {}
+    for key, frame in frames.items():
+        columns[key] = list(frame.columns)
+        for i, column in enumerate(frame.columns):
+            arrays[f"{key}_{i}"] = frame[column].to_numpy()
+    meta = json.dumps({"params": params, "columns": columns})
+    np.savez(path, meta=np.array(meta), **arrays)
+
+
+def load_frames(path: Path) -> tuple[dict[str, pd.DataFrame], dict[str, Any]]:
+    with np.load(path) as npz:
+        meta = json.loads(npz["meta"].item())
+        frames = {
+            key: pd.DataFrame(
+                {column: npz[f"{key}_{i}"] for i, column in enumerate(columns)}
+            )
+            for key, columns in meta["columns"].items()
+        }
+    return frames, meta["params"]
+
+
+def cached_aggregate(
+    results: Path,
+    params: dict[str, Any],
+    compute: Callable[[pd.DataFrame], dict[str, pd.DataFrame]],
+) -> dict[str, pd.DataFrame]:
+    """Returns the aggregate of a results csv, computed by compute from its rows.
+
+    The aggregate is stored next to the csv and read again as long as the csv did
+    not change and it was computed with the same params. Without the csv, the
+    stored aggregate is used as it is.
+    """
+    path = aggregate_path(results)
+    if path.exists():
+        if not results.exists():
+            return load_frames(path)[0]
+        if path.stat().st_mtime_ns >= results.stat().st_mtime_ns:
+            frames, stored = load_frames(path)
+            if stored == params:
+                return frames
+    frames = compute(pd.read_csv(results, comment="#"))
+    save_frames(path, frames, params)
+    return frames
+
+
+def results_aggregate(
+    results: Path, maxsize: Optional[int] = None
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Aggregates a results csv like aggregate(), with the rate and, if present, the
+    cycles including the key generation and the performance counters per byte."""
+
+    def compute(rawdata: pd.DataFrame) -> dict[str, pd.DataFrame]:
+        if "keygen" in rawdata.columns:
+            rawdata["total"] = rawdata["cycles"] + rawdata["keygen"]
+            rawdata["rate_total"] = rawdata["total"] / rawdata["MessageLength"]
+        rawdata["rate"] = rawdata["cycles"] / rawdata["MessageLength"]
+        # the columns are nan if the counters were not available
+        if "instructions" in rawdata.columns and rawdata["instructions"].notna().any():
+            rawdata["ipc"] = rawdata["instructions"] / rawdata["core_cycles"]
+            for counter in ["branch_misses", "l1d_misses"]:
+                rawdata[f"{counter}_per_byte"] = (
+                    rawdata[counter] / rawdata["MessageLength"]
+                )
+        data, std = aggregate(rawdata, maxsize)
+        return {"data": data, "std": std}
+
+    frames = cached_aggregate(Path(results), {"maxsize": maxsize}, compute)
+    return frames["data"], frames["std"]
+
+
+class View(NamedTuple):
+    """A file written from a figure, the axis limits are set before it is saved."""
+
+    variant: str
+    left: Optional[float] = None
+    top: Optional[float] = None
+    tight: bool = True
+
+
+@dataclass
+class PlotTask:
+    """A figure, drawn by calling draw with args and saved once per view and format
+    as <plot_dir>/<format>/<fname>_<variant><suffix>.<format>."""
+
+    draw: Callable[..., Axes]
+    args: dict[str, Any]
+    plot_dir: Path
+    fname: str
+    views: list[View]
+    formats: list[str] = field(default_factory=lambda: ["png", "svg"])
+    suffix: str = ""
+
+
+def configure(latex: bool = False, fontsize: Optional[int] = None) -> None:
     if latex:
         params = {
             "text.usetex": True,
@@ -82,203 +212,415 @@ def plot(
             params["font.size"] = fontsize
         plt.rcParams.update(params)
 
-    fname = replace_whitespace(name)
-    png_dir: Path = plot_dir / "png"
-    svg_dir: Path = plot_dir / "svg"
-    png_dir.mkdir(parents=True, exist_ok=True)
-    svg_dir.mkdir(parents=True, exist_ok=True)
-    rawdata = pd.read_csv(filename, comment="#")
-    zscores = rawdata.groupby(  # [["cycles", "MessageLength"]]
-        "MessageLength", as_index=False, group_keys=False
-    ).apply(
-        zscore,
-        # include_groups=False,
-    )
 
-    if keygen:
-        rawdata["total"] = rawdata["cycles"] + rawdata["keygen"]
-        rawdata["rate_total"] = rawdata["total"] / rawdata["MessageLength"]
-
-    rawdata["rate"] = rawdata["cycles"] / rawdata["MessageLength"]
-    data = (
-        rawdata[abs(zscores["cycles"]) <= 3]
-        .groupby("MessageLength", as_index=False)
-        .mean()
-    )
-    std = (
-        rawdata[abs(zscores["cycles"]) <= 3]
-        .groupby("MessageLength", as_index=False)
-        .std()
-    )
-    if maxsize is not None:
-        data = data[data["MessageLength"] <= maxsize]
-        std = std[std["MessageLength"] <= maxsize]
+def init_worker(latex: bool, fontsize: Optional[int]) -> None:
+    matplotlib.use("Agg")
+    configure(latex, fontsize)
+
+
+def render_task(task: PlotTask, close: bool = True) -> None:
+    ax = task.draw(**task.args)
+    for view in task.views:
+        if view.left is not None:
+            ax.set_xlim(left=view.left)
+        if view.top is not None:
+            ax.set_ylim(top=view.top)
+        for fmt in task.formats:
+            ax.figure.savefig(
+                task.plot_dir / fmt / f"{task.fname}_{view.variant}{task.suffix}.{fmt}",
+                dpi=300,
+                bbox_inches="tight" if view.tight else None,
+            )
+    if close:
+        plt.close(ax.figure)
 
-    data.plot(x="MessageLength", y="cycles", legend=False)
-    plt.fill_between(
-        data["MessageLength"],
-        data["cycles"] - std["cycles"],
-        data["cycles"] + std["cycles"],
-        alpha=0.5,
-    )
-    plt.ylabel("Cycles")
-    plt.xlabel("Message Length in Bytes")
-    if title:
-        plt.title(name)
-    plt.grid(True)
-    plt.grid(True, which="minor", axis="y", linestyle="--")
 
-    ax = plt.gca()
+def render(
+    tasks: list[PlotTask],
+    processes: int = 1,
+    show_plots: bool = False,
+    latex: bool = False,
+    fontsize: Optional[int] = None,
+) -> None:
+    """Renders the figures of all tasks.
+
+    With more than one process every figure is rendered by a worker of a process
+    pool with the non-interactive Agg backend. Shown plots are always rendered in
+    this process.
+    """
+    if show_plots or processes <= 1 or len(tasks) <= 1:
+        configure(latex, fontsize)
+        for task in tasks:
+            render_task(task, close=not show_plots)
+        if show_plots:
+            plt.show()
+            plt.close("all")
+        return
+    with ProcessPoolExecutor(
+        max_workers=min(processes, len(tasks)),
+        initializer=init_worker,
+        initargs=(latex, fontsize),
+    ) as pool:
+        # consume the results to raise the exceptions of the workers
+        list(pool.map(render_task, tasks))
+
+
+def make_dirs(plot_dir: Path, formats: list[str]) -> None:
+    for fmt in formats:
+        (plot_dir / fmt).mkdir(parents=True, exist_ok=True)
+
+
+def select(views: list[View], variants: list[str]) -> list[View]:
+    return [view for view in views if view.variant in variants]
+
+
+def finish_axes(ax: Axes, ylabel: str, title: Optional[str]) -> None:
+    ax.set_ylabel(ylabel)
+    ax.set_xlabel("Message Length in Bytes")
+    if title:
+        ax.set_title(title)
+    ax.grid(True)
+    ax.grid(True, which="minor", axis="y", linestyle="--")
     ax.set_ylim(bottom=0)
     ax.yaxis.set_minor_locator(AutoMinorLocator())
     ax.xaxis.set_minor_locator(AutoMinorLocator())
 
-    plt.savefig(png_dir / f"{fname}_cycles.png", dpi=300, bbox_inches="tight")
-    plt.savefig(svg_dir / f"{fname}_cycles.svg", dpi=300, bbox_inches="tight")
 
-    data.plot(x="MessageLength", y="rate", legend=False)
-    plt.fill_between(
+def draw_line(
+    data: pd.DataFrame,
+    std: pd.DataFrame,
+    column: str,
+    ylabel: str,
+    title: Optional[str] = None,
+) -> Axes:
+    _, ax = plt.subplots()
+    data.plot(ax=ax, x="MessageLength", y=column, legend=False)
+    ax.fill_between(
         data["MessageLength"],
-        data["rate"] - std["rate"],
-        data["rate"] + std["rate"],
+        data[column] - std[column],
+        data[column] + std[column],
         alpha=0.5,
     )
-    plt.ylabel("Cycles/byte")
-    plt.xlabel("Message Length in Bytes")
-    if title:
-        plt.title(name)
-    plt.grid(True)
-    plt.grid(True, which="minor", axis="y", linestyle="--")
+    finish_axes(ax, ylabel, title)
+    return ax
+
+
+def draw_misses(
+    data: pd.DataFrame,
+    std: pd.DataFrame,
+    title: Optional[str] = None,
+    blocksize: Optional[int] = None,
+) -> Axes:
+    _, ax = plt.subplots()
+    for counter, label in [
+        ("branch_misses_per_block", "Branch misses"),
+        ("l1d_misses_per_block", "L1D misses"),
+    ]:
+        data.plot(ax=ax, x="MessageLength", y=counter, label=label)
+        ax.fill_between(
+            data["MessageLength"],
+            data[counter] - std[counter],
+            data[counter] + std[counter],
+            alpha=0.5,
+        )
+    finish_axes(ax, "Misses/block" if blocksize else "Misses/byte", title)
+    return ax
+
+
+def draw_compare(
+    data_list: list[pd.DataFrame],
+    std_list: list[pd.DataFrame],
+    labels: list[str],
+    column: str,
+    ylabel: str,
+    title: Optional[str] = None,
+) -> Axes:
+    _, ax = plt.subplots()
+    ax.set_prop_cycle(plot_colors)
+    for data, std, label in zip(data_list, std_list, labels):
+        data.plot(ax=ax, x="MessageLength", y=column, label=label)
+        ax.fill_between(
+            data["MessageLength"],
+            data[column] - std[column],
+            data[column] + std[column],
+            alpha=0.5,
+        )
+    ax.legend(
+        loc="upper left",
+        bbox_to_anchor=(-0.1, -0.225, 1.125, 0.102),
+        mode="expand",
+        ncol=2,
+    )
+    finish_axes(ax, ylabel, title)
+    return ax
+
 
-    ax = plt.gca()
+def draw_throughput(
+    data: pd.DataFrame, column: str, ylabel: str, title: Optional[str] = None
+) -> Axes:
+    _, ax = plt.subplots()
+    ax.set_prop_cycle(plot_colors)
+    for threads, d in data.groupby("threads"):
+        label = f"{threads} thread" + ("s" if threads > 1 else "")
+        d.plot(ax=ax, x="MessageLength", y=column, label=label, marker=".")
+    ax.set_xscale("log", base=2)
+    ax.set_ylabel(ylabel)
+    ax.set_xlabel("Message Length in Bytes")
+    if title:
+        ax.set_title(title)
     ax.set_ylim(bottom=0)
     ax.yaxis.set_minor_locator(AutoMinorLocator())
-    ax.xaxis.set_minor_locator(AutoMinorLocator())
-    plt.savefig(png_dir / f"{fname}_rate.png", dpi=300)
-    plt.savefig(svg_dir / f"{fname}_rate.svg", dpi=300)
-
-    ax.set_xlim(left=100)
-    ax.set_ylim(
-        top=ceil((data["rate"] + std["rate"])[data["MessageLength"] > 100].max())
-    )
-    plt.savefig(png_dir / f"{fname}_rate_cut.png", dpi=300, bbox_inches="tight")
-    plt.savefig(svg_dir / f"{fname}_rate_cut.svg", dpi=300, bbox_inches="tight")
+    ax.grid(True)
+    ax.grid(True, which="minor", axis="y", linestyle="--")
+    return ax
+
+
+def rate_views(
+    data: pd.DataFrame, std: pd.DataFrame, column: str, y_cutoff: float
+) -> list[View]:
+    """The views of a rate figure: all message lengths, message lengths above 100
+    bytes and the rate capped at y_cutoff."""
+    cut = ceil((data[column] + std[column])[data["MessageLength"] > 100].max())
+    return [
+        View("rate", tight=False),
+        View("rate_cut", left=100, top=cut),
+        View("rate_y_cut", left=0, top=y_cutoff),
+    ]
 
-    ax.set_xlim(left=0)
-    ax.set_ylim(top=y_cutoff)
-    plt.savefig(png_dir / f"{fname}_rate_y_cut.png", dpi=300, bbox_inches="tight")
-    plt.savefig(svg_dir / f"{fname}_rate_y_cut.svg", dpi=300, bbox_inches="tight")
 
+def plot_tasks(
+    filename: str,
+    name: str = "null",
+    title: bool = True,
+    maxsize: Optional[int] = None,
+    y_cutoff: float = 5.0,
+    keygen: bool = False,
+    plot_dir: str = "plots/",
+    blocksize: Optional[int] = None,
+    formats: list[str] = DEFAULT_PLOT_FORMATS,
+    variants: list[str] = PLOT_VARIANTS,
+) -> list[PlotTask]:
+    """Aggregates the results of a benchmark and returns the figures of the selected
+    variants."""
+    fname = replace_whitespace(name)
+    plot_dir = Path(plot_dir)
+    make_dirs(plot_dir, formats)
+    data, std = results_aggregate(Path(filename), maxsize)
+    counters = "ipc" in data.columns
+    if counters:
+        for counter in ["branch_misses", "l1d_misses"]:
+            for frame in [data, std]:
+                frame[f"{counter}_per_block"] = frame[f"{counter}_per_byte"] * (
+                    blocksize or 1
+                )
+    figure_title = name if title else None
+
+    figures = [
+        ("cycles", "Cycles", [View("cycles")], ""),
+        (
+            "rate",
+            "Cycles/byte",
+            rate_views(data, std, "rate", y_cutoff),
+            "",
+        ),
+    ]
+    if counters:
+        figures.append(("ipc", "Instructions/cycle", [View("ipc")], ""))
     if keygen:
-        data.plot(x="MessageLength", y="total", legend=False)
-        plt.fill_between(
-            data["MessageLength"],
-            data["total"] - std["total"],
-            data["total"] + std["total"],
-            alpha=0.5,
-        )
-        plt.ylabel("Cycles")
-        plt.xlabel("Message Length in Bytes")
-        if title:
-            plt.title(name)
-        plt.grid(True)
-        plt.grid(True, which="minor", axis="y", linestyle="--")
-
-        ax = plt.gca()
-        ax.set_ylim(bottom=0)
-        ax.yaxis.set_minor_locator(AutoMinorLocator())
-        ax.xaxis.set_minor_locator(AutoMinorLocator())
-
-        plt.savefig(
-            png_dir / f"{fname}_cycles_with_keygen.png", dpi=300, bbox_inches="tight"
-        )
-        plt.savefig(
-            svg_dir / f"{fname}_cycles_with_keygen.svg", dpi=300, bbox_inches="tight"
+        figures.append(("total", "Cycles", [View("cycles")], "_with_keygen"))
+        figures.append(
+            (
+                "rate_total",
+                "Cycles/byte",
+                rate_views(data, std, "rate_total", y_cutoff),
+                "_with_keygen",
+            )
         )
 
-        data.plot(x="MessageLength", y="rate_total", legend=False)
-        plt.fill_between(
-            data["MessageLength"],
-            data["rate_total"] - std["rate_total"],
-            data["rate_total"] + std["rate_total"],
-            alpha=0.5,
-        )
-        plt.ylabel("Cycles/byte")
-        plt.xlabel("Message Length in Bytes")
-        if title:
-            plt.title(name)
-        plt.grid(True)
-        plt.grid(True, which="minor", axis="y", linestyle="--")
-
-        ax = plt.gca()
-        ax.set_ylim(bottom=0)
-        ax.yaxis.set_minor_locator(AutoMinorLocator())
-        ax.xaxis.set_minor_locator(AutoMinorLocator())
-        plt.savefig(png_dir / f"{fname}_rate_with_keygen.png", dpi=300)
-        plt.savefig(svg_dir / f"{fname}_rate_with_keygen.svg", dpi=300)
-
-        ax.set_xlim(left=100)
-        ax.set_ylim(
-            top=ceil(
-                (data["rate_total"] + std["rate_total"])[
-                    data["MessageLength"] > 100
-                ].max()
+    tasks = []
+    for column, ylabel, views, suffix in figures:
+        views = select(views, variants)
+        if views:
+            tasks.append(
+                PlotTask(
+                    draw_line,
+                    {
+                        "data": data,
+                        "std": std,
+                        "column": column,
+                        "ylabel": ylabel,
+                        "title": figure_title,
+                    },
+                    plot_dir,
+                    fname,
+                    views,
+                    formats,
+                    suffix,
+                )
+            )
+    if counters and "misses" in variants:
+        tasks.append(
+            PlotTask(
+                draw_misses,
+                {
+                    "data": data,
+                    "std": std,
+                    "title": figure_title,
+                    "blocksize": blocksize,
+                },
+                plot_dir,
+                fname,
+                [View("misses")],
+                formats,
             )
         )
-        plt.savefig(
-            png_dir / f"{fname}_rate_cut_with_keygen.png", dpi=300, bbox_inches="tight"
-        )
-        plt.savefig(
-            svg_dir / f"{fname}_rate_cut_with_keygen.svg", dpi=300, bbox_inches="tight"
-        )
+    return tasks
 
-        ax.set_xlim(left=0)
-        ax.set_ylim(top=y_cutoff)
-        plt.savefig(
-            png_dir / f"{fname}_rate_y_cut_with_keygen.png",
-            dpi=300,
-            bbox_inches="tight",
-        )
-        plt.savefig(
-            svg_dir / f"{fname}_rate_y_cut_with_keygen.svg",
-            dpi=300,
-            bbox_inches="tight",
+
+def plot(
+    filename: str,
+    name: str = "null",
+    show_plots: bool = False,
+    title: bool = True,
+    latex: bool = False,
+    maxsize: Optional[int] = None,
+    fontsize: Optional[int] = None,
+    y_cutoff: float = 5.0,
+    keygen: bool = False,
+    plot_dir: str = "plots/",
+    blocksize: Optional[int] = None,
+    formats: list[str] = DEFAULT_PLOT_FORMATS,
+    variants: list[str] = PLOT_VARIANTS,
+    processes: int = 1,
+) -> None:
+    render(
+        plot_tasks(
+            filename,
+            name=name,
+            title=title,
+            maxsize=maxsize,
+            y_cutoff=y_cutoff,
+            keygen=keygen,
+            plot_dir=plot_dir,
+            blocksize=blocksize,
+            formats=formats,
+            variants=variants,
+        ),
+        processes=processes,
+        show_plots=show_plots,
+        latex=latex,
+        fontsize=fontsize,
+    )
+
+
+def aggregate_throughput(rawdata: pd.DataFrame) -> pd.DataFrame:
+    """Aggregates the per-thread rows of a throughput benchmark.
+
+    Returns one row per message length and thread count with the aggregate
+    bytes/cycle and GB/s of all threads and the mean bytes/cycle and GB/s per thread.
+    """
+    rawdata = rawdata.assign(bytes=rawdata["hashes"] * rawdata["MessageLength"])
+    data = rawdata.groupby(["MessageLength", "threads"], as_index=False).agg(
+        bytes=("bytes", "sum"),
+        cycles=("cycles", "max"),
+        seconds=("seconds", "max"),
+        thread_bytes_per_cycle=("bytes_per_cycle", "mean"),
+        thread_GBps=("GBps", "mean"),
+    )
+    data["bytes_per_cycle"] = data["bytes"] / data["cycles"]
+    data["GBps"] = data["bytes"] / data["seconds"] / 1e9
+    return data
+
+
+def throughput_tasks(
+    filename: str,
+    name: str = "null",
+    title: bool = True,
+    plot_dir: str = "plots/",
+    formats: list[str] = DEFAULT_PLOT_FORMATS,
+    variants: list[str] = PLOT_VARIANTS,
+) -> list[PlotTask]:
+    """Returns the figures of the aggregate GB/s and the bytes/cycle per thread of a
+    throughput benchmark, with a line per thread count."""
+    fname = replace_whitespace(name)
+    plot_dir = Path(plot_dir)
+    make_dirs(plot_dir, formats)
+    data = cached_aggregate(
+        Path(filename), {}, lambda rawdata: {"data": aggregate_throughput(rawdata)}
+    )["data"]
+
+    return [
+        PlotTask(
+            draw_throughput,
+            {
+                "data": data,
+                "column": column,
+                "ylabel": ylabel,
+                "title": name if title else None,
+            },
+            plot_dir,
+            fname,
+            [View(variant)],
+            formats,
         )
+        for column, ylabel, variant in [
+            ("GBps", "GB/s (all threads)", "throughput"),
+            (
+                "thread_bytes_per_cycle",
+                "Bytes/cycle per thread",
+                "throughput_per_thread",
+            ),
+        ]
+        if variant in variants
+    ]
 
-    if show_plots:
-        plt.show()
 
-    plt.close("all")
+def plot_throughput(
+    filename: str,
+    name: str = "null",
+    show_plots: bool = False,
+    title: bool = True,
+    latex: bool = False,
+    fontsize: Optional[int] = None,
+    plot_dir: str = "plots/",
+    formats: list[str] = DEFAULT_PLOT_FORMATS,
+    variants: list[str] = PLOT_VARIANTS,
+    processes: int = 1,
+) -> None:
+    """Plots the aggregate GB/s and the bytes/cycle per thread of a throughput
+    benchmark, with a line per thread count."""
+    render(
+        throughput_tasks(
+            filename,
+            name=name,
+            title=title,
+            plot_dir=plot_dir,
+            formats=formats,
+            variants=variants,
+        ),
+        processes=processes,
+        show_plots=show_plots,
+        latex=latex,
+        fontsize=fontsize,
+    )
 
 
-def plot_compare(
+def compare_tasks(
     linenums: list[int],
     config: str = "config",
     labels: Optional[list[str]] = None,
-    show_plots: bool = True,
     benchdir: str = "./",
     title: bool | str = True,
-    latex: bool = False,
     maxsize: Optional[int] = None,
-    fontsize: Optional[int] = None,
     y_cutoff: float = 5.0,
     plot_dir: str = "plots/",
-) -> None:
-    if latex:
-        params = {
-            "text.usetex": True,
-            "font.family": "Times",
-        }
-        if fontsize is not None:
-            params["font.size"] = fontsize
-        plt.rcParams.update(params)
-
-    png_dir: Path = plot_dir / "png"
-    svg_dir: Path = plot_dir / "svg"
-    png_dir.mkdir(parents=True, exist_ok=True)
-    svg_dir.mkdir(parents=True, exist_ok=True)
-    fig, ax = plt.subplots()
-    ax.set_prop_cycle(plot_colors)
+    formats: list[str] = DEFAULT_PLOT_FORMATS,
+    variants: list[str] = PLOT_VARIANTS,
+) -> list[PlotTask]:
+    """Aggregates the results of the benchmarks of the given lines of a config file
+    and returns the figures comparing them."""
+    plot_dir = Path(plot_dir)
+    make_dirs(plot_dir, formats)
     if labels is None:
         labels = list(map(str, linenums))
     name = "_".join(list(map(str, linenums)))
@@ -287,252 +629,165 @@ def plot_compare(
     std_list = []
     keygen = False
     for linenum in linenums:
-        rawdata = pd.read_csv(f"{benchdir}{config}_{linenum}_results.csv", comment="#")
-        if "keygen" in rawdata.columns:
-            keygen |= True
-            rawdata["total"] = rawdata["cycles"] + rawdata["keygen"]
-            rawdata["rate_total"] = rawdata["total"] / rawdata["MessageLength"]
-        else:
-            rawdata["total"] = rawdata["cycles"]
-            rawdata["rate_total"] = rawdata["total"] / rawdata["MessageLength"]
-
-        rawdata["rate"] = rawdata["cycles"] / rawdata["MessageLength"]
-        zscores = rawdata.groupby(
-            "MessageLength", as_index=False, group_keys=False
-        ).apply(
-            zscore,
-            # include_groups=False,
-        )
-
-        d = (
-            rawdata[abs(zscores["cycles"]) <= 3]
-            .groupby("MessageLength", as_index=False)
-            .mean()
-        )
-        s = (
-            rawdata[abs(zscores["cycles"]) <= 3]
-            .groupby("MessageLength", as_index=False)
-            .std()
+        d, s = results_aggregate(
+            Path(f"{benchdir}{config}_{linenum}_results.csv"), maxsize
         )
-        if maxsize is not None:
-            d = d[d["MessageLength"] <= maxsize]
-            s = s[s["MessageLength"] <= maxsize]
+        if "total" in d.columns:
+            keygen = True
+        else:
+            for frame in [d, s]:
+                frame["total"] = frame["cycles"]
+                frame["rate_total"] = frame["rate"]
         data_list.append(d)
         std_list.append(s)
 
-    for data, std, label in zip(data_list, std_list, labels):
-        ax = data.plot(ax=ax, x="MessageLength", y="cycles", label=label)
-        ax.fill_between(
-            data["MessageLength"],
-            data["cycles"] - std["cycles"],
-            data["cycles"] + std["cycles"],
-            alpha=0.5,
-        )
-    ax.legend(
-        loc="upper left",
-        bbox_to_anchor=(-0.1, -0.225, 1.125, 0.102),
-        mode="expand",
-        ncol=2,
-    )
-    ax.set_ylabel("Cycles")
-    ax.set_xlabel("Message Length in Bytes")
-    if title:
+    def figure_title(kind: str) -> Optional[str]:
         if isinstance(title, str):
-            ax.set_title(title)
-        else:
-            ax.set_title(f"Cycles comparison of {config}")
-    ax.set_ylim(bottom=0)
-    ax.yaxis.set_minor_locator(AutoMinorLocator())
-    ax.xaxis.set_minor_locator(AutoMinorLocator())
-    # plt.tight_layout()
-    plt.grid(True)
-    plt.grid(True, which="minor", axis="y", linestyle="--")
-    fig.savefig(
-        png_dir / f"{config}_comparison_{name}_cycles.png", dpi=300, bbox_inches="tight"
-    )
-    fig.savefig(
-        svg_dir / f"{config}_comparison_{name}_cycles.svg", dpi=300, bbox_inches="tight"
-    )
-
-    fig2, ax2 = plt.subplots()
-    ax2.set_prop_cycle(plot_colors)
-    maxima = []
-    for data, std, label in zip(data_list, std_list, labels):
-        maxima.append((data["rate"] + std["rate"])[data["MessageLength"] > 250].max())
-        ax2 = data.plot(ax=ax2, x="MessageLength", y="rate", label=label)
-        ax2.fill_between(
-            data["MessageLength"],
-            data["rate"] - std["rate"],
-            data["rate"] + std["rate"],
-            alpha=0.5,
+            return title
+        return f"{kind} comparison of {config}" if title else None
+
+    def views(column: str) -> list[View]:
+        # the rate cut fits the slowest of the compared benchmarks
+        cut = max(
+            ceil((data[column] + std[column])[data["MessageLength"] > 250].max())
+            for data, std in zip(data_list, std_list)
+        )
+        return [
+            View("rate"),
+            View("rate_cut", left=100, top=cut),
+            View("rate_y_cut", left=0, top=y_cutoff),
+        ]
+
+    figures = [
+        ("cycles", "Cycles", "Cycles", [View("cycles")], ""),
+        ("rate", "Cycles/byte", "Rate", views("rate"), ""),
+    ]
+    if keygen:
+        figures.append(("total", "Cycles", "Cycles", [View("cycles")], "_with_keygen"))
+        figures.append(
+            ("rate_total", "Cycles/byte", "Rate", views("rate_total"), "_with_keygen")
         )
-    ax2.legend(
-        loc="upper left",
-        bbox_to_anchor=(-0.1, -0.225, 1.125, 0.102),
-        mode="expand",
-        ncol=2,
-    )
-    ax2.set_ylabel("Cycles/byte")
-    ax2.set_xlabel("Message Length in Bytes")
-    if title:
-        if isinstance(title, str):
-            ax2.set_title(title)
-        else:
-            ax2.set_title(f"Rate comparison of {config}")
-    ax2.set_ylim(bottom=0)
-    ax2.xaxis.set_minor_locator(AutoMinorLocator())
-    ax2.yaxis.set_minor_locator(AutoMinorLocator())
-    # plt.tight_layout()
-    plt.grid(True)
-    plt.grid(True, which="minor", axis="y", linestyle="--")
-    fig2.savefig(
-        png_dir / f"{config}_comparison_{name}_rate.png", dpi=300, bbox_inches="tight"
-    )
-    fig2.savefig(
-        svg_dir / f"{config}_comparison_{name}_rate.svg", dpi=300, bbox_inches="tight"
-    )
 
-    ax2.set_xlim(left=100)
-    ax2.set_ylim(top=ceil(max(maxima)))
-    fig2.savefig(
-        png_dir / f"{config}_comparison_{name}_rate_cut.png",
-        dpi=300,
-        bbox_inches="tight",
-    )
-    fig2.savefig(
-        svg_dir / f"{config}_comparison_{name}_rate_cut.svg",
-        dpi=300,
-        bbox_inches="tight",
-    )
+    tasks = []
+    for column, ylabel, kind, figure_views, suffix in figures:
+        figure_views = select(figure_views, variants)
+        if figure_views:
+            tasks.append(
+                PlotTask(
+                    draw_compare,
+                    {
+                        "data_list": data_list,
+                        "std_list": std_list,
+                        "labels": labels,
+                        "column": column,
+                        "ylabel": ylabel,
+                        "title": figure_title(kind),
+                    },
+                    plot_dir,
+                    f"{config}_comparison_{name}",
+                    figure_views,
+                    formats,
+                    suffix,
+                )
+            )
+    return tasks
 
-    ax2.set_xlim(left=0)
-    ax2.set_ylim(top=y_cutoff)
-    fig2.savefig(
-        png_dir / f"{config}_comparison_{name}_rate_y_cut.png",
-        dpi=300,
-        bbox_inches="tight",
-    )
-    fig2.savefig(
-        svg_dir / f"{config}_comparison_{name}_rate_y_cut.svg",
-        dpi=300,
-        bbox_inches="tight",
+
+def plot_compare(
+    linenums: list[int],
+    config: str = "config",
+    labels: Optional[list[str]] = None,
+    show_plots: bool = True,
+    benchdir: str = "./",
+    title: bool | str = True,
+    latex: bool = False,
+    maxsize: Optional[int] = None,
+    fontsize: Optional[int] = None,
+    y_cutoff: float = 5.0,
+    plot_dir: str = "plots/",
+    formats: list[str] = DEFAULT_PLOT_FORMATS,
+    variants: list[str] = PLOT_VARIANTS,
+    processes: int = 1,
+) -> None:
+    render(
+        compare_tasks(
+            linenums,
+            config=config,
+            labels=labels,
+            benchdir=benchdir,
+            title=title,
+            maxsize=maxsize,
+            y_cutoff=y_cutoff,
+            plot_dir=plot_dir,
+            formats=formats,
+            variants=variants,
+        ),
+        processes=processes,
+        show_plots=show_plots,
+        latex=latex,
+        fontsize=fontsize,
     )
 
-    if keygen:
-        fig, ax = plt.subplots()
-        ax.set_prop_cycle(plot_colors)
-        for data, std, label in zip(data_list, std_list, labels):
-            ax = data.plot(ax=ax, x="MessageLength", y="total", label=label)
-            ax.fill_between(
-                data["MessageLength"],
-                data["total"] - std["total"],
-                data["total"] + std["total"],
-                alpha=0.5,
-            )
-        ax.legend(
-            loc="upper left",
-            bbox_to_anchor=(-0.1, -0.225, 1.125, 0.102),
-            mode="expand",
-            ncol=2,
-        )
-        ax.set_ylabel("Cycles")
-        ax.set_xlabel("Message Length in Bytes")
-        if title:
-            if isinstance(title, str):
-                ax.set_title(title)
-            else:
-                ax.set_title(f"Cycles comparison of {config}")
-        ax.set_ylim(bottom=0)
-        ax.yaxis.set_minor_locator(AutoMinorLocator())
-        ax.xaxis.set_minor_locator(AutoMinorLocator())
-        # plt.tight_layout()
-        plt.grid(True)
-        plt.grid(True, which="minor", axis="y", linestyle="--")
-        fig.savefig(
-            png_dir / f"{config}_comparison_{name}_cycles_with_keygen.png",
-            dpi=300,
-            bbox_inches="tight",
-        )
-        fig.savefig(
-            svg_dir / f"{config}_comparison_{name}_cycles_with_keygen.svg",
-            dpi=300,
-            bbox_inches="tight",
-        )
 
-        fig2, ax2 = plt.subplots()
-        ax2.set_prop_cycle(plot_colors)
-        maxima = []
-        for data, std, label in zip(data_list, std_list, labels):
-            maxima.append(
-                (data["rate_total"] + std["rate_total"])[
-                    data["MessageLength"] > 250
-                ].max()
-            )
-            ax2 = data.plot(ax=ax2, x="MessageLength", y="rate_total", label=label)
-            ax2.fill_between(
-                data["MessageLength"],
-                data["rate_total"] - std["rate_total"],
-                data["rate_total"] + std["rate_total"],
-                alpha=0.5,
-            )
-        ax2.legend(
-            loc="upper left",
-            bbox_to_anchor=(-0.1, -0.225, 1.125, 0.102),
-            mode="expand",
-            ncol=2,
-        )
-        ax2.set_ylabel("Cycles/byte")
-        ax2.set_xlabel("Message Length in Bytes")
-        if title:
-            if isinstance(title, str):
-                ax2.set_title(title)
-            else:
-                ax2.set_title(f"Rate comparison of {config}")
-        ax2.set_ylim(bottom=0)
-        ax2.xaxis.set_minor_locator(AutoMinorLocator())
-        ax2.yaxis.set_minor_locator(AutoMinorLocator())
-        # plt.tight_layout()
-        plt.grid(True)
-        plt.grid(True, which="minor", axis="y", linestyle="--")
-        fig2.savefig(
-            png_dir / f"{config}_comparison_{name}_rate_with_keygen.png",
-            dpi=300,
-            bbox_inches="tight",
-        )
-        fig2.savefig(
-            svg_dir / f"{config}_comparison_{name}_rate_with_keygen.svg",
-            dpi=300,
-            bbox_inches="tight",
-        )
+def write_manifest(bench_dir: Path, entries: list[dict[str, Any]]) -> None:
+    """Writes the figures of a benchmark directory, so they can be rendered again
+    from the stored aggregates by manifest_tasks(). An entry is the kind of figure
+    ("results", "throughput" or "compare") and the arguments of the task function
+    that are independent of the style of the plots."""
+    with open(bench_dir / MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=4)
 
-        ax2.set_xlim(left=100)
-        ax2.set_ylim(top=ceil(max(maxima)))
-        fig2.savefig(
-            png_dir / f"{config}_comparison_{name}_rate_cut_with_keygen.png",
-            dpi=300,
-            bbox_inches="tight",
-        )
-        fig2.savefig(
-            svg_dir / f"{config}_comparison_{name}_rate_cut_with_keygen.svg",
-            dpi=300,
-            bbox_inches="tight",
-        )
 
-        ax2.set_xlim(left=0)
-        ax2.set_ylim(top=y_cutoff)
-        fig2.savefig(
-            png_dir / f"{config}_comparison_{name}_rate_y_cut_with_keygen.png",
-            dpi=300,
-            bbox_inches="tight",
-        )
-        fig2.savefig(
-            svg_dir / f"{config}_comparison_{name}_rate_y_cut_with_keygen.svg",
-            dpi=300,
-            bbox_inches="tight",
-        )
+def read_manifest(bench_dir: Path) -> list[dict[str, Any]]:
+    with open(bench_dir / MANIFEST, encoding="utf-8") as f:
+        return json.load(f)
 
-    if show_plots:
-        fig.show()
-        fig2.show()
 
-    plt.close("all")
+def manifest_tasks(
+    entries: list[dict[str, Any]],
+    bench_dir: Path,
+    plot_dir: Path,
+    title: bool = True,
+    y_cutoff: float = 5.0,
+    formats: list[str] = DEFAULT_PLOT_FORMATS,
+    variants: list[str] = PLOT_VARIANTS,
+) -> list[PlotTask]:
+    """Returns the figures of the entries of a manifest of bench_dir."""
+    tasks = []
+    for entry in entries:
+        if entry["kind"] == "results":
+            tasks += plot_tasks(
+                bench_dir / entry["results"],
+                name=entry["name"],
+                title=title,
+                maxsize=entry["maxsize"],
+                y_cutoff=y_cutoff,
+                keygen=entry["keygen"],
+                plot_dir=plot_dir,
+                blocksize=entry["blocksize"],
+                formats=formats,
+                variants=variants,
+            )
+        elif entry["kind"] == "throughput":
+            tasks += throughput_tasks(
+                bench_dir / entry["results"],
+                name=entry["name"],
+                title=title,
+                plot_dir=plot_dir,
+                formats=formats,
+                variants=variants,
+            )
+        elif entry["kind"] == "compare":
+            tasks += compare_tasks(
+                entry["linenums"],
+                config=entry["config"],
+                labels=entry["labels"],
+                benchdir=f"{bench_dir}/",
+                title=(entry["title"] or True) if title else False,
+                maxsize=entry["maxsize"],
+                y_cutoff=y_cutoff,
+                plot_dir=plot_dir,
+                formats=formats,
+                variants=variants,
+            )
+    return tasks
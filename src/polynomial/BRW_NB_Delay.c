@@ -21,10 +21,11 @@
 // SOFTWARE.
 
 #define OUTER 1
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "BRW_NB_Delay_inner.h"
 #include <stddef.h>
+#include <stdlib.h>
 #include <string.h>
 
 #if EXPLICIT_LENGTH_ENCODE
@@ -45,3 +46,187 @@ void BRW_NB_Delay(unsigned char *out, const unsigned char *in,
     pack_field_elem((baseint_t *)tag_packed, &acc);
     transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
 }
+
+// Streaming evaluation: blocks are combined four at a time exactly as in
+// BRW_NB_Delay_inner, the key powers and the partial products of the tree are
+// kept in the state. A full chunk is kept pending until more data arrives
+// since the last blocks are encoded differently.
+#define BRW_STREAM_CHUNKSIZE (16 * BLOCKSIZE)
+#if NB_BLOCK_DELAY
+#define BRW_TREE_ELEM_T dfield_elem_t
+#define DECLARE_ACC_D dfield_elem_t a_d = {0};
+#else
+#define BRW_TREE_ELEM_T field_elem_t
+#define DECLARE_ACC_D
+#endif
+
+typedef struct BRW_NB_Delay_state BRW_NB_Delay_state_t;
+
+struct BRW_NB_Delay_state {
+    field_elem_t k[sizeof(unsigned long long) * 8]; // k[i] = key^(2^i)
+    BRW_TREE_ELEM_T T[sizeof(unsigned long long) * 8];
+    unsigned long long blocks; // number of blocks combined into T
+    const unsigned char *key;
+    unsigned long long keylen;
+    unsigned long long msglen;
+    unsigned long long pendinglen;
+    unsigned char pending[BRW_STREAM_CHUNKSIZE];
+};
+
+BRW_NB_Delay_state_t *BRW_NB_Delay_init(const unsigned char *key,
+                                        unsigned long long keylen) {
+    BRW_NB_Delay_state_t *state = calloc(1, sizeof(BRW_NB_Delay_state_t));
+    if (!state)
+        return NULL;
+    state->key = key;
+    state->keylen = keylen;
+    unpack_and_encode_key(state->k, (baseint_t *)key);
+    for (int i = 0; i + 1 < sizeof(unsigned long long) * 8; ++i) {
+        field_sqr(state->k + i + 1, state->k + i);
+    }
+    return state;
+}
+
+// combines four blocks, the last one encoded with lastlen bytes if last
+static inline void BRW_NB_Delay_add_four(BRW_NB_Delay_state_t *state,
+                                         field_elem_t *a,
+                                         const unsigned char *in,
+                                         unsigned long long lastlen, int last) {
+    DECLARE_ACC_D
+    field_elem_t *k = state->k;
+    BRW_TREE_ELEM_T *T = state->T;
+    unsigned int i, sp;
+    for (i = 0; i < 3; ++i) {
+        unpack_and_encode_field_elem(a + i, (baseint_t *)(in + i * BLOCKSIZE));
+    }
+    if (last) {
+        unpack_and_encode_last_field_elem(
+            a + 3, (baseint_t *)(in + 3 * BLOCKSIZE), lastlen);
+    } else {
+        unpack_and_encode_field_elem(a + 3, (baseint_t *)(in + 3 * BLOCKSIZE));
+    }
+    state->blocks += 4;
+    field_add(a, a, k);
+    field_add(a + 1, a + 1, k + 1);
+    MULT_THEN_ADD;
+
+    sp = __builtin_ctzll(state->blocks);
+    for (i = 0; i + 2 < sp; ++i) {
+        ADD_TO_ACC;
+    }
+    CARRY;
+    field_add(a + 3, a + 3, k + sp);
+    MULT_TO_TREE;
+}
+
+static inline void BRW_NB_Delay_absorb(BRW_NB_Delay_state_t *state,
+                                       const unsigned char *in,
+                                       unsigned long long inlen) {
+    field_elem_t a[4];
+    for (; inlen > 0; inlen -= 4 * BLOCKSIZE) {
+        BRW_NB_Delay_add_four(state, a, in, 0, 0);
+        in += 4 * BLOCKSIZE;
+    }
+}
+
+// the remaining blocks after the last group of four of BRW_NB_Delay_inner
+static inline void BRW_NB_Delay_finish(BRW_NB_Delay_state_t *state,
+                                       field_elem_t *out,
+                                       const unsigned char *in,
+                                       unsigned long long inlen) {
+    field_elem_t a[4] = {0};
+    DECLARE_ACC_D
+    field_elem_t *k = state->k;
+    BRW_TREE_ELEM_T *T = state->T;
+    unsigned int i;
+    unsigned long long blkctr = 0;
+    const unsigned long long lastlen = ((inlen - 1) % BLOCKSIZE) + 1;
+    unsigned long long noOfBlocks =
+        inlen / BLOCKSIZE + (inlen % BLOCKSIZE != 0);
+
+    switch (noOfBlocks) {
+    case 4:
+        BRW_NB_Delay_add_four(state, a, in, lastlen, 1);
+        REINIT_ACC;
+        break;
+    case 1:
+        unpack_and_encode_last_field_elem(a, (baseint_t *)in, lastlen);
+        REINIT_ACC_B;
+        state->blocks += 1;
+        break;
+    case 2:
+        unpack_and_encode_field_elem(a, (baseint_t *)in);
+        blkctr += BLOCKSIZE;
+        unpack_and_encode_last_field_elem(a + 1, (baseint_t *)(in + blkctr),
+                                          lastlen);
+        LAST_MUL_ADD;
+        state->blocks += 2;
+        break;
+    case 3:
+        for (i = 0; i < 2; ++i) {
+            unpack_and_encode_field_elem(a + i, (baseint_t *)(in + blkctr));
+            blkctr += BLOCKSIZE;
+        }
+        unpack_and_encode_last_field_elem(a + 2, (baseint_t *)(in + blkctr),
+                                          lastlen);
+        field_add(a, a, k);
+        field_add(a + 1, a + 1, k + 1);
+        MULT_THEN_ADD;
+        state->blocks += 3;
+        break;
+    }
+
+    noOfBlocks = state->blocks >> 2;
+    for (i = 0; noOfBlocks > 0; ++i, noOfBlocks >>= 1) {
+        if ((noOfBlocks & 1) == 1) {
+            ADD_TO_ACC;
+        }
+    }
+
+    LAST_CARRY;
+}
+
+void BRW_NB_Delay_update(BRW_NB_Delay_state_t *state, const unsigned char *in,
+                         unsigned long long inlen) {
+    state->msglen += inlen;
+    if (state->pendinglen) {
+        unsigned long long n = BRW_STREAM_CHUNKSIZE - state->pendinglen;
+        if (n > inlen)
+            n = inlen;
+        memcpy(state->pending + state->pendinglen, in, n);
+        state->pendinglen += n;
+        in += n;
+        inlen -= n;
+        if (inlen == 0)
+            return;
+        BRW_NB_Delay_absorb(state, state->pending, BRW_STREAM_CHUNKSIZE);
+        state->pendinglen = 0;
+    }
+    while (inlen > BRW_STREAM_CHUNKSIZE) {
+        BRW_NB_Delay_absorb(state, in, BRW_STREAM_CHUNKSIZE);
+        in += BRW_STREAM_CHUNKSIZE;
+        inlen -= BRW_STREAM_CHUNKSIZE;
+    }
+    memcpy(state->pending, in, inlen);
+    state->pendinglen = inlen;
+}
+
+void BRW_NB_Delay_final(BRW_NB_Delay_state_t *state, unsigned char *out) {
+    field_elem_t acc = {0};
+    unsigned char tag_packed[BUFFSIZE] = {0};
+    if (state->pendinglen) {
+        // all but the last one to four blocks are combined as groups of four
+        unsigned long long head =
+            ((state->pendinglen - 1) / (4 * BLOCKSIZE)) * (4 * BLOCKSIZE);
+        BRW_NB_Delay_absorb(state, state->pending, head);
+        BRW_NB_Delay_finish(state, &acc, state->pending + head,
+                            state->pendinglen - head);
+    }
+#if EXPLICIT_LENGTH_ENCODE
+    LENGTH_ENCODING(&acc, &acc, state->key, state->keylen, state->msglen);
+#endif
+    reduce(&acc, &acc);
+    pack_field_elem((baseint_t *)tag_packed, &acc);
+    transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+    free(state);
+}
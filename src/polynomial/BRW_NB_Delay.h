@@ -29,4 +29,18 @@ void BRW_NB_Delay(unsigned char *out, const unsigned char *in,
                        unsigned long long inlen, const unsigned char *key,
                        unsigned long long keylen);
 
+typedef struct BRW_NB_Delay_state BRW_NB_Delay_state_t;
+
+BRW_NB_Delay_state_t *BRW_NB_Delay_init(const unsigned char *key,
+                                        unsigned long long keylen);
+
+void BRW_NB_Delay_update(BRW_NB_Delay_state_t *state, const unsigned char *in,
+                         unsigned long long inlen);
+
+void BRW_NB_Delay_final(BRW_NB_Delay_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T BRW_NB_Delay_state_t
+#define POLY_STREAM_INIT BRW_NB_Delay_init
+#define POLY_STREAM_UPDATE BRW_NB_Delay_update
+#define POLY_STREAM_FINAL BRW_NB_Delay_final
+
 #endif
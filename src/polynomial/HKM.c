@@ -21,10 +21,11 @@
 // SOFTWARE.
 
 #define OUTER 1
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "HKM_inner.h"
 #include <stddef.h>
+#include <stdlib.h>
 #include <string.h>
 #if EXPLICIT_LENGTH_ENCODE
 #include "../length_encoding.h"
@@ -43,3 +44,109 @@ void HKM(unsigned char *out, const unsigned char *in, unsigned long long inlen,
     pack_field_elem((baseint_t *)tag_packed, &acc);
     transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
 }
+
+// Streaming evaluation: the blocks are chained exactly as in HKM_inner, the
+// first block and every odd block are keyed and multiplied into the
+// accumulator, the even blocks are added. A full chunk is kept pending until
+// more data arrives since the last block is encoded differently.
+#define HKM_STREAM_CHUNKSIZE (16 * BLOCKSIZE)
+
+typedef struct HKM_state HKM_state_t;
+
+struct HKM_state {
+    field_elem_t acc;
+    unsigned long long blocks; // number of blocks chained into acc
+    const unsigned char *key;
+    unsigned long long keylen;
+    unsigned long long msglen;
+    unsigned long long pendinglen;
+    unsigned char pending[HKM_STREAM_CHUNKSIZE];
+};
+
+HKM_state_t *HKM_init(const unsigned char *key, unsigned long long keylen) {
+    HKM_state_t *state = calloc(1, sizeof(HKM_state_t));
+    if (!state)
+        return NULL;
+    state->key = key;
+    state->keylen = keylen;
+    return state;
+}
+
+static inline void HKM_add_block(HKM_state_t *state, field_elem_t *a) {
+    dfield_elem_t acc_d = {0};
+    field_elem_t k = {0};
+    if (state->blocks == 0 || state->blocks & 1) {
+        unpack_and_encode_key(
+            &k,
+            (baseint_t *)(state->key + ((state->blocks + 1) / 2) * KEYSIZE));
+        field_add(a, a, &k);
+        _carry_round(a, a);
+        if (state->blocks == 0) {
+            state->acc = *a;
+        } else {
+            field_mul_no_carry(&acc_d, &state->acc, a);
+            carry_round(&state->acc, &acc_d);
+        }
+    } else {
+        field_add(&state->acc, &state->acc, a);
+        _carry_round(&state->acc, &state->acc);
+    }
+    state->blocks++;
+}
+
+static inline void HKM_absorb(HKM_state_t *state, const unsigned char *in,
+                              unsigned long long inlen) {
+    field_elem_t a = {0};
+    for (; inlen > 0; inlen -= BLOCKSIZE) {
+        unpack_and_encode_field_elem(&a, (baseint_t *)in);
+        HKM_add_block(state, &a);
+        in += BLOCKSIZE;
+    }
+}
+
+void HKM_update(HKM_state_t *state, const unsigned char *in,
+                unsigned long long inlen) {
+    state->msglen += inlen;
+    if (state->pendinglen) {
+        unsigned long long n = HKM_STREAM_CHUNKSIZE - state->pendinglen;
+        if (n > inlen)
+            n = inlen;
+        memcpy(state->pending + state->pendinglen, in, n);
+        state->pendinglen += n;
+        in += n;
+        inlen -= n;
+        if (inlen == 0)
+            return;
+        HKM_absorb(state, state->pending, HKM_STREAM_CHUNKSIZE);
+        state->pendinglen = 0;
+    }
+    while (inlen > HKM_STREAM_CHUNKSIZE) {
+        HKM_absorb(state, in, HKM_STREAM_CHUNKSIZE);
+        in += HKM_STREAM_CHUNKSIZE;
+        inlen -= HKM_STREAM_CHUNKSIZE;
+    }
+    memcpy(state->pending, in, inlen);
+    state->pendinglen = inlen;
+}
+
+void HKM_final(HKM_state_t *state, unsigned char *out) {
+    field_elem_t a = {0};
+    unsigned char tag_packed[BUFFSIZE] = {0};
+    if (state->pendinglen) {
+        unsigned long long lastlen = ((state->pendinglen - 1) % BLOCKSIZE) + 1;
+        HKM_absorb(state, state->pending, state->pendinglen - lastlen);
+        unpack_and_encode_last_field_elem(
+            &a, (baseint_t *)(state->pending + state->pendinglen - lastlen),
+            lastlen);
+        HKM_add_block(state, &a);
+    }
+    _carry_round(&state->acc, &state->acc);
+#if EXPLICIT_LENGTH_ENCODE
+    LENGTH_ENCODING(&state->acc, &state->acc, state->key, state->keylen,
+                    state->msglen);
+#endif
+    reduce(&state->acc, &state->acc);
+    pack_field_elem((baseint_t *)tag_packed, &state->acc);
+    transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+    free(state);
+}
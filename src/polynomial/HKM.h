@@ -22,6 +22,7 @@
 
 #ifndef __HKM_H
 #define __HKM_H
+#include "../length_encoding.h"
 #include <stddef.h>
 #include <string.h>
 
@@ -42,4 +43,17 @@ unsigned long long get_keylength(unsigned long long inlen) {
 void HKM(unsigned char *out, const unsigned char *in, unsigned long long inlen,
          const unsigned char *key, unsigned long long keylen);
 
+typedef struct HKM_state HKM_state_t;
+
+HKM_state_t *HKM_init(const unsigned char *key, unsigned long long keylen);
+
+void HKM_update(HKM_state_t *state, const unsigned char *in,
+                unsigned long long inlen);
+
+void HKM_final(HKM_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T HKM_state_t
+#define POLY_STREAM_INIT HKM_init
+#define POLY_STREAM_UPDATE HKM_update
+#define POLY_STREAM_FINAL HKM_final
+
 #endif
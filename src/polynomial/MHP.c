@@ -20,11 +20,12 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "boost/preprocessor/repetition/repeat.hpp"
 #include "boost/preprocessor/repetition/repeat_from_to.hpp"
 #include <stddef.h>
+#include <stdlib.h>
 #include <string.h>
 
 #if defined(INNERPOLY_H) && defined(INNERPOLY)
@@ -36,7 +37,7 @@
 #endif
 
 #define WHILE_HANDLE_VAR(z, idx, data)                                         \
-    INNERPOLY(&acc[NUM_KEYS - idx - 1], in + i, len, &inner_state,             \
+    INNERPOLY(&acc[NUM_KEYS - idx - 1], in + i, len, inner_key,                \
               ((i + SUPERBLOCKSIZE) >= inlen));                                \
     i += SUPERBLOCKSIZE;                                                       \
     deg[NUM_KEYS - idx - 1] = 0;                                               \
@@ -51,8 +52,33 @@
     carry_round(&acc[idx], &acc_d[idx]);                                       \
     }
 
-void MHP(unsigned char *out, const unsigned char *in, unsigned long long inlen,
-         const unsigned char *key, unsigned long long keylen) {
+// the inner keys and the outer keys, unpacked once for all messages
+typedef struct MHP_keys {
+    INNER_STATE_T inner_state;
+    field_elem_t k[NUM_KEYS];
+} MHP_keys_t;
+
+static inline void MHP_keys_init(MHP_keys_t *keys, const unsigned char *key) {
+    memset(keys, 0, sizeof(MHP_keys_t));
+    INNER_STATE_INIT(&keys->inner_state, key);
+    const unsigned char *outer_key = key + SUPERKEYSIZE;
+
+#ifdef __GNUC__
+#ifdef __clang__
+#pragma unroll 65534
+#else
+#pragma GCC unroll 65534
+#endif
+#endif
+    for (int j = 0; j < NUM_KEYS; j++) {
+        unpack_and_encode_key(&keys->k[j],
+                              (baseint_t *)(&outer_key[j * KEYSIZE]));
+    }
+}
+
+static void MHP_eval(unsigned char *out, const unsigned char *in,
+                     unsigned long long inlen, const unsigned char *key,
+                     unsigned long long keylen, MHP_keys_t *keys) {
 #if EXPLICIT_LENGTH_ENCODE
     const unsigned long long msglen = inlen;
 #endif
@@ -73,26 +99,13 @@ void MHP(unsigned char *out, const unsigned char *in, unsigned long long inlen,
     field_elem_t acc[NUM_KEYS] = {0};
     int deg[NUM_KEYS] = {0};
     dfield_elem_t acc_d[NUM_KEYS] = {0};
-    field_elem_t k[NUM_KEYS] = {0};
+    field_elem_t *k = keys->k;
+    INNER_STATE_T *inner_key = &keys->inner_state;
     unsigned long long i = 0;
 
-    INNER_STATE_T inner_state = INNER_STATE_ZERO;
-    INNER_STATE_INIT(&inner_state, key);
-    const unsigned char *outer_key = key + SUPERKEYSIZE;
-
-#ifdef __GNUC__
-#ifdef __clang__
-#pragma unroll 65534
-#else
-#pragma GCC unroll 65534
-#endif
-#endif
-    for (int j = 0; j < NUM_KEYS; j++) {
-        unpack_and_encode_key(&k[j], (baseint_t *)(&outer_key[j * KEYSIZE]));
-    }
     unsigned long long len =
         (i + SUPERBLOCKSIZE) > inlen ? inlen - i : SUPERBLOCKSIZE;
-    INNERPOLY(&acc[NUM_KEYS - 1], in + i, len, &inner_state,
+    INNERPOLY(&acc[NUM_KEYS - 1], in + i, len, inner_key,
               ((i + SUPERBLOCKSIZE) >= inlen));
     i += SUPERBLOCKSIZE;
     deg[NUM_KEYS - 1] = 0;
@@ -104,7 +117,7 @@ void MHP(unsigned char *out, const unsigned char *in, unsigned long long inlen,
 
         BOOST_PP_REPEAT_FROM_TO(1, NUM_KEYS, WHILE_HANDLE_VAR, 0);
 
-        INNERPOLY(&acc[0], in + i, len, &inner_state,
+        INNERPOLY(&acc[0], in + i, len, inner_key,
                   ((i + SUPERBLOCKSIZE) >= inlen));
         i += SUPERBLOCKSIZE;
         field_add_mix(&acc_d[0], &acc_d[0], &acc[0]);
@@ -121,3 +134,151 @@ void MHP(unsigned char *out, const unsigned char *in, unsigned long long inlen,
     pack_field_elem((baseint_t *)tag_packed, &acc[NUM_KEYS - 1]);
     transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
 }
+
+// hashes count messages with the same key, the keys are unpacked only once
+void MHP_many(unsigned char *out, const unsigned char *const *in,
+              const unsigned long long *inlen, unsigned long long count,
+              const unsigned char *key, unsigned long long keylen) {
+    MHP_keys_t keys;
+    MHP_keys_init(&keys, key);
+    for (unsigned long long i = 0; i < count; ++i) {
+        MHP_eval(out + i * OUTPUTSIZE, in[i], inlen[i], key, keylen, &keys);
+    }
+}
+
+void MHP(unsigned char *out, const unsigned char *in, unsigned long long inlen,
+         const unsigned char *key, unsigned long long keylen) {
+    MHP_many(out, &in, &inlen, 1, key, keylen);
+}
+
+// Streaming evaluation: the nested loops of MHP are unrolled into a state
+// machine, level c holds the subtree the last superblock was added to and
+// the levels above it hold their partial products in acc_d. A full
+// superblock is kept pending until more data arrives since the last
+// superblock is encoded differently.
+typedef struct MHP_state MHP_state_t;
+
+struct MHP_state {
+    INNER_STATE_T inner_state;
+    field_elem_t acc[NUM_KEYS];
+    dfield_elem_t acc_d[NUM_KEYS];
+    field_elem_t k[NUM_KEYS];
+    unsigned long long deg[NUM_KEYS];
+    int c;
+    unsigned long long n; // number of superblocks added
+    const unsigned char *key;
+    unsigned long long keylen;
+    unsigned long long msglen;
+    unsigned long long pendinglen;
+    unsigned char pending[SUPERBLOCKSIZE];
+};
+
+MHP_state_t *MHP_init(const unsigned char *key, unsigned long long keylen) {
+    MHP_state_t *state = calloc(1, sizeof(MHP_state_t));
+    if (!state)
+        return NULL;
+    INNER_STATE_INIT(&state->inner_state, key);
+    state->key = key;
+    state->keylen = keylen;
+    const unsigned char *outer_key = key + SUPERKEYSIZE;
+    for (int j = 0; j < NUM_KEYS; j++) {
+        unpack_and_encode_key(&state->k[j],
+                              (baseint_t *)(&outer_key[j * KEYSIZE]));
+    }
+    return state;
+}
+
+#if NUM_KEYS > 1
+// adds the finished subtree of level c to the partial product of its parent
+static inline void MHP_combine(MHP_state_t *state) {
+    const int c = state->c;
+    field_add_mix(&state->acc_d[c + 1], &state->acc_d[c + 1], &state->acc[c]);
+    carry_round(&state->acc[c + 1], &state->acc_d[c + 1]);
+    state->c++;
+}
+#endif
+
+static inline void MHP_absorb(MHP_state_t *state, const unsigned char *in,
+                              unsigned long long inlen, int last) {
+    if (state->n++ == 0) {
+        INNERPOLY(&state->acc[NUM_KEYS - 1], in, inlen, &state->inner_state,
+                  last);
+        state->c = NUM_KEYS - 1;
+        return;
+    }
+#if NUM_KEYS > 1
+    while (state->c < NUM_KEYS - 1 &&
+           state->deg[state->c] >= state->deg[state->c + 1]) {
+        MHP_combine(state);
+    }
+#endif
+    const int c = state->c;
+    field_mul_no_carry(&state->acc_d[c], &state->acc[c], &state->k[c]);
+    state->deg[c]++;
+#if NUM_KEYS > 1
+    if (c > 0) {
+        state->c--;
+        INNERPOLY(&state->acc[c - 1], in, inlen, &state->inner_state, last);
+        state->deg[c - 1] = 0;
+        return;
+    }
+#endif
+    INNERPOLY(&state->acc[0], in, inlen, &state->inner_state, last);
+    field_add_mix(&state->acc_d[0], &state->acc_d[0], &state->acc[0]);
+    carry_round(&state->acc[0], &state->acc_d[0]);
+}
+
+void MHP_update(MHP_state_t *state, const unsigned char *in,
+                unsigned long long inlen) {
+    state->msglen += inlen;
+    if (state->pendinglen) {
+        unsigned long long n = SUPERBLOCKSIZE - state->pendinglen;
+        if (n > inlen)
+            n = inlen;
+        memcpy(state->pending + state->pendinglen, in, n);
+        state->pendinglen += n;
+        in += n;
+        inlen -= n;
+        if (inlen == 0)
+            return;
+        MHP_absorb(state, state->pending, SUPERBLOCKSIZE, 0);
+        state->pendinglen = 0;
+    }
+    while (inlen > SUPERBLOCKSIZE) {
+        MHP_absorb(state, in, SUPERBLOCKSIZE, 0);
+        in += SUPERBLOCKSIZE;
+        inlen -= SUPERBLOCKSIZE;
+    }
+    memcpy(state->pending, in, inlen);
+    state->pendinglen = inlen;
+}
+
+void MHP_final(MHP_state_t *state, unsigned char *out) {
+    field_elem_t *acc = &state->acc[NUM_KEYS - 1];
+    unsigned char tag_packed[BUFFSIZE] = {0};
+    if (state->msglen == 0) {
+#if EXPLICIT_LENGTH_ENCODE
+        LENGTH_ENCODING(acc, acc, state->key, state->keylen, state->msglen);
+        reduce(acc, acc);
+        pack_field_elem((baseint_t *)tag_packed, acc);
+        transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+#else
+        memset(out, 0, OUTPUTSIZE);
+#endif
+        free(state);
+        return;
+    }
+    MHP_absorb(state, state->pending, state->pendinglen, 1);
+#if NUM_KEYS > 1
+    while (state->c < NUM_KEYS - 1) {
+        MHP_combine(state);
+    }
+#endif
+#if EXPLICIT_LENGTH_ENCODE
+    LENGTH_ENCODING(acc, acc, state->key, state->keylen, state->msglen);
+#endif
+    reduce(acc, acc);
+    pack_field_elem((baseint_t *)tag_packed, acc);
+    transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+    free(state);
+}
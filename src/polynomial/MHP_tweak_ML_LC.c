@@ -20,7 +20,7 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "boost/preprocessor/repetition/repeat.hpp"
 #include "boost/preprocessor/repetition/repeat_from_to.hpp"
@@ -21,7 +21,7 @@
 // SOFTWARE.
 
 #define OUTER 1
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "MMH_NB_Delay_inner.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
@@ -30,6 +30,7 @@
 #include "boost/preprocessor/repetition/repeat.hpp"
 #include "boost/preprocessor/repetition/repeat_from_to.hpp"
 #include <stddef.h>
+#include <stdlib.h>
 #include <string.h>
 
 #if EXPLICIT_LENGTH_ENCODE
@@ -50,3 +51,32 @@ void MMH_NB_Delay(unsigned char *out, const unsigned char *in,
     pack_field_elem((baseint_t *)tag_packed, &acc);
     transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
 }
+
+// The inner polynomial leaves the last block of its input unkeyed, chunks
+// other than the last one are therefore keyed block by block.
+static inline void MMH_NB_Delay_stream_chunk(field_elem_t *out,
+                                             const unsigned char *in,
+                                             unsigned long long inlen,
+                                             const unsigned char *key,
+                                             int last) {
+    if (last) {
+        MMH_NB_Delay_inner(out, in, inlen, key, 1);
+        return;
+    }
+    field_elem_t a = {0};
+    field_elem_t k = {0};
+    memset(out, 0, sizeof(field_elem_t));
+    for (; inlen > 0; inlen -= BLOCKSIZE) {
+        unpack_and_encode_field_elem(&a, (baseint_t *)in);
+        unpack_and_encode_key(&k, (baseint_t *)key);
+        field_mul(&a, &a, &k);
+        field_add(out, out, &a);
+        _carry_round(out, out);
+        in += BLOCKSIZE;
+        key += KEYSIZE;
+    }
+}
+
+#define SUM_STREAM_POLY MMH_NB_Delay
+#define SUM_STREAM_CHUNK MMH_NB_Delay_stream_chunk
+#include "sum_stream.h"
@@ -37,4 +37,18 @@ void MMH_NB_Delay(unsigned char *out, const unsigned char *in,
                   unsigned long long inlen, const unsigned char *key,
                   unsigned long long keylen);
 
+typedef struct MMH_NB_Delay_state MMH_NB_Delay_state_t;
+
+MMH_NB_Delay_state_t *MMH_NB_Delay_init(const unsigned char *key,
+                                        unsigned long long keylen);
+
+void MMH_NB_Delay_update(MMH_NB_Delay_state_t *state, const unsigned char *in,
+                         unsigned long long inlen);
+
+void MMH_NB_Delay_final(MMH_NB_Delay_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T MMH_NB_Delay_state_t
+#define POLY_STREAM_INIT MMH_NB_Delay_init
+#define POLY_STREAM_UPDATE MMH_NB_Delay_update
+#define POLY_STREAM_FINAL MMH_NB_Delay_final
+
 #endif
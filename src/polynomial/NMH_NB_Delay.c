@@ -21,7 +21,7 @@
 // SOFTWARE.
 
 #define OUTER 1
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "NMH_NB_Delay_inner.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
@@ -32,6 +32,7 @@
 #include "boost/preprocessor/repetition/repeat.hpp"
 #include "boost/preprocessor/repetition/repeat_from_to.hpp"
 #include <stddef.h>
+#include <stdlib.h>
 #include <string.h>
 
 #if EXPLICIT_LENGTH_ENCODE
@@ -52,3 +53,9 @@ void NMH_NB_Delay(unsigned char *out, const unsigned char *in,
     pack_field_elem((baseint_t *)tag_packed, &acc);
     transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
 }
+
+// streaming evaluation, chunks of an even number of blocks are pairs of keyed
+// blocks only, they are evaluated with the inner polynomial
+#define SUM_STREAM_POLY NMH_NB_Delay
+#define SUM_STREAM_CHUNK NMH_NB_Delay_inner
+#include "sum_stream.h"
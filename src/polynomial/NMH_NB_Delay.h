@@ -37,4 +37,18 @@ void NMH_NB_Delay(unsigned char *out, const unsigned char *in,
                   unsigned long long inlen, const unsigned char *key,
                   unsigned long long keylen);
 
+typedef struct NMH_NB_Delay_state NMH_NB_Delay_state_t;
+
+NMH_NB_Delay_state_t *NMH_NB_Delay_init(const unsigned char *key,
+                                        unsigned long long keylen);
+
+void NMH_NB_Delay_update(NMH_NB_Delay_state_t *state, const unsigned char *in,
+                         unsigned long long inlen);
+
+void NMH_NB_Delay_final(NMH_NB_Delay_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T NMH_NB_Delay_state_t
+#define POLY_STREAM_INIT NMH_NB_Delay_init
+#define POLY_STREAM_UPDATE NMH_NB_Delay_update
+#define POLY_STREAM_FINAL NMH_NB_Delay_final
+
 #endif
@@ -37,4 +37,18 @@ void SQH_NB_Delay(unsigned char *out, const unsigned char *in,
                   unsigned long long inlen, const unsigned char *key,
                   unsigned long long keylen);
 
+typedef struct SQH_NB_Delay_state SQH_NB_Delay_state_t;
+
+SQH_NB_Delay_state_t *SQH_NB_Delay_init(const unsigned char *key,
+                                        unsigned long long keylen);
+
+void SQH_NB_Delay_update(SQH_NB_Delay_state_t *state, const unsigned char *in,
+                         unsigned long long inlen);
+
+void SQH_NB_Delay_final(SQH_NB_Delay_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T SQH_NB_Delay_state_t
+#define POLY_STREAM_INIT SQH_NB_Delay_init
+#define POLY_STREAM_UPDATE SQH_NB_Delay_update
+#define POLY_STREAM_FINAL SQH_NB_Delay_final
+
 #endif
@@ -20,8 +20,9 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
+#include "classical_2level_2B_UPK_Delay_a.h"
 #include <stddef.h>
 #include <string.h>
 
@@ -152,3 +153,7 @@ void classical_2level_2B_UPK_Delay_a(unsigned char *out,
         out, OUTPUTSIZE, tag_packed,
         BUFFSIZE); // transform from field element to byte missing?
 }
+
+// streaming evaluation, chunks are evaluated with Horner's rule block by block
+#define HORNER_STREAM_POLY classical_2level_2B_UPK_Delay_a
+#include "horner_stream.h"
@@ -21,8 +21,9 @@
 // SOFTWARE.
 
 #define OUTER 1
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
+#include "classical_2level_NB_Delay_a.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
 #include "boost/preprocessor/arithmetic/sub.hpp"
@@ -45,3 +46,10 @@ void classical_2level_NB_Delay_a(unsigned char *out, const unsigned char *in,
         out, OUTPUTSIZE, tag_packed,
         BUFFSIZE); // transform from field element to byte missing?
 }
+
+// streaming evaluation, chunks are evaluated with the two-level inner
+// polynomial
+#define HORNER_STREAM_POLY classical_2level_NB_Delay_a
+#define HORNER_STREAM_CHUNK(out, in, inlen, state, last)                       \
+    classical_2level_NB_Delay_a_inner(out, in, inlen, (state)->key, last)
+#include "horner_stream.h"
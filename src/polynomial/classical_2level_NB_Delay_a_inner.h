@@ -20,7 +20,7 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
@@ -107,16 +107,15 @@ INLINE void classical_2level_NB_Delay_a_inner(field_elem_t *acc,
         BOOST_PP_REPEAT(BOOST_PP_SUB(i, 2), COMPUTE_POWER_ITERATION, k);       \
         BOOST_PP_REPEAT(BOOST_PP_SUB(i, 1), UNPACK_AND_ENCODE, a);             \
         if (last) {                                                            \
-            unpack_and_encode_last_field_elem(a + nbBlockFlvl - i - 1,         \
-                                              (baseint_t *)in, inlen);         \
+            unpack_and_encode_last_field_elem(a + i - 1, (baseint_t *)in,      \
+                                              inlen);                          \
         } else {                                                               \
-            unpack_and_encode_field_elem(a + nbBlockFlvl - i - 1,              \
-                                         (baseint_t *)in);                     \
+            unpack_and_encode_field_elem(a + i - 1, (baseint_t *)in);          \
         }                                                                      \
-        field_mul_no_carry(acc_d + i - 2, a, k + i - 2);                       \
+        field_mul_no_carry(acc_d + i - 2, a + i - 2, k);                       \
         BOOST_PP_REPEAT(BOOST_PP_SUB(i, 2), FIELD_MUL_NO_CARRY_ACC_A,          \
                         k + i - 2);                                            \
-        BOOST_PP_REPEAT_FROM_TO(1, BOOST_PP_SUB(i, 2), FIELD_ADD_DBL_CHAIN,    \
+        BOOST_PP_REPEAT_FROM_TO(1, BOOST_PP_SUB(i, 1), FIELD_ADD_DBL_CHAIN,    \
                                 acc_d);                                        \
         field_add_mix(acc_d, acc_d, a + i - 1);                                \
         carry_round(acc, acc_d);                                               \
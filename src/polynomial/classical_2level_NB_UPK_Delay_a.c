@@ -21,8 +21,9 @@
 // SOFTWARE.
 
 #define OUTER 1
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
+#include "classical_2level_NB_UPK_Delay_a.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
 #include "boost/preprocessor/arithmetic/sub.hpp"
@@ -40,17 +41,55 @@ void classical_2level_NB_UPK_Delay_a(unsigned char *out,
                                      unsigned long long inlen,
                                      const unsigned char *key,
                                      unsigned long long keylen) {
+    classical_2level_NB_UPK_Delay_a_many(out, &in, &inlen, 1, key, keylen);
+}
+
+// hashes count messages with the same key, the key (and its powers) are
+// unpacked only once
+void classical_2level_NB_UPK_Delay_a_many(unsigned char *out,
+                                          const unsigned char *const *in,
+                                          const unsigned long long *inlen,
+                                          unsigned long long count,
+                                          const unsigned char *key,
+                                          unsigned long long keylen) {
     field_elem_t acc;
     unsigned char tag_packed[BUFFSIZE] = {0};
-    classical_2level_NB_UPK_Delay_a_inner(&acc, in, inlen, key, 1);
+
+#if defined(NO_INNER_CACHE)
+#define INNER_KEY key
+#else
+    INNER_STATE_T inner_state;
+    INNER_STATE_INIT(&inner_state, key);
+#define INNER_KEY &inner_state
+#endif
+    for (unsigned long long i = 0; i < count; ++i) {
+        classical_2level_NB_UPK_Delay_a_inner(&acc, in[i], inlen[i], INNER_KEY,
+                                              1);
 #if EXPLICIT_LENGTH_ENCODE
-    LENGTH_ENCODING(&acc, &acc, key, keylen, inlen);
+        LENGTH_ENCODING(&acc, &acc, key, keylen, inlen[i]);
 #endif
-    pack_field_elem((baseint_t *)tag_packed,
-                    &acc); // transform limb representation of field element
-                           // (unpacked) into packed field element
+        pack_field_elem((baseint_t *)tag_packed,
+                        &acc); // transform limb representation of field
+                               // element (unpacked) into packed field element
 
-    transform_field_elem(
-        out, OUTPUTSIZE, tag_packed,
-        BUFFSIZE); // transform from field element to byte missing?
+        transform_field_elem(out + i * OUTPUTSIZE, OUTPUTSIZE, tag_packed,
+                             BUFFSIZE);
+    }
+#undef INNER_KEY
 }
+
+// streaming evaluation, chunks are evaluated with the two-level inner
+// polynomial
+#define HORNER_STREAM_POLY classical_2level_NB_UPK_Delay_a
+#define HORNER_STREAM_LENGTH_ENCODE 1
+#if defined(NO_INNER_CACHE)
+#define HORNER_STREAM_CHUNK(out, in, inlen, state, last)                       \
+    classical_2level_NB_UPK_Delay_a_inner(out, in, inlen, (state)->key, last)
+#else
+#define HORNER_STREAM_INNER_STATE_T INNER_STATE_T
+#define HORNER_STREAM_INNER_STATE_INIT INNER_STATE_INIT
+#define HORNER_STREAM_CHUNK(out, in, inlen, state, last)                       \
+    classical_2level_NB_UPK_Delay_a_inner(out, in, inlen, &(state)->inner,     \
+                                          last)
+#endif
+#include "horner_stream.h"
@@ -31,4 +31,30 @@ void classical_2level_NB_UPK_Delay_a(unsigned char *out,
                                      const unsigned char *key,
                                      unsigned long long keylen);
 
+void classical_2level_NB_UPK_Delay_a_many(unsigned char *out,
+                                          const unsigned char *const *in,
+                                          const unsigned long long *inlen,
+                                          unsigned long long count,
+                                          const unsigned char *key,
+                                          unsigned long long keylen);
+#define POLY_EVAL_MANY classical_2level_NB_UPK_Delay_a_many
+
+typedef struct classical_2level_NB_UPK_Delay_a_state
+    classical_2level_NB_UPK_Delay_a_state_t;
+
+classical_2level_NB_UPK_Delay_a_state_t *
+classical_2level_NB_UPK_Delay_a_init(const unsigned char *key,
+                                     unsigned long long keylen);
+
+void classical_2level_NB_UPK_Delay_a_update(
+    classical_2level_NB_UPK_Delay_a_state_t *state, const unsigned char *in,
+    unsigned long long inlen);
+
+void classical_2level_NB_UPK_Delay_a_final(
+    classical_2level_NB_UPK_Delay_a_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T classical_2level_NB_UPK_Delay_a_state_t
+#define POLY_STREAM_INIT classical_2level_NB_UPK_Delay_a_init
+#define POLY_STREAM_UPDATE classical_2level_NB_UPK_Delay_a_update
+#define POLY_STREAM_FINAL classical_2level_NB_UPK_Delay_a_final
+
 #endif
@@ -20,7 +20,7 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
@@ -63,7 +63,7 @@
     FIELD_MUL_PC_NO_CARRY(acc_d + n, a + n, data - n);
 #define FIELD_ADD_DBL_CHAIN(z, n, data) field_add_dbl(data, data, data + n);
 
-#if defined(OUTER) || defined(NO_INNER_CACHE)
+#if defined(NO_INNER_CACHE)
 #else
 #define UNPACK_AND_ENCODE_KEY(res, k)
 typedef struct classical_2level_NB_UPK_Delay_a_inner_state {
@@ -93,7 +93,7 @@ INLINE void classical_2level_NB_UPK_Delay_a_inner_state_init(
     memcpy(&(state->key), k, sizeof(state->key));
 }
 #endif
-#if defined(OUTER) || defined(NO_INNER_CACHE)
+#if defined(NO_INNER_CACHE)
 INLINE void classical_2level_NB_UPK_Delay_a_inner(field_elem_t *out,
                                                   const unsigned char *in,
                                                   unsigned long long inlen,
@@ -114,7 +114,7 @@ INLINE void classical_2level_NB_UPK_Delay_a_inner(
     field_elem_t acc;
     dfield_elem_t acc_d[NB_BLOCK_FLVL] = {0};
     field_elem_t a[NB_BLOCK_FLVL] = {0};
-#if defined(OUTER) || defined(NO_INNER_CACHE)
+#if defined(NO_INNER_CACHE)
     DECLARE_PC_ELEM_ARRAY(k, NB_BLOCK_FLVL);
 
     // Transform key from a byte array to one field elements
@@ -128,7 +128,7 @@ INLINE void classical_2level_NB_UPK_Delay_a_inner(
         UNPACK_AND_ENCODE_LAST_FIELD_ELEM(out, (baseint_t *)in, inlen);
     } else if (inlen <= NB_BLOCK_FLVL_BLOCKSIZE) {
 
-#if defined(OUTER) || defined(NO_INNER_CACHE)
+#if defined(NO_INNER_CACHE)
 #define PRECOMPUTE_KEY_POWER(z, i, data)                                       \
     FIELD_MUL_PC_NO_CARRY(acc_d, NOT_PRECOMPUTED(k) + i, k);                   \
     carry_round(NOT_PRECOMPUTED(k) + BOOST_PP_ADD(i, 1), acc_d);               \
@@ -168,7 +168,7 @@ INLINE void classical_2level_NB_UPK_Delay_a_inner(
     } else { // process msg of more than nbBlockFlvl Blocks
              // compute key powers for parallel horner
 
-#if defined(OUTER) || defined(NO_INNER_CACHE)
+#if defined(NO_INNER_CACHE)
         for (int j = 0; j < BOOST_PP_SUB(NB_BLOCK_FLVL, 1); ++j) {
             FIELD_MUL_PC_NO_CARRY(acc_d, NOT_PRECOMPUTED(k) + j, k);
             carry_round(NOT_PRECOMPUTED(k) + j + 1, acc_d);
@@ -20,8 +20,9 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
+#include "classical_Horner_UPK_NoDelay.h"
 #include <stddef.h>
 #include <string.h>
 
@@ -33,53 +34,53 @@ void classical_Horner_UPK_NoDelay(unsigned char *out, const unsigned char *in,
                                   unsigned long long inlen,
                                   const unsigned char *key,
                                   unsigned long long keylen) {
-    if (inlen == 0) {
-        memset(out, 0, OUTPUTSIZE);
-        return;
-    }
-    field_elem_t acc = {0}; // accumulator for horner algorithm
+    classical_Horner_UPK_NoDelay_many(out, &in, &inlen, 1, key, keylen);
+}
+
+// hashes count messages with the same key, the key is unpacked only once
+void classical_Horner_UPK_NoDelay_many(unsigned char *out,
+                                       const unsigned char *const *in,
+                                       const unsigned long long *inlen,
+                                       unsigned long long count,
+                                       const unsigned char *key,
+                                       unsigned long long keylen) {
+    field_elem_t acc; // accumulator for horner algorithm
     field_elem_t
         a; // temporary field element representing the block being processed
-    // field_elem_t k; // univariate key
-    // field_elem_precomputed_t k_p;
     DECLARE_PC_ELEM(k);
-    // unsigned char buff[BUFFSIZE] = {0};
     unsigned char tag_packed[BUFFSIZE] = {0}; // what is this size?
 
     // Transform key from a byte array to one field elements
-
     UNPACK_AND_ENCODE_PC_KEY(k, key);
     INIT_PC_KEY(&k, &NOT_PRECOMPUTED(k));
-    // unpack_field_elem(&k, (baseint_t *) transkey); // transform field
-    // element(packed) into limb representation precompute_factor(&k_p, &k);
 
-    // processing all blocks except the last one (possibly smaller)
-    while (inlen > BLOCKSIZE) {
-        // transform_msg(buff, BUFFSIZE, in, BLOCKSIZE); // transform msg block
-        // from bytes to field elements (packed) unpack_field_elem(&a,
-        // (baseint_t *) buff); // transform field element(packed) into limb
-        // representation
-        unpack_and_encode_field_elem(&a, (baseint_t *)in);
+    for (unsigned long long i = 0; i < count; ++i) {
+        const unsigned char *m = in[i];
+        unsigned long long mlen = inlen[i];
+        if (mlen == 0) {
+            memset(out + i * OUTPUTSIZE, 0, OUTPUTSIZE);
+            continue;
+        }
+        memset(&acc, 0, sizeof(acc));
+        // processing all blocks except the last one (possibly smaller)
+        while (mlen > BLOCKSIZE) {
+            unpack_and_encode_field_elem(&a, (baseint_t *)m);
+            field_add_reduce(&acc, &acc, &a);
+            FIELD_MUL_PC_REDUCE(&acc, &acc, &k)
+            mlen -= BLOCKSIZE;
+            m += BLOCKSIZE;
+        }
+        // processing last block
+        unpack_and_encode_last_field_elem(&a, (baseint_t *)m, mlen);
         field_add_reduce(&acc, &acc, &a);
-        // field_mul_precomputed_reduce(&acc, &acc, &k_p);
-        FIELD_MUL_PC_REDUCE(&acc, &acc, &k)
-        inlen -= BLOCKSIZE;
-        in += BLOCKSIZE;
+        pack_field_elem((baseint_t *)tag_packed,
+                        &acc); // transform limb representation of field
+                               // element (unpacked) into packed field element
+        transform_field_elem(out + i * OUTPUTSIZE, OUTPUTSIZE, tag_packed,
+                             BUFFSIZE);
     }
-    // processing last block
-    if (inlen) {
-        // memset(buff, 0, BUFFSIZE);
-        // transform_msg(buff, BUFFSIZE, in, inlen); // transform msg block from
-        // bytes to field elements (packed) unpack_field_elem(&a, (baseint_t *)
-        // buff); // transform field element(packed) into limb representation
-        // unpack_and_encode_last_field_elem(&a, (baseint_t *) buff, inlen);
-        unpack_and_encode_last_field_elem(&a, (baseint_t *)in, inlen);
-        field_add_reduce(&acc, &acc, &a);
-    }
-    pack_field_elem((baseint_t *)tag_packed,
-                    &acc); // transform limb representation of field element
-                           // (unpacked) into packed field element
-    transform_field_elem(
-        out, OUTPUTSIZE, tag_packed,
-        BUFFSIZE); // transform from field element to byte missing?
 }
+
+// streaming evaluation, Horner's rule block by block
+#define HORNER_STREAM_POLY classical_Horner_UPK_NoDelay
+#include "horner_stream.h"
@@ -30,4 +30,30 @@ void classical_Horner_UPK_NoDelay(unsigned char *out, const unsigned char *in,
                                   const unsigned char *key,
                                   unsigned long long keylen);
 
+void classical_Horner_UPK_NoDelay_many(unsigned char *out,
+                                       const unsigned char *const *in,
+                                       const unsigned long long *inlen,
+                                       unsigned long long count,
+                                       const unsigned char *key,
+                                       unsigned long long keylen);
+#define POLY_EVAL_MANY classical_Horner_UPK_NoDelay_many
+
+typedef struct classical_Horner_UPK_NoDelay_state
+    classical_Horner_UPK_NoDelay_state_t;
+
+classical_Horner_UPK_NoDelay_state_t *
+classical_Horner_UPK_NoDelay_init(const unsigned char *key,
+                                  unsigned long long keylen);
+
+void classical_Horner_UPK_NoDelay_update(
+    classical_Horner_UPK_NoDelay_state_t *state, const unsigned char *in,
+    unsigned long long inlen);
+
+void classical_Horner_UPK_NoDelay_final(
+    classical_Horner_UPK_NoDelay_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T classical_Horner_UPK_NoDelay_state_t
+#define POLY_STREAM_INIT classical_Horner_UPK_NoDelay_init
+#define POLY_STREAM_UPDATE classical_Horner_UPK_NoDelay_update
+#define POLY_STREAM_FINAL classical_Horner_UPK_NoDelay_final
+
 #endif
@@ -21,15 +21,17 @@
 // SOFTWARE.
 
 #define OUTER 1
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
 #include "boost/preprocessor/arithmetic/sub.hpp"
 #include "boost/preprocessor/repetition/repeat.hpp"
 #include "boost/preprocessor/repetition/repeat_from_to.hpp"
+#include "classical_ParallelHorner_UPK_1B_Delay_a.h"
 #include "classical_ParallelHorner_UPK_1B_Delay_a_inner.h"
 #include <stddef.h>
+#include <stdlib.h>
 #include <string.h>
 #if EXPLICIT_LENGTH_ENCODE
 #include "../length_encoding.h"
@@ -41,14 +43,53 @@ void classical_ParallelHorner_UPK_1B_Delay_a(unsigned char *out,
                                              unsigned long long inlen,
                                              const unsigned char *key,
                                              unsigned long long keylen) {
-    field_elem_t acc = {0};
+    classical_ParallelHorner_UPK_1B_Delay_a_many(out, &in, &inlen, 1, key,
+                                                 keylen);
+}
+
+// hashes count messages with the same key, the key (and its powers) are
+// unpacked only once
+void classical_ParallelHorner_UPK_1B_Delay_a_many(
+    unsigned char *out, const unsigned char *const *in,
+    const unsigned long long *inlen, unsigned long long count,
+    const unsigned char *key, unsigned long long keylen) {
+    field_elem_t acc;
     unsigned char tag_packed[BUFFSIZE] = {0};
 
-    classical_ParallelHorner_UPK_1B_Delay_a_inner(&acc, in, inlen, key, 1);
-    reduce(&acc, &acc);
+#if defined(NO_INNER_CACHE)
+#define INNER_KEY key
+#else
+    INNER_STATE_T inner_state;
+    INNER_STATE_INIT(&inner_state, key);
+#define INNER_KEY &inner_state
+#endif
+    for (unsigned long long i = 0; i < count; ++i) {
+        memset(&acc, 0, sizeof(acc));
+        classical_ParallelHorner_UPK_1B_Delay_a_inner(&acc, in[i], inlen[i],
+                                                      INNER_KEY, 1);
+        reduce(&acc, &acc);
 #if EXPLICIT_LENGTH_ENCODE
-    LENGTH_ENCODING(&acc, &acc, key, keylen, inlen);
+        LENGTH_ENCODING(&acc, &acc, key, keylen, inlen[i]);
 #endif
-    pack_field_elem((baseint_t *)tag_packed, &acc);
-    transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+        pack_field_elem((baseint_t *)tag_packed, &acc);
+        transform_field_elem(out + i * OUTPUTSIZE, OUTPUTSIZE, tag_packed,
+                             BUFFSIZE);
+    }
+#undef INNER_KEY
 }
+
+// streaming evaluation, chunks are evaluated with the parallel inner polynomial
+#define HORNER_STREAM_POLY classical_ParallelHorner_UPK_1B_Delay_a
+#define HORNER_STREAM_LENGTH_ENCODE 1
+#if defined(NO_INNER_CACHE)
+#define HORNER_STREAM_CHUNK(out, in, inlen, state, last)                       \
+    classical_ParallelHorner_UPK_1B_Delay_a_inner(out, in, inlen,              \
+                                                  (state)->key, last)
+#else
+#define HORNER_STREAM_INNER_STATE_T INNER_STATE_T
+#define HORNER_STREAM_INNER_STATE_INIT INNER_STATE_INIT
+#define HORNER_STREAM_CHUNK(out, in, inlen, state, last)                       \
+    classical_ParallelHorner_UPK_1B_Delay_a_inner(out, in, inlen,              \
+                                                  &(state)->inner, last)
+#endif
+#include "horner_stream.h"
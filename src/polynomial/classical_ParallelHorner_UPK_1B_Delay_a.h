@@ -31,4 +31,29 @@ void classical_ParallelHorner_UPK_1B_Delay_a(unsigned char *out,
                                              const unsigned char *key,
                                              unsigned long long keylen);
 
+void classical_ParallelHorner_UPK_1B_Delay_a_many(
+    unsigned char *out, const unsigned char *const *in,
+    const unsigned long long *inlen, unsigned long long count,
+    const unsigned char *key, unsigned long long keylen);
+#define POLY_EVAL_MANY classical_ParallelHorner_UPK_1B_Delay_a_many
+
+typedef struct classical_ParallelHorner_UPK_1B_Delay_a_state
+    classical_ParallelHorner_UPK_1B_Delay_a_state_t;
+
+classical_ParallelHorner_UPK_1B_Delay_a_state_t *
+classical_ParallelHorner_UPK_1B_Delay_a_init(const unsigned char *key,
+                                             unsigned long long keylen);
+
+void classical_ParallelHorner_UPK_1B_Delay_a_update(
+    classical_ParallelHorner_UPK_1B_Delay_a_state_t *state,
+    const unsigned char *in, unsigned long long inlen);
+
+void classical_ParallelHorner_UPK_1B_Delay_a_final(
+    classical_ParallelHorner_UPK_1B_Delay_a_state_t *state,
+    unsigned char *out);
+#define POLY_STREAM_STATE_T classical_ParallelHorner_UPK_1B_Delay_a_state_t
+#define POLY_STREAM_INIT classical_ParallelHorner_UPK_1B_Delay_a_init
+#define POLY_STREAM_UPDATE classical_ParallelHorner_UPK_1B_Delay_a_update
+#define POLY_STREAM_FINAL classical_ParallelHorner_UPK_1B_Delay_a_final
+
 #endif
@@ -20,7 +20,7 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
@@ -74,7 +74,7 @@
     field_add_mix(acc##_d, acc##_d + i, acc);                                  \
     carry_round(acc, acc##_d);
 
-#if defined(OUTER) || defined(NO_INNER_CACHE)
+#if defined(NO_INNER_CACHE)
 #else
 #define UNPACK_AND_ENCODE_KEY(res, k)
 typedef struct classical_ParallelHorner_UPK_1B_Delay_a_inner_state {
@@ -104,7 +104,7 @@ INLINE void classical_ParallelHorner_UPK_1B_Delay_a_inner_state_init(
 #endif
 // reduction after addition only
 
-#if defined(OUTER) || defined(NO_INNER_CACHE)
+#if defined(NO_INNER_CACHE)
 INLINE void classical_ParallelHorner_UPK_1B_Delay_a_inner(
     field_elem_t *out, const unsigned char *in, unsigned long long inlen,
     const unsigned char *key, int last)
@@ -122,7 +122,7 @@ INLINE void classical_ParallelHorner_UPK_1B_Delay_a_inner(
     dfield_elem_t acc_d[NB_BRANCH] = {0};
     field_elem_t a[NB_BRANCH] = {0};
 
-#if defined(OUTER) || defined(NO_INNER_CACHE)
+#if defined(NO_INNER_CACHE)
     DECLARE_PC_ELEM_ARRAY(k, NB_BRANCH);
 
     // Transform key from a byte array to one field elements
@@ -137,7 +137,7 @@ INLINE void classical_ParallelHorner_UPK_1B_Delay_a_inner(
         // transform msg  block from bytes to field elements (packed)
         UNPACK_AND_ENCODE_LAST_FIELD_ELEM(out, (baseint_t *)in, inlen);
     } else {
-#if defined(OUTER) || defined(NO_INNER_CACHE)
+#if defined(NO_INNER_CACHE)
         // compute key powers for parallel horner
         for (int j = 0; j < NB_BRANCH - 1; ++j) {
             FIELD_MUL_PC_NO_CARRY(acc_d, NOT_PRECOMPUTED(k) + j, k);
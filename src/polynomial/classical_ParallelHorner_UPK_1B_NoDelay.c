@@ -21,8 +21,9 @@
 // SOFTWARE.
 
 #define OUTER 1
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
+#include "classical_ParallelHorner_UPK_1B_NoDelay.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
 #include "boost/preprocessor/arithmetic/sub.hpp"
@@ -44,3 +45,10 @@ void classical_ParallelHorner_UPK_1B_NoDelay(unsigned char *out,
     pack_field_elem((baseint_t *)tag_packed, &acc);
     transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
 }
+
+// streaming evaluation, chunks are evaluated with the parallel inner polynomial
+#define HORNER_STREAM_POLY classical_ParallelHorner_UPK_1B_NoDelay
+#define HORNER_STREAM_CHUNK(out, in, inlen, state, last)                       \
+    classical_ParallelHorner_UPK_1B_NoDelay_inner(out, in, inlen,              \
+                                                  (state)->key, last)
+#include "horner_stream.h"
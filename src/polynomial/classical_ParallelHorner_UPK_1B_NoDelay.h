@@ -31,4 +31,22 @@ void classical_ParallelHorner_UPK_1B_NoDelay(unsigned char *out,
                                              const unsigned char *key,
                                              unsigned long long keylen);
 
+typedef struct classical_ParallelHorner_UPK_1B_NoDelay_state
+    classical_ParallelHorner_UPK_1B_NoDelay_state_t;
+
+classical_ParallelHorner_UPK_1B_NoDelay_state_t *
+classical_ParallelHorner_UPK_1B_NoDelay_init(const unsigned char *key,
+                                             unsigned long long keylen);
+
+void classical_ParallelHorner_UPK_1B_NoDelay_update(
+    classical_ParallelHorner_UPK_1B_NoDelay_state_t *state,
+    const unsigned char *in, unsigned long long inlen);
+
+void classical_ParallelHorner_UPK_1B_NoDelay_final(
+    classical_ParallelHorner_UPK_1B_NoDelay_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T classical_ParallelHorner_UPK_1B_NoDelay_state_t
+#define POLY_STREAM_INIT classical_ParallelHorner_UPK_1B_NoDelay_init
+#define POLY_STREAM_UPDATE classical_ParallelHorner_UPK_1B_NoDelay_update
+#define POLY_STREAM_FINAL classical_ParallelHorner_UPK_1B_NoDelay_final
+
 #endif
@@ -20,7 +20,7 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
@@ -107,7 +107,7 @@ INLINE void classical_ParallelHorner_UPK_1B_NoDelay_inner(
         for (int j = 1; j < i - 1; ++j) {                                      \
             field_add_reduce(acc, acc + j, acc);                               \
         }                                                                      \
-        field_add_reduce(out, acc + i - 1, acc);                               \
+        field_add_reduce(acc, acc + i - 1, acc);                               \
     } else
         // end IF_LESS_THAN_N_BLOCKS
         BOOST_PP_REPEAT_FROM_TO(2, BOOST_PP_ADD(NB_BRANCH, 1),
@@ -20,11 +20,12 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "boost/preprocessor/repetition/repeat.hpp"
 #include "boost/preprocessor/repetition/repeat_from_to.hpp"
 #include <stddef.h>
+#include <stdlib.h>
 #include <string.h>
 
 #if defined(INNERPOLY_H) && defined(INNERPOLY)
@@ -44,9 +45,40 @@
 #include "../length_encoding.h"
 #endif
 
-void d2LHP(unsigned char *out, const unsigned char *in,
-           unsigned long long inlen, const unsigned char *key,
-           unsigned long long keylen) {
+// the inner keys, the outer key and its power for a superblock, unpacked once
+// for all messages
+typedef struct d2LHP_keys {
+    INNER_STATE_T inner_state;
+    field_elem_t k;
+    field_elem_t k_pow;
+} d2LHP_keys_t;
+
+static inline void d2LHP_keys_init(d2LHP_keys_t *keys,
+                                   const unsigned char *key) {
+    memset(keys, 0, sizeof(d2LHP_keys_t));
+    INNER_STATE_INIT(&keys->inner_state, key);
+    const unsigned char *outer_key = key + SUPERKEYSIZE;
+
+    // #ifdef __GNUC__
+    // #ifdef __clang__
+    // #pragma unroll 65534
+    // #else
+    // #pragma GCC unroll 65534
+    // #endif
+    // #endif
+    unpack_and_encode_key(&keys->k, (baseint_t *)(outer_key));
+    // TODO: Some computing of keypowers
+    memcpy(&keys->k_pow, &keys->k, sizeof(keys->k_pow));
+    uint64_t delta = (1ULL << (NB_KEYS)) - 1ULL;
+    // printf("%"PRIu64"\n", delta);
+    for (uint64_t i = 0; i < delta; i++) {
+        field_mul(&keys->k_pow, &keys->k_pow, &keys->k);
+    }
+}
+
+static void d2LHP_eval(unsigned char *out, const unsigned char *in,
+                       unsigned long long inlen, const unsigned char *key,
+                       unsigned long long keylen, d2LHP_keys_t *keys) {
 #if EXPLICIT_LENGTH_ENCODE
     const unsigned long long msglen = inlen;
 #endif
@@ -66,38 +98,20 @@ void d2LHP(unsigned char *out, const unsigned char *in,
 
     field_elem_t acc = {0};
     dfield_elem_t acc_d = {0};
-    field_elem_t k = {0};
-    field_elem_t k_pow = {0};
+    field_elem_t k = keys->k;
+    field_elem_t k_pow = keys->k_pow;
+    INNER_STATE_T *inner_key = &keys->inner_state;
     unsigned long long i = 0;
 
-    INNER_STATE_T inner_state = INNER_STATE_ZERO;
-    INNER_STATE_INIT(&inner_state, key);
-    const unsigned char *outer_key = key + SUPERKEYSIZE;
-
-    // #ifdef __GNUC__
-    // #ifdef __clang__
-    // #pragma unroll 65534
-    // #else
-    // #pragma GCC unroll 65534
-    // #endif
-    // #endif
-    unpack_and_encode_key(&k, (baseint_t *)(outer_key));
-    // TODO: Some computing of keypowers
-    memcpy(&k_pow, &k, sizeof(k_pow));
-    uint64_t delta = (1ULL << (NB_KEYS)) - 1ULL;
-    // printf("%"PRIu64"\n", delta);
-    for (uint64_t i = 0; i < delta; i++) {
-        field_mul(&k_pow, &k_pow, &k);
-    }
     if (inlen >= SUPERBLOCKSIZE) {
-        INNERPOLY(&acc, in + i, SUPERBLOCKSIZE, &inner_state,
+        INNERPOLY(&acc, in + i, SUPERBLOCKSIZE, inner_key,
                   ((i + SUPERBLOCKSIZE) == inlen));
         i += SUPERBLOCKSIZE;
 
         while (i + SUPERBLOCKSIZE <= inlen) {
             field_mul_no_carry(&acc_d, &acc, &k_pow);
 
-            INNERPOLY(&acc, in + i, SUPERBLOCKSIZE, &inner_state,
+            INNERPOLY(&acc, in + i, SUPERBLOCKSIZE, inner_key,
                       ((i + SUPERBLOCKSIZE) == inlen));
             i += SUPERBLOCKSIZE;
             field_add_mix(&acc_d, &acc_d, &acc);
@@ -108,7 +122,7 @@ void d2LHP(unsigned char *out, const unsigned char *in,
     if (i < inlen) {
         if (inlen - i > SUPERBLOCKSIZE - BLOCKSIZE) {
             field_mul_no_carry(&acc_d, &acc, &k_pow);
-            INNERPOLY(&acc, in + i, inlen - i, &inner_state, 1);
+            INNERPOLY(&acc, in + i, inlen - i, inner_key, 1);
             i += SUPERBLOCKSIZE;
             field_add_mix(&acc_d, &acc_d, &acc);
             carry_round(&acc, &acc_d);
@@ -135,3 +149,141 @@ void d2LHP(unsigned char *out, const unsigned char *in,
     pack_field_elem((baseint_t *)tag_packed, &acc);
     transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
 }
+
+// hashes count messages with the same key, the keys are unpacked only once
+void d2LHP_many(unsigned char *out, const unsigned char *const *in,
+                const unsigned long long *inlen, unsigned long long count,
+                const unsigned char *key, unsigned long long keylen) {
+    d2LHP_keys_t keys;
+    d2LHP_keys_init(&keys, key);
+    for (unsigned long long i = 0; i < count; ++i) {
+        d2LHP_eval(out + i * OUTPUTSIZE, in[i], inlen[i], key, keylen, &keys);
+    }
+}
+
+void d2LHP(unsigned char *out, const unsigned char *in,
+           unsigned long long inlen, const unsigned char *key,
+           unsigned long long keylen) {
+    d2LHP_many(out, &in, &inlen, 1, key, keylen);
+}
+
+// Streaming evaluation: full superblocks are combined exactly as in d2LHP, a
+// full superblock is kept pending until more data arrives since the last
+// superblock is encoded differently.
+typedef struct d2LHP_state d2LHP_state_t;
+
+struct d2LHP_state {
+    INNER_STATE_T inner_state;
+    field_elem_t acc;
+    field_elem_t k;
+    field_elem_t k_pow;
+    unsigned long long n; // number of superblocks combined into acc
+    const unsigned char *key;
+    unsigned long long keylen;
+    unsigned long long msglen;
+    unsigned long long pendinglen;
+    unsigned char pending[SUPERBLOCKSIZE];
+};
+
+d2LHP_state_t *d2LHP_init(const unsigned char *key, unsigned long long keylen) {
+    d2LHP_state_t *state = calloc(1, sizeof(d2LHP_state_t));
+    if (!state)
+        return NULL;
+    INNER_STATE_INIT(&state->inner_state, key);
+    state->key = key;
+    state->keylen = keylen;
+    unpack_and_encode_key(&state->k, (baseint_t *)(key + SUPERKEYSIZE));
+    memcpy(&state->k_pow, &state->k, sizeof(state->k_pow));
+    uint64_t delta = (1ULL << (NB_KEYS)) - 1ULL;
+    for (uint64_t i = 0; i < delta; i++) {
+        field_mul(&state->k_pow, &state->k_pow, &state->k);
+    }
+    return state;
+}
+
+static inline void d2LHP_absorb(d2LHP_state_t *state, const unsigned char *in,
+                                int last) {
+    dfield_elem_t acc_d = {0};
+    if (state->n == 0) {
+        INNERPOLY(&state->acc, in, SUPERBLOCKSIZE, &state->inner_state, last);
+    } else {
+        field_mul_no_carry(&acc_d, &state->acc, &state->k_pow);
+        INNERPOLY(&state->acc, in, SUPERBLOCKSIZE, &state->inner_state, last);
+        field_add_mix(&acc_d, &acc_d, &state->acc);
+        carry_round(&state->acc, &acc_d);
+    }
+    state->n++;
+}
+
+void d2LHP_update(d2LHP_state_t *state, const unsigned char *in,
+                  unsigned long long inlen) {
+    state->msglen += inlen;
+    if (state->pendinglen) {
+        unsigned long long n = SUPERBLOCKSIZE - state->pendinglen;
+        if (n > inlen)
+            n = inlen;
+        memcpy(state->pending + state->pendinglen, in, n);
+        state->pendinglen += n;
+        in += n;
+        inlen -= n;
+        if (inlen == 0)
+            return;
+        d2LHP_absorb(state, state->pending, 0);
+        state->pendinglen = 0;
+    }
+    while (inlen > SUPERBLOCKSIZE) {
+        d2LHP_absorb(state, in, 0);
+        in += SUPERBLOCKSIZE;
+        inlen -= SUPERBLOCKSIZE;
+    }
+    memcpy(state->pending, in, inlen);
+    state->pendinglen = inlen;
+}
+
+void d2LHP_final(d2LHP_state_t *state, unsigned char *out) {
+    field_elem_t *acc = &state->acc;
+    dfield_elem_t acc_d = {0};
+    unsigned char tag_packed[BUFFSIZE] = {0};
+    const unsigned char *in = state->pending;
+    unsigned long long inlen = state->pendinglen;
+    if (state->msglen == 0) {
+#if EXPLICIT_LENGTH_ENCODE
+        LENGTH_ENCODING(acc, acc, state->key, state->keylen, state->msglen);
+        reduce(acc, acc);
+        pack_field_elem((baseint_t *)tag_packed, acc);
+        transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+#else
+        memset(out, 0, OUTPUTSIZE);
+#endif
+        free(state);
+        return;
+    }
+    if (inlen == SUPERBLOCKSIZE) {
+        d2LHP_absorb(state, in, 1);
+    } else if (inlen > SUPERBLOCKSIZE - BLOCKSIZE) {
+        field_mul_no_carry(&acc_d, acc, &state->k_pow);
+        INNERPOLY(acc, in, inlen, &state->inner_state, 1);
+        field_add_mix(&acc_d, &acc_d, acc);
+        carry_round(acc, &acc_d);
+    } else {
+        while (inlen > BLOCKSIZE) {
+            field_mul_no_carry(&acc_d, acc, &state->k);
+            unpack_and_encode_field_elem(acc, (baseint_t *)in);
+            field_add_mix(&acc_d, &acc_d, acc);
+            carry_round(acc, &acc_d);
+            in += BLOCKSIZE;
+            inlen -= BLOCKSIZE;
+        }
+        field_mul_no_carry(&acc_d, acc, &state->k);
+        unpack_and_encode_last_field_elem(acc, (baseint_t *)in, inlen);
+        field_add_mix(&acc_d, &acc_d, acc);
+        carry_round(acc, &acc_d);
+    }
+#if EXPLICIT_LENGTH_ENCODE
+    LENGTH_ENCODING(acc, acc, state->key, state->keylen, state->msglen);
+#endif
+    reduce(acc, acc);
+    pack_field_elem((baseint_t *)tag_packed, acc);
+    transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+    free(state);
+}
@@ -40,8 +40,36 @@ unsigned long long get_keylength(unsigned long long inlen) {
         inlen, (unsigned long long)(SUPERKEYSIZE + NUM_KEYS) * KEYSIZE);
 }
 
+// Smallest key hash accepts, SUPERKEYSIZE is given in bytes. The length
+// encoding takes its keys from the end of the key, where they may overlap the
+// polynomial keys.
+static inline unsigned long long get_min_keylength(unsigned long long inlen) {
+    unsigned long long keylen =
+        (unsigned long long)SUPERKEYSIZE + NUM_KEYS * KEYSIZE;
+    return keylen < LE_MIN_KEY * KEYSIZE ? LE_MIN_KEY * KEYSIZE : keylen;
+}
+#define POLY_MIN_KEYLENGTH get_min_keylength
+
 void d2LHP(unsigned char *out, const unsigned char *in,
            unsigned long long inlen, const unsigned char *key,
            unsigned long long keylen);
 
+void d2LHP_many(unsigned char *out, const unsigned char *const *in,
+                const unsigned long long *inlen, unsigned long long count,
+                const unsigned char *key, unsigned long long keylen);
+#define POLY_EVAL_MANY d2LHP_many
+
+typedef struct d2LHP_state d2LHP_state_t;
+
+d2LHP_state_t *d2LHP_init(const unsigned char *key, unsigned long long keylen);
+
+void d2LHP_update(d2LHP_state_t *state, const unsigned char *in,
+                  unsigned long long inlen);
+
+void d2LHP_final(d2LHP_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T d2LHP_state_t
+#define POLY_STREAM_INIT d2LHP_init
+#define POLY_STREAM_UPDATE d2LHP_update
+#define POLY_STREAM_FINAL d2LHP_final
+
 #endif
@@ -0,0 +1,197 @@
+// MIT License
+//
+// Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+// Streaming evaluation for outer polynomials that combine the message with
+// Horner's rule, i.e. H(A || B) = H(A) * k^n + H(B) where n is the number of
+// blocks of B rounded up to a multiple of HORNER_STREAM_UNIT.
+//
+// The message is split into chunks of HORNER_STREAM_BLOCKS blocks which are
+// evaluated with HORNER_STREAM_CHUNK and combined with
+// acc = acc * k^HORNER_STREAM_BLOCKS + chunk. The last chunk is kept pending
+// until more data arrives since its last block is encoded differently.
+//
+// The including polynomial defines before including this file:
+//   HORNER_STREAM_POLY   the name of the polynomial, the functions are named
+//                        <poly>_init, <poly>_update and <poly>_final and the
+//                        state is struct <poly>_state
+//   HORNER_STREAM_CHUNK(out, in, inlen, state, last)
+//                        evaluates the chunk in[0..inlen) into
+//                        field_elem_t *out, state->key is the key and state->k
+//                        its (precomputed) power k^HORNER_STREAM_UNIT. Without
+//                        it the chunk is evaluated block by block.
+// and optionally:
+//   HORNER_STREAM_BLOCKS the chunk size in blocks (default 16), a multiple of
+//                        HORNER_STREAM_UNIT
+//   HORNER_STREAM_UNIT   the number of blocks the polynomial is shifted by at
+//                        once (default 1)
+//   HORNER_STREAM_INNER_STATE_T, HORNER_STREAM_INNER_STATE_INIT(inner, key)
+//                        the key setup of the chunk evaluator, kept in
+//                        state->inner
+//   HORNER_STREAM_LENGTH_ENCODE
+//                        1 if the tag is length encoded when
+//                        EXPLICIT_LENGTH_ENCODE is set
+
+#include "boost/preprocessor/cat.hpp"
+#include <stdlib.h>
+#include <string.h>
+#if EXPLICIT_LENGTH_ENCODE && HORNER_STREAM_LENGTH_ENCODE
+#include "../length_encoding.h"
+#endif
+
+#ifndef HORNER_STREAM_UNIT
+#define HORNER_STREAM_UNIT 1
+#endif
+#ifndef HORNER_STREAM_BLOCKS
+#define HORNER_STREAM_BLOCKS 16
+#endif
+#define HORNER_STREAM_CHUNKSIZE (HORNER_STREAM_BLOCKS * BLOCKSIZE)
+#define HORNER_STREAM_UNITSIZE (HORNER_STREAM_UNIT * BLOCKSIZE)
+#define HORNER_STREAM_FN(suffix) BOOST_PP_CAT(HORNER_STREAM_POLY, suffix)
+#define HORNER_STREAM_STATE struct HORNER_STREAM_FN(_state)
+
+HORNER_STREAM_STATE {
+    field_elem_t acc;
+    DECLARE_PC_ELEM(k);  // key^HORNER_STREAM_UNIT
+    DECLARE_PC_ELEM(kc); // key^HORNER_STREAM_BLOCKS
+#ifdef HORNER_STREAM_INNER_STATE_T
+    HORNER_STREAM_INNER_STATE_T inner;
+#endif
+    const unsigned char *key;
+    unsigned long long keylen;
+    unsigned long long msglen;
+    unsigned long long pendinglen;
+    unsigned char pending[HORNER_STREAM_CHUNKSIZE];
+};
+
+#ifndef HORNER_STREAM_CHUNK
+// Horner's rule block by block
+static inline void HORNER_STREAM_FN(_chunk)(field_elem_t *out,
+                                            const unsigned char *in,
+                                            unsigned long long inlen,
+                                            HORNER_STREAM_STATE *state,
+                                            int last) {
+    field_elem_t a;
+    memset(out, 0, sizeof(field_elem_t));
+    while (inlen > BLOCKSIZE) {
+        unpack_and_encode_field_elem(&a, (baseint_t *)in);
+        field_add_reduce(out, out, &a);
+        FIELD_MUL_PC_REDUCE(out, out, &state->k)
+        inlen -= BLOCKSIZE;
+        in += BLOCKSIZE;
+    }
+    if (inlen) {
+        if (last) {
+            unpack_and_encode_last_field_elem(&a, (baseint_t *)in, inlen);
+        } else {
+            unpack_and_encode_field_elem(&a, (baseint_t *)in);
+        }
+        field_add_reduce(out, out, &a);
+    }
+}
+#define HORNER_STREAM_CHUNK HORNER_STREAM_FN(_chunk)
+#endif
+
+HORNER_STREAM_STATE *HORNER_STREAM_FN(_init)(const unsigned char *key,
+                                             unsigned long long keylen) {
+    HORNER_STREAM_STATE *state = calloc(1, sizeof(HORNER_STREAM_STATE));
+    if (!state)
+        return NULL;
+    state->key = key;
+    state->keylen = keylen;
+#ifdef HORNER_STREAM_INNER_STATE_T
+    HORNER_STREAM_INNER_STATE_INIT(&state->inner, key);
+#endif
+    DECLARE_PC_ELEM(k1);
+    UNPACK_AND_ENCODE_PC_KEY(k1, key);
+    INIT_PC_KEY(&k1, &NOT_PRECOMPUTED(k1));
+    NOT_PRECOMPUTED(state->k) = NOT_PRECOMPUTED(k1);
+    for (int i = 1; i < HORNER_STREAM_UNIT; ++i) {
+        FIELD_MUL_PC_REDUCE(&NOT_PRECOMPUTED(state->k),
+                            &NOT_PRECOMPUTED(state->k), &k1)
+    }
+    INIT_PC_KEY(&state->k, &NOT_PRECOMPUTED(state->k));
+    NOT_PRECOMPUTED(state->kc) = NOT_PRECOMPUTED(state->k);
+    for (int i = HORNER_STREAM_UNIT; i < HORNER_STREAM_BLOCKS;
+         i += HORNER_STREAM_UNIT) {
+        FIELD_MUL_PC_REDUCE(&NOT_PRECOMPUTED(state->kc),
+                            &NOT_PRECOMPUTED(state->kc), &state->k)
+    }
+    INIT_PC_KEY(&state->kc, &NOT_PRECOMPUTED(state->kc));
+    return state;
+}
+
+static inline void HORNER_STREAM_FN(_absorb)(HORNER_STREAM_STATE *state,
+                                             const unsigned char *in) {
+    field_elem_t a = {0};
+    HORNER_STREAM_CHUNK(&a, in, HORNER_STREAM_CHUNKSIZE, state, 0);
+    FIELD_MUL_PC_REDUCE(&state->acc, &state->acc, &state->kc)
+    field_add_reduce(&state->acc, &state->acc, &a);
+}
+
+void HORNER_STREAM_FN(_update)(HORNER_STREAM_STATE *state,
+                               const unsigned char *in,
+                               unsigned long long inlen) {
+    state->msglen += inlen;
+    if (state->pendinglen) {
+        unsigned long long n = HORNER_STREAM_CHUNKSIZE - state->pendinglen;
+        if (n > inlen)
+            n = inlen;
+        memcpy(state->pending + state->pendinglen, in, n);
+        state->pendinglen += n;
+        in += n;
+        inlen -= n;
+        if (inlen == 0)
+            return;
+        HORNER_STREAM_FN(_absorb)(state, state->pending);
+        state->pendinglen = 0;
+    }
+    while (inlen > HORNER_STREAM_CHUNKSIZE) {
+        HORNER_STREAM_FN(_absorb)(state, in);
+        in += HORNER_STREAM_CHUNKSIZE;
+        inlen -= HORNER_STREAM_CHUNKSIZE;
+    }
+    memcpy(state->pending, in, inlen);
+    state->pendinglen = inlen;
+}
+
+void HORNER_STREAM_FN(_final)(HORNER_STREAM_STATE *state, unsigned char *out) {
+    field_elem_t a = {0};
+    unsigned char tag_packed[BUFFSIZE] = {0};
+    // the pending chunk may be shorter, it is shifted in unit by unit
+    for (unsigned long long i = 0; i < state->pendinglen;
+         i += HORNER_STREAM_UNITSIZE) {
+        FIELD_MUL_PC_REDUCE(&state->acc, &state->acc, &state->k)
+    }
+    if (state->pendinglen) {
+        HORNER_STREAM_CHUNK(&a, state->pending, state->pendinglen, state, 1);
+        field_add_reduce(&state->acc, &state->acc, &a);
+    }
+    reduce(&state->acc, &state->acc);
+#if EXPLICIT_LENGTH_ENCODE && HORNER_STREAM_LENGTH_ENCODE
+    LENGTH_ENCODING(&state->acc, &state->acc, state->key, state->keylen,
+                    state->msglen);
+    reduce(&state->acc, &state->acc);
+#endif
+    pack_field_elem((baseint_t *)tag_packed, &state->acc);
+    transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+    free(state);
+}
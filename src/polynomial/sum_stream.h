@@ -0,0 +1,128 @@
+// MIT License
+//
+// Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+// Streaming evaluation for outer polynomials that add up independently keyed
+// blocks of the message, i.e. H(A || B) = H(A) + H'(B) where H' uses the keys
+// following the ones used for A.
+//
+// The message is split into chunks of SUM_STREAM_BLOCKS blocks which are
+// evaluated with SUM_STREAM_CHUNK and added up. The last chunk is kept pending
+// until more data arrives since its last block is encoded differently.
+//
+// The including polynomial defines before including this file:
+//   SUM_STREAM_POLY   the name of the polynomial, the functions are named
+//                     <poly>_init, <poly>_update and <poly>_final and the
+//                     state is struct <poly>_state
+//   SUM_STREAM_CHUNK(out, in, inlen, key, last)
+//                     evaluates the chunk in[0..inlen) with the keys starting
+//                     at key into field_elem_t *out. With last = 0 the chunk
+//                     is SUM_STREAM_BLOCKS full blocks which are all keyed.
+// and optionally:
+//   SUM_STREAM_BLOCKS the chunk size in blocks (default 16)
+
+#include "boost/preprocessor/cat.hpp"
+#include <stdlib.h>
+#include <string.h>
+#if EXPLICIT_LENGTH_ENCODE
+#include "../length_encoding.h"
+#endif
+
+#ifndef SUM_STREAM_BLOCKS
+#define SUM_STREAM_BLOCKS 16
+#endif
+#define SUM_STREAM_CHUNKSIZE (SUM_STREAM_BLOCKS * BLOCKSIZE)
+#define SUM_STREAM_FN(suffix) BOOST_PP_CAT(SUM_STREAM_POLY, suffix)
+#define SUM_STREAM_STATE struct SUM_STREAM_FN(_state)
+
+SUM_STREAM_STATE {
+    field_elem_t acc;
+    const unsigned char *key;
+    unsigned long long keylen;
+    unsigned long long msglen;
+    unsigned long long chunks; // number of chunks added to acc
+    unsigned long long pendinglen;
+    unsigned char pending[SUM_STREAM_CHUNKSIZE];
+};
+
+SUM_STREAM_STATE *SUM_STREAM_FN(_init)(const unsigned char *key,
+                                       unsigned long long keylen) {
+    SUM_STREAM_STATE *state = calloc(1, sizeof(SUM_STREAM_STATE));
+    if (!state)
+        return NULL;
+    state->key = key;
+    state->keylen = keylen;
+    return state;
+}
+
+static inline void SUM_STREAM_FN(_add_chunk)(SUM_STREAM_STATE *state,
+                                             const unsigned char *in,
+                                             unsigned long long inlen,
+                                             int last) {
+    field_elem_t a = {0};
+    SUM_STREAM_CHUNK(&a, in, inlen,
+                     state->key + state->chunks * SUM_STREAM_BLOCKS * KEYSIZE,
+                     last);
+    field_add(&state->acc, &state->acc, &a);
+    _carry_round(&state->acc, &state->acc);
+    state->chunks++;
+}
+
+void SUM_STREAM_FN(_update)(SUM_STREAM_STATE *state, const unsigned char *in,
+                            unsigned long long inlen) {
+    state->msglen += inlen;
+    if (state->pendinglen) {
+        unsigned long long n = SUM_STREAM_CHUNKSIZE - state->pendinglen;
+        if (n > inlen)
+            n = inlen;
+        memcpy(state->pending + state->pendinglen, in, n);
+        state->pendinglen += n;
+        in += n;
+        inlen -= n;
+        if (inlen == 0)
+            return;
+        SUM_STREAM_FN(_add_chunk)(state, state->pending, SUM_STREAM_CHUNKSIZE,
+                                  0);
+        state->pendinglen = 0;
+    }
+    while (inlen > SUM_STREAM_CHUNKSIZE) {
+        SUM_STREAM_FN(_add_chunk)(state, in, SUM_STREAM_CHUNKSIZE, 0);
+        in += SUM_STREAM_CHUNKSIZE;
+        inlen -= SUM_STREAM_CHUNKSIZE;
+    }
+    memcpy(state->pending, in, inlen);
+    state->pendinglen = inlen;
+}
+
+void SUM_STREAM_FN(_final)(SUM_STREAM_STATE *state, unsigned char *out) {
+    unsigned char tag_packed[BUFFSIZE] = {0};
+    if (state->pendinglen) {
+        SUM_STREAM_FN(_add_chunk)(state, state->pending, state->pendinglen, 1);
+    }
+#if EXPLICIT_LENGTH_ENCODE
+    LENGTH_ENCODING(&state->acc, &state->acc, state->key, state->keylen,
+                    state->msglen);
+#endif
+    reduce(&state->acc, &state->acc);
+    pack_field_elem((baseint_t *)tag_packed, &state->acc);
+    transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+    free(state);
+}
@@ -21,7 +21,7 @@
 // SOFTWARE.
 // #define NO_INNER_CACHE 1
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
@@ -29,6 +29,7 @@
 #include "boost/preprocessor/repetition/repeat.hpp"
 #include "boost/preprocessor/repetition/repeat_from_to.hpp"
 #include <stddef.h>
+#include <stdlib.h>
 #include <string.h>
 
 #if EXPLICIT_LENGTH_ENCODE
@@ -40,6 +41,7 @@
 #else
 #error INNERPOLY Required
 #endif
+#include "tree_threads.h"
 
 // Param 0 defines whether the results of the inner polynomial will be reduced
 #if OUTER_PARAM0
@@ -67,8 +69,10 @@ static inline int floor_log2(unsigned long long x) {
     return 63 - __builtin_clzll(x);
 }
 
-void tBRW(unsigned char *out, const unsigned char *in, unsigned long long inlen,
-          const unsigned char *key, unsigned long long keylen) {
+// hashes one message, the inner keys are unpacked by the caller
+static void tBRW_eval(unsigned char *out, const unsigned char *in,
+                      unsigned long long inlen, const unsigned char *key,
+                      unsigned long long keylen, TREE_INNER_KEY_T inner_key) {
 #if EXPLICIT_LENGTH_ENCODE
     const unsigned long long msglen = inlen;
 #endif
@@ -86,15 +90,7 @@ void tBRW(unsigned char *out, const unsigned char *in, unsigned long long inlen,
         return;
     }
 
-#if defined(NO_INNER_CACHE)
-#define INNER_KEY key
-#else
-    // unpack inner keys
-    INNER_STATE_T inner_state = INNER_STATE_ZERO;
-    INNER_STATE_INIT(&inner_state, key);
-#define INNER_KEY &inner_state
-
-#endif
+#define INNER_KEY inner_key
     if (inlen <= SUPERBLOCKSIZE) {
         field_elem_t acc = {0};
         INNERPOLY(&acc, in, inlen, INNER_KEY, 1);
@@ -135,11 +131,14 @@ void tBRW(unsigned char *out, const unsigned char *in, unsigned long long inlen,
             exit(-1);
         field_elem_t t = {0};
         field_elem_t k = {0};
+        tree_lookahead_t la;
+        tree_lookahead_init(&la, in, inlen, SUPERBLOCKSIZE + BLOCKSIZE,
+                            INNER_KEY);
 
         int i = 0;
         for (i = 0; i < n - 1; i++) {
-            INNERPOLY(acc, in, SUPERBLOCKSIZE, INNER_KEY,
-                      (inlen == SUPERBLOCKSIZE));
+            TREE_INNERPOLY(&la, acc, in, SUPERBLOCKSIZE, INNER_KEY,
+                           (inlen == SUPERBLOCKSIZE));
 #ifdef CARRY_INNER
             _carry_round(acc, acc);
 #endif
@@ -165,8 +164,8 @@ void tBRW(unsigned char *out, const unsigned char *in, unsigned long long inlen,
         }
         if (inlen > 0) {
             if (inlen > SUPERBLOCKSIZE + BLOCKSIZE) {
-                INNERPOLY(acc, in, SUPERBLOCKSIZE, INNER_KEY,
-                          (inlen == SUPERBLOCKSIZE));
+                TREE_INNERPOLY(&la, acc, in, SUPERBLOCKSIZE, INNER_KEY,
+                               (inlen == SUPERBLOCKSIZE));
 #ifdef CARRY_INNER
                 _carry_round(acc, acc);
 #endif
@@ -193,7 +192,7 @@ void tBRW(unsigned char *out, const unsigned char *in, unsigned long long inlen,
                 i++;
             }
             if (inlen > SUPERBLOCKSIZE) {
-                INNERPOLY(acc, in, SUPERBLOCKSIZE, INNER_KEY, 0);
+                TREE_INNERPOLY(&la, acc, in, SUPERBLOCKSIZE, INNER_KEY, 0);
 #ifdef CARRY_INNER
                 _carry_round(acc, acc);
 #endif
@@ -244,7 +243,168 @@ void tBRW(unsigned char *out, const unsigned char *in, unsigned long long inlen,
         reduce(acc, acc);
         pack_field_elem((baseint_t *)tag_packed, acc);
         free(acc);
+        tree_lookahead_free(&la);
     }
 
     transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
 }
+
+// hashes count messages with the same key, the inner keys are unpacked only
+// once
+void tBRW_many(unsigned char *out, const unsigned char *const *in,
+               const unsigned long long *inlen, unsigned long long count,
+               const unsigned char *key, unsigned long long keylen) {
+#if defined(NO_INNER_CACHE)
+    for (unsigned long long i = 0; i < count; ++i) {
+        tBRW_eval(out + i * OUTPUTSIZE, in[i], inlen[i], key, keylen, key);
+    }
+#else
+    INNER_STATE_T inner_state = INNER_STATE_ZERO;
+    INNER_STATE_INIT(&inner_state, key);
+    for (unsigned long long i = 0; i < count; ++i) {
+        tBRW_eval(out + i * OUTPUTSIZE, in[i], inlen[i], key, keylen,
+                  &inner_state);
+    }
+#endif
+}
+
+void tBRW(unsigned char *out, const unsigned char *in, unsigned long long inlen,
+          const unsigned char *key, unsigned long long keylen) {
+    tBRW_many(out, &in, &inlen, 1, key, keylen);
+}
+
+// Streaming evaluation: units of a superblock and one extra block are
+// combined exactly as in tBRW, the accumulators of the tree are kept for
+// every level. A full unit is kept pending until more data arrives since the
+// last unit is encoded differently.
+typedef struct tBRW_state tBRW_state_t;
+
+#if defined(NO_INNER_CACHE)
+#define STREAM_INNER_KEY(state) ((state)->key)
+#else
+#define STREAM_INNER_KEY(state) (&(state)->inner_state)
+#endif
+
+struct tBRW_state {
+#if !defined(NO_INNER_CACHE)
+    INNER_STATE_T inner_state;
+#endif
+    // acc[0] holds the current superblock, acc[s + 1] the level s subtree
+    field_elem_t acc[sizeof(unsigned long long) * 8 + 1];
+    unsigned long long n; // number of units combined into acc
+    const unsigned char *key;
+    unsigned long long keylen;
+    unsigned long long msglen;
+    unsigned long long pendinglen;
+    unsigned char pending[SUPERBLOCKSIZE + BLOCKSIZE];
+};
+
+tBRW_state_t *tBRW_init(const unsigned char *key, unsigned long long keylen) {
+    tBRW_state_t *state = calloc(1, sizeof(tBRW_state_t));
+    if (!state)
+        return NULL;
+#if !defined(NO_INNER_CACHE)
+    INNER_STATE_INIT(&state->inner_state, key);
+#endif
+    state->key = key;
+    state->keylen = keylen;
+    return state;
+}
+
+// the extra block of the last unit is lastlen bytes long and encoded as the
+// last block of the message
+static inline void tBRW_absorb(tBRW_state_t *state, const unsigned char *in,
+                               unsigned long long lastlen, int last) {
+    field_elem_t *acc = state->acc;
+    field_elem_t t = {0};
+    field_elem_t k = {0};
+    INNERPOLY(acc, in, SUPERBLOCKSIZE, STREAM_INNER_KEY(state), 0);
+#ifdef CARRY_INNER
+    _carry_round(acc, acc);
+#endif
+    in += SUPERBLOCKSIZE;
+    if (last) {
+        unpack_and_encode_last_field_elem(&t, (baseint_t *)in, lastlen);
+    } else {
+        unpack_and_encode_field_elem(&t, (baseint_t *)in);
+    }
+    int s = highest2Power(state->n + 1);
+    unpack_and_encode_key(
+        &k, (baseint_t *)(state->key + SUPERKEYSIZE + ((s * KEYSIZE))));
+    field_add(&t, &t, &k);
+
+    acc[s + 1] = acc[0];
+    for (int j = 1; j < s + 1; j++) {
+        field_add(acc + s + 1, acc + s + 1, acc + j);
+    }
+    _carry_round(acc + s + 1, acc + s + 1);
+    field_mul(acc + s + 1, acc + s + 1, &t);
+    state->n++;
+}
+
+void tBRW_update(tBRW_state_t *state, const unsigned char *in,
+                 unsigned long long inlen) {
+    const unsigned long long unitsize = SUPERBLOCKSIZE + BLOCKSIZE;
+    state->msglen += inlen;
+    if (state->pendinglen) {
+        unsigned long long n = unitsize - state->pendinglen;
+        if (n > inlen)
+            n = inlen;
+        memcpy(state->pending + state->pendinglen, in, n);
+        state->pendinglen += n;
+        in += n;
+        inlen -= n;
+        if (inlen == 0)
+            return;
+        tBRW_absorb(state, state->pending, 0, 0);
+        state->pendinglen = 0;
+    }
+    while (inlen > unitsize) {
+        tBRW_absorb(state, in, 0, 0);
+        in += unitsize;
+        inlen -= unitsize;
+    }
+    memcpy(state->pending, in, inlen);
+    state->pendinglen = inlen;
+}
+
+void tBRW_final(tBRW_state_t *state, unsigned char *out) {
+    field_elem_t *acc = state->acc;
+    unsigned char tag_packed[BUFFSIZE] = {0};
+    if (state->msglen == 0) {
+#if EXPLICIT_LENGTH_ENCODE
+        LENGTH_ENCODING(acc, acc, state->key, state->keylen, state->msglen);
+        reduce(acc, acc);
+        pack_field_elem((baseint_t *)tag_packed, acc);
+        transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+#else
+        memset(out, 0, OUTPUTSIZE);
+#endif
+        free(state);
+        return;
+    }
+    if (state->pendinglen > SUPERBLOCKSIZE) {
+        tBRW_absorb(state, state->pending, state->pendinglen - SUPERBLOCKSIZE,
+                    1);
+        memset(acc, 0, sizeof(field_elem_t));
+    } else {
+        INNERPOLY(acc, state->pending, state->pendinglen,
+                  STREAM_INNER_KEY(state), 1);
+#ifdef CARRY_INNER
+        _carry_round(acc, acc);
+#endif
+    }
+    for (uint64_t i = 1, b = state->n; b > 0; b >>= 1, i++) {
+        if (b & 1ULL) {
+            field_add(acc, acc, acc + i);
+        }
+    }
+    _carry_round(acc, acc);
+#if EXPLICIT_LENGTH_ENCODE
+    LENGTH_ENCODING(acc, acc, state->key, state->keylen, state->msglen);
+#endif
+    reduce(acc, acc);
+    pack_field_elem((baseint_t *)tag_packed, acc);
+    transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+    free(state);
+}
@@ -47,4 +47,25 @@ unsigned long long get_keylength(unsigned long long inlen) {
 void tBRW(unsigned char *out, const unsigned char *in, unsigned long long inlen,
           const unsigned char *key, unsigned long long keylen);
 
+void tBRW_many(unsigned char *out, const unsigned char *const *in,
+               const unsigned long long *inlen, unsigned long long count,
+               const unsigned char *key, unsigned long long keylen);
+#define POLY_EVAL_MANY tBRW_many
+
+void tree_set_threads(unsigned int threads);
+#define POLY_SET_THREADS tree_set_threads
+
+typedef struct tBRW_state tBRW_state_t;
+
+tBRW_state_t *tBRW_init(const unsigned char *key, unsigned long long keylen);
+
+void tBRW_update(tBRW_state_t *state, const unsigned char *in,
+                 unsigned long long inlen);
+
+void tBRW_final(tBRW_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T tBRW_state_t
+#define POLY_STREAM_INIT tBRW_init
+#define POLY_STREAM_UPDATE tBRW_update
+#define POLY_STREAM_FINAL tBRW_final
+
 #endif
@@ -100,4 +100,25 @@ unsigned long long get_keylength(unsigned long long inlen) {
 void tHKM(unsigned char *out, const unsigned char *in, unsigned long long inlen,
           const unsigned char *key, unsigned long long keylen);
 
+void tHKM_many(unsigned char *out, const unsigned char *const *in,
+               const unsigned long long *inlen, unsigned long long count,
+               const unsigned char *key, unsigned long long keylen);
+#define POLY_EVAL_MANY tHKM_many
+
+void tree_set_threads(unsigned int threads);
+#define POLY_SET_THREADS tree_set_threads
+
+typedef struct tHKM_state tHKM_state_t;
+
+tHKM_state_t *tHKM_init(const unsigned char *key, unsigned long long keylen);
+
+void tHKM_update(tHKM_state_t *state, const unsigned char *in,
+                 unsigned long long inlen);
+
+void tHKM_final(tHKM_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T tHKM_state_t
+#define POLY_STREAM_INIT tHKM_init
+#define POLY_STREAM_UPDATE tHKM_update
+#define POLY_STREAM_FINAL tHKM_final
+
 #endif
@@ -20,7 +20,7 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include <stddef.h>
 #include <string.h>
@@ -91,3 +91,13 @@ void tHorner(unsigned char *out, const unsigned char *in,
     pack_field_elem((baseint_t *)tag_packed, &acc);
     transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
 }
+
+// streaming evaluation, superblocks are evaluated with the inner polynomial
+// and combined with the same power of the key as above
+#define HORNER_STREAM_POLY tHorner
+#define HORNER_STREAM_UNIT (SUPERBLOCKSIZE / BLOCKSIZE)
+#define HORNER_STREAM_BLOCKS (SUPERBLOCKSIZE / BLOCKSIZE)
+#define HORNER_STREAM_CHUNK(out, in, inlen, state, last)                       \
+    INNERPOLY(out, in, inlen, (state)->key, last)
+#define HORNER_STREAM_LENGTH_ENCODE 1
+#include "horner_stream.h"
@@ -36,4 +36,18 @@ void tHorner(unsigned char *out, const unsigned char *in,
              unsigned long long inlen, const unsigned char *key,
              unsigned long long keylen);
 
+typedef struct tHorner_state tHorner_state_t;
+
+tHorner_state_t *tHorner_init(const unsigned char *key,
+                              unsigned long long keylen);
+
+void tHorner_update(tHorner_state_t *state, const unsigned char *in,
+                    unsigned long long inlen);
+
+void tHorner_final(tHorner_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T tHorner_state_t
+#define POLY_STREAM_INIT tHorner_init
+#define POLY_STREAM_UPDATE tHorner_update
+#define POLY_STREAM_FINAL tHorner_final
+
 #endif
@@ -47,4 +47,25 @@ unsigned long long get_keylength(unsigned long long inlen) {
 void tMMH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
           const unsigned char *key, unsigned long long keylen);
 
+void tMMH_many(unsigned char *out, const unsigned char *const *in,
+               const unsigned long long *inlen, unsigned long long count,
+               const unsigned char *key, unsigned long long keylen);
+#define POLY_EVAL_MANY tMMH_many
+
+void tree_set_threads(unsigned int threads);
+#define POLY_SET_THREADS tree_set_threads
+
+typedef struct tMMH_state tMMH_state_t;
+
+tMMH_state_t *tMMH_init(const unsigned char *key, unsigned long long keylen);
+
+void tMMH_update(tMMH_state_t *state, const unsigned char *in,
+                 unsigned long long inlen);
+
+void tMMH_final(tMMH_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T tMMH_state_t
+#define POLY_STREAM_INIT tMMH_init
+#define POLY_STREAM_UPDATE tMMH_update
+#define POLY_STREAM_FINAL tMMH_final
+
 #endif
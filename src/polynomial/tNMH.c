@@ -20,7 +20,7 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
@@ -28,11 +28,13 @@
 #include "boost/preprocessor/repetition/repeat.hpp"
 #include "boost/preprocessor/repetition/repeat_from_to.hpp"
 #include <stddef.h>
+#include <stdlib.h>
 #include <string.h>
 
 #if defined(INNERPOLY_H) && defined(INNERPOLY)
 #include INNERPOLY_H
 #endif
+#include "tree_threads.h"
 
 #if EXPLICIT_LENGTH_ENCODE
 #include "../length_encoding.h"
@@ -114,8 +116,10 @@ static inline int floor_log3(uint64_t x) {
     return log + (x >= powers3[log + 1]);
 }
 
-void tNMH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
-          const unsigned char *key, unsigned long long keylen) {
+// hashes one message, the inner keys are unpacked by the caller
+static void tNMH_eval(unsigned char *out, const unsigned char *in,
+                      unsigned long long inlen, const unsigned char *key,
+                      unsigned long long keylen, TREE_INNER_KEY_T inner_key) {
 #if EXPLICIT_LENGTH_ENCODE
     const unsigned long long msglen = inlen;
 #endif
@@ -133,10 +137,7 @@ void tNMH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
         return;
     }
 
-    // unpack inner keys
-    INNER_STATE_T inner_state = INNER_STATE_ZERO;
-    INNER_STATE_INIT(&inner_state, key);
-#define INNER_KEY &inner_state
+#define INNER_KEY inner_key
     if (inlen <= SUPERBLOCKSIZE) {
         field_elem_t acc = {0};
         INNERPOLY(&acc, in, inlen, INNER_KEY, 1);
@@ -156,10 +157,12 @@ void tNMH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
             exit(-1);
         int stack_idx = 0;
         field_elem_t k[2] = {0};
+        tree_lookahead_t la;
+        tree_lookahead_init(&la, in, inlen, SUPERBLOCKSIZE, INNER_KEY);
         int i = 0;
         for (i = 0; i < n; i++) {
-            INNERPOLY(&acc[stack_idx], in, SUPERBLOCKSIZE, INNER_KEY,
-                      inlen == SUPERBLOCKSIZE);
+            TREE_INNERPOLY(&la, &acc[stack_idx], in, SUPERBLOCKSIZE, INNER_KEY,
+                           inlen == SUPERBLOCKSIZE);
             in += SUPERBLOCKSIZE;
             inlen -= SUPERBLOCKSIZE;
             stack_idx++;
@@ -276,7 +279,167 @@ void tNMH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
         reduce(&acc[stack_idx - 1], &acc[stack_idx - 1]);
         pack_field_elem((baseint_t *)tag_packed, &acc[stack_idx - 1]);
         free(acc);
+        tree_lookahead_free(&la);
     }
 
     transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
 }
+
+// hashes count messages with the same key, the inner keys are unpacked only
+// once
+void tNMH_many(unsigned char *out, const unsigned char *const *in,
+               const unsigned long long *inlen, unsigned long long count,
+               const unsigned char *key, unsigned long long keylen) {
+#if defined(NO_INNER_CACHE)
+    for (unsigned long long i = 0; i < count; ++i) {
+        tNMH_eval(out + i * OUTPUTSIZE, in[i], inlen[i], key, keylen, key);
+    }
+#else
+    INNER_STATE_T inner_state = INNER_STATE_ZERO;
+    INNER_STATE_INIT(&inner_state, key);
+    for (unsigned long long i = 0; i < count; ++i) {
+        tNMH_eval(out + i * OUTPUTSIZE, in[i], inlen[i], key, keylen,
+                  &inner_state);
+    }
+#endif
+}
+
+void tNMH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
+          const unsigned char *key, unsigned long long keylen) {
+    tNMH_many(out, &in, &inlen, 1, key, keylen);
+}
+
+// Streaming evaluation: superblocks are pushed onto the stack one at a time
+// and combined exactly as in tNMH whenever three subtrees of a level are
+// complete. A full superblock is kept pending until more data arrives since
+// the last superblock is encoded differently.
+typedef struct tNMH_state tNMH_state_t;
+
+struct tNMH_state {
+    INNER_STATE_T inner_state;
+    // at most two subtrees per level are waiting on the stack
+    field_elem_t acc[2 * 41 + 3];
+    int stack_idx;
+    unsigned long long i; // number of superblocks pushed
+    const unsigned char *key;
+    unsigned long long keylen;
+    unsigned long long msglen;
+    unsigned long long pendinglen;
+    unsigned char pending[SUPERBLOCKSIZE];
+};
+
+tNMH_state_t *tNMH_init(const unsigned char *key, unsigned long long keylen) {
+    tNMH_state_t *state = calloc(1, sizeof(tNMH_state_t));
+    if (!state)
+        return NULL;
+    INNER_STATE_INIT(&state->inner_state, key);
+    state->key = key;
+    state->keylen = keylen;
+    return state;
+}
+
+// combines the top two or three subtrees of the stack with the keys of level
+static inline void tNMH_combine(tNMH_state_t *state, int level, int count) {
+    field_elem_t k[2] = {0};
+    field_elem_t tmp = {0};
+    unpack_and_encode_key(
+        &k[0], (baseint_t *)(state->key + SUPERKEYSIZE + 2 * level * KEYSIZE));
+    unpack_and_encode_key(&k[1], (baseint_t *)(state->key + SUPERKEYSIZE +
+                                               (2 * level + 1) * KEYSIZE));
+    state->stack_idx -= count;
+    field_elem_t *acc = state->acc + state->stack_idx;
+    field_add(acc, acc, &k[0]);
+    field_add(&tmp, acc + 1, &k[1]);
+#ifdef CARRY_ADD
+    _carry_round(&tmp, &tmp);
+    _carry_round(acc, acc);
+#endif
+    field_mul(acc, acc, &tmp);
+    if (count == 3) {
+        field_add(acc, acc, acc + 2);
+        acc[2] = (field_elem_t){0};
+    }
+    acc[1] = (field_elem_t){0};
+    state->stack_idx++;
+}
+
+static inline void tNMH_push(tNMH_state_t *state, const unsigned char *in,
+                             unsigned long long inlen, int last) {
+    INNERPOLY(&state->acc[state->stack_idx], in, inlen, &state->inner_state,
+              last);
+    state->stack_idx++;
+    if (state->i % 3 == 2) {
+        int s = highest3Power(state->i + 1, NULL);
+        for (int j = 0; j < s; j++) {
+            tNMH_combine(state, j, 3);
+        }
+    }
+    state->i++;
+}
+
+void tNMH_update(tNMH_state_t *state, const unsigned char *in,
+                 unsigned long long inlen) {
+    state->msglen += inlen;
+    if (state->pendinglen) {
+        unsigned long long n = SUPERBLOCKSIZE - state->pendinglen;
+        if (n > inlen)
+            n = inlen;
+        memcpy(state->pending + state->pendinglen, in, n);
+        state->pendinglen += n;
+        in += n;
+        inlen -= n;
+        if (inlen == 0)
+            return;
+        tNMH_push(state, state->pending, SUPERBLOCKSIZE, 0);
+        state->pendinglen = 0;
+    }
+    while (inlen > SUPERBLOCKSIZE) {
+        tNMH_push(state, in, SUPERBLOCKSIZE, 0);
+        in += SUPERBLOCKSIZE;
+        inlen -= SUPERBLOCKSIZE;
+    }
+    memcpy(state->pending, in, inlen);
+    state->pendinglen = inlen;
+}
+
+void tNMH_final(tNMH_state_t *state, unsigned char *out) {
+    field_elem_t *acc = state->acc;
+    unsigned char tag_packed[BUFFSIZE] = {0};
+    if (state->msglen == 0) {
+#if EXPLICIT_LENGTH_ENCODE
+        LENGTH_ENCODING(acc, acc, state->key, state->keylen, state->msglen);
+        reduce(acc, acc);
+        pack_field_elem((baseint_t *)tag_packed, acc);
+        transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+#else
+        memset(out, 0, OUTPUTSIZE);
+#endif
+        free(state);
+        return;
+    }
+    tNMH_push(state, state->pending, state->pendinglen, 1);
+    unsigned long long ii = state->i - 1;
+    int level = 0;
+    while (ii % 3 == 2) {
+        ii /= 3;
+        level++;
+    }
+    while (ii > 0) {
+        if (ii % 3 == 1) {
+            tNMH_combine(state, level, 2);
+        } else if (ii % 3 == 2) {
+            tNMH_combine(state, level, 3);
+        }
+        ii /= 3;
+        level++;
+    }
+    acc += state->stack_idx - 1;
+    _carry_round(acc, acc);
+#if EXPLICIT_LENGTH_ENCODE
+    LENGTH_ENCODING(acc, acc, state->key, state->keylen, state->msglen);
+#endif
+    reduce(acc, acc);
+    pack_field_elem((baseint_t *)tag_packed, acc);
+    transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+    free(state);
+}
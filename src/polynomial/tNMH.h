@@ -100,4 +100,25 @@ unsigned long long get_keylength(unsigned long long inlen) {
 void tNMH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
           const unsigned char *key, unsigned long long keylen);
 
+void tNMH_many(unsigned char *out, const unsigned char *const *in,
+               const unsigned long long *inlen, unsigned long long count,
+               const unsigned char *key, unsigned long long keylen);
+#define POLY_EVAL_MANY tNMH_many
+
+void tree_set_threads(unsigned int threads);
+#define POLY_SET_THREADS tree_set_threads
+
+typedef struct tNMH_state tNMH_state_t;
+
+tNMH_state_t *tNMH_init(const unsigned char *key, unsigned long long keylen);
+
+void tNMH_update(tNMH_state_t *state, const unsigned char *in,
+                 unsigned long long inlen);
+
+void tNMH_final(tNMH_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T tNMH_state_t
+#define POLY_STREAM_INIT tNMH_init
+#define POLY_STREAM_UPDATE tNMH_update
+#define POLY_STREAM_FINAL tNMH_final
+
 #endif
@@ -20,7 +20,7 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
@@ -28,6 +28,7 @@
 #include "boost/preprocessor/repetition/repeat.hpp"
 #include "boost/preprocessor/repetition/repeat_from_to.hpp"
 #include <stddef.h>
+#include <stdlib.h>
 #include <string.h>
 #if EXPLICIT_LENGTH_ENCODE
 #include "../length_encoding.h"
@@ -38,6 +39,7 @@
 #else
 #error INNERPOLY Required
 #endif
+#include "tree_threads.h"
 
 // PARAM0 defines whether carry befor multiplication
 #if OUTER_PARAM0
@@ -61,8 +63,10 @@ static inline int floor_log2(unsigned long long x) {
     return (sizeof(unsigned long long) * 8 - 1) - __builtin_clzll(x);
 }
 
-void tSQH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
-          const unsigned char *key, unsigned long long keylen) {
+// hashes one message, the inner keys are unpacked by the caller
+static void tSQH_eval(unsigned char *out, const unsigned char *in,
+                      unsigned long long inlen, const unsigned char *key,
+                      unsigned long long keylen, TREE_INNER_KEY_T inner_key) {
 #if EXPLICIT_LENGTH_ENCODE
     const unsigned long long msglen = inlen;
 #endif
@@ -79,10 +83,7 @@ void tSQH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
 #endif
         return;
     }
-    // unpack inner keys
-    INNER_STATE_T inner_state = INNER_STATE_ZERO;
-    INNER_STATE_INIT(&inner_state, key);
-#define INNER_KEY &inner_state
+#define INNER_KEY inner_key
     if (inlen < SUPERBLOCKSIZE) {
         field_elem_t acc = {0};
         INNERPOLY(&acc, in, inlen, INNER_KEY, 1);
@@ -100,9 +101,11 @@ void tSQH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
             exit(-1);
 
         field_elem_t k = {0};
+        tree_lookahead_t la;
+        tree_lookahead_init(&la, in, inlen, SUPERBLOCKSIZE, INNER_KEY);
 
-        INNERPOLY(acc, in, SUPERBLOCKSIZE, INNER_KEY,
-                  (inlen == SUPERBLOCKSIZE));
+        TREE_INNERPOLY(&la, acc, in, SUPERBLOCKSIZE, INNER_KEY,
+                       (inlen == SUPERBLOCKSIZE));
         in += SUPERBLOCKSIZE;
         inlen -= SUPERBLOCKSIZE;
         s = 0;
@@ -116,8 +119,8 @@ void tSQH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
             _carry_round(acc + s + 1, acc + s + 1);
 #endif
             field_sqr(acc + s + 1, acc + s + 1);
-            INNERPOLY(acc, in, SUPERBLOCKSIZE, INNER_KEY,
-                      (inlen == SUPERBLOCKSIZE));
+            TREE_INNERPOLY(&la, acc, in, SUPERBLOCKSIZE, INNER_KEY,
+                           (inlen == SUPERBLOCKSIZE));
             in += SUPERBLOCKSIZE;
             inlen -= SUPERBLOCKSIZE;
             s = highest2Power(i + 1);
@@ -152,7 +155,165 @@ void tSQH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
         reduce(acc, acc);
         pack_field_elem((baseint_t *)tag_packed, acc);
         free(acc);
+        tree_lookahead_free(&la);
+    }
+
+    transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+}
+
+// hashes count messages with the same key, the inner keys are unpacked only
+// once
+void tSQH_many(unsigned char *out, const unsigned char *const *in,
+               const unsigned long long *inlen, unsigned long long count,
+               const unsigned char *key, unsigned long long keylen) {
+#if defined(NO_INNER_CACHE)
+    for (unsigned long long i = 0; i < count; ++i) {
+        tSQH_eval(out + i * OUTPUTSIZE, in[i], inlen[i], key, keylen, key);
+    }
+#else
+    INNER_STATE_T inner_state = INNER_STATE_ZERO;
+    INNER_STATE_INIT(&inner_state, key);
+    for (unsigned long long i = 0; i < count; ++i) {
+        tSQH_eval(out + i * OUTPUTSIZE, in[i], inlen[i], key, keylen,
+                  &inner_state);
+    }
+#endif
+}
+
+void tSQH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
+          const unsigned char *key, unsigned long long keylen) {
+    tSQH_many(out, &in, &inlen, 1, key, keylen);
+}
+
+// Streaming evaluation: superblocks are combined exactly as in tSQH, the
+// accumulators of the tree are kept for every level. A full superblock is
+// kept pending until more data arrives since the last superblock is encoded
+// differently.
+typedef struct tSQH_state tSQH_state_t;
+
+struct tSQH_state {
+    INNER_STATE_T inner_state;
+    // acc[0] holds the current superblock, acc[s + 1] the level s subtree
+    field_elem_t acc[sizeof(unsigned long long) * 8 + 1];
+    unsigned long long n; // number of superblocks combined into acc
+    int s;
+    const unsigned char *key;
+    unsigned long long keylen;
+    unsigned long long msglen;
+    unsigned long long pendinglen;
+    unsigned char pending[SUPERBLOCKSIZE];
+};
+
+tSQH_state_t *tSQH_init(const unsigned char *key, unsigned long long keylen) {
+    tSQH_state_t *state = calloc(1, sizeof(tSQH_state_t));
+    if (!state)
+        return NULL;
+    INNER_STATE_INIT(&state->inner_state, key);
+    state->key = key;
+    state->keylen = keylen;
+    return state;
+}
+
+// squares the subtree the next superblock is added to with its level key
+static inline void tSQH_square_subtree(tSQH_state_t *state) {
+    field_elem_t *acc = state->acc;
+    field_elem_t k = {0};
+    unpack_and_encode_key(
+        &k, (baseint_t *)(state->key + SUPERKEYSIZE + (state->s * KEYSIZE)));
+    field_add(acc + state->s + 1, acc + state->s + 1, &k);
+#ifdef CARRY_ADD
+    _carry_round(acc + state->s + 1, acc + state->s + 1);
+#endif
+    field_sqr(acc + state->s + 1, acc + state->s + 1);
+}
+
+static inline void tSQH_absorb(tSQH_state_t *state, const unsigned char *in,
+                               int last) {
+    field_elem_t *acc = state->acc;
+    if (state->n > 0) {
+        tSQH_square_subtree(state);
+    }
+    INNERPOLY(acc, in, SUPERBLOCKSIZE, &state->inner_state, last);
+    state->n++;
+    if (state->n == 1) {
+        state->s = 0;
+        acc[1] = acc[0];
+        return;
     }
+    state->s = highest2Power(state->n);
+    acc[state->s + 1] = acc[0];
+    for (int j = 1; j < state->s + 1; j++) {
+        field_add(acc + state->s + 1, acc + state->s + 1, acc + j);
+    }
+    _carry_round(&acc[state->s + 1], &acc[state->s + 1]);
+}
+
+void tSQH_update(tSQH_state_t *state, const unsigned char *in,
+                 unsigned long long inlen) {
+    state->msglen += inlen;
+    if (state->pendinglen) {
+        unsigned long long n = SUPERBLOCKSIZE - state->pendinglen;
+        if (n > inlen)
+            n = inlen;
+        memcpy(state->pending + state->pendinglen, in, n);
+        state->pendinglen += n;
+        in += n;
+        inlen -= n;
+        if (inlen == 0)
+            return;
+        tSQH_absorb(state, state->pending, 0);
+        state->pendinglen = 0;
+    }
+    while (inlen > SUPERBLOCKSIZE) {
+        tSQH_absorb(state, in, 0);
+        in += SUPERBLOCKSIZE;
+        inlen -= SUPERBLOCKSIZE;
+    }
+    memcpy(state->pending, in, inlen);
+    state->pendinglen = inlen;
+}
 
+void tSQH_final(tSQH_state_t *state, unsigned char *out) {
+    field_elem_t *acc = state->acc;
+    unsigned char tag_packed[BUFFSIZE] = {0};
+    if (state->msglen == 0) {
+#if EXPLICIT_LENGTH_ENCODE
+        memset(acc, 0, sizeof(field_elem_t));
+        LENGTH_ENCODING(acc, acc, state->key, state->keylen, state->msglen);
+        reduce(acc, acc);
+        pack_field_elem((baseint_t *)tag_packed, acc);
+        transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+#else
+        memset(out, 0, OUTPUTSIZE);
+#endif
+        free(state);
+        return;
+    }
+    if (state->n == 0 && state->pendinglen < SUPERBLOCKSIZE) {
+        INNERPOLY(acc, state->pending, state->pendinglen, &state->inner_state,
+                  1);
+        _carry_round(acc, acc);
+    } else {
+        if (state->pendinglen == SUPERBLOCKSIZE) {
+            tSQH_absorb(state, state->pending, 1);
+            memset(acc, 0, sizeof(field_elem_t));
+        } else {
+            tSQH_square_subtree(state);
+            INNERPOLY(acc, state->pending, state->pendinglen,
+                      &state->inner_state, 1);
+        }
+        for (uint64_t i = 1, b = state->n; b > 0; b >>= 1, i++) {
+            if (b & 1ULL) {
+                field_add(acc, acc, acc + i);
+            }
+        }
+        _carry_round(acc, acc);
+    }
+#if EXPLICIT_LENGTH_ENCODE
+    LENGTH_ENCODING(acc, acc, state->key, state->keylen, state->msglen);
+#endif
+    reduce(acc, acc);
+    pack_field_elem((baseint_t *)tag_packed, acc);
     transform_field_elem(out, OUTPUTSIZE, tag_packed, BUFFSIZE);
+    free(state);
 }
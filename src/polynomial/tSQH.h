@@ -47,4 +47,25 @@ unsigned long long get_keylength(unsigned long long inlen) {
 void tSQH(unsigned char *out, const unsigned char *in, unsigned long long inlen,
           const unsigned char *key, unsigned long long keylen);
 
+void tSQH_many(unsigned char *out, const unsigned char *const *in,
+               const unsigned long long *inlen, unsigned long long count,
+               const unsigned char *key, unsigned long long keylen);
+#define POLY_EVAL_MANY tSQH_many
+
+void tree_set_threads(unsigned int threads);
+#define POLY_SET_THREADS tree_set_threads
+
+typedef struct tSQH_state tSQH_state_t;
+
+tSQH_state_t *tSQH_init(const unsigned char *key, unsigned long long keylen);
+
+void tSQH_update(tSQH_state_t *state, const unsigned char *in,
+                 unsigned long long inlen);
+
+void tSQH_final(tSQH_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T tSQH_state_t
+#define POLY_STREAM_INIT tSQH_init
+#define POLY_STREAM_UPDATE tSQH_update
+#define POLY_STREAM_FINAL tSQH_final
+
 #endif
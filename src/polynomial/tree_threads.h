@@ -0,0 +1,179 @@
+// MIT License
+//
+// Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+// Multi-threaded evaluation of the inner polynomial for tree constructions.
+//
+// The inner polynomial results of the full superblocks of a message are
+// independent of each other. With more than one thread (tree_set_threads),
+// they are precomputed in windows of TREE_WINDOW_PER_THREAD superblocks per
+// thread, and the outer polynomial combines them in order as before. The
+// outer polynomial only has to replace its calls of INNERPOLY on full
+// superblocks with TREE_INNERPOLY.
+//
+// Include after INNERPOLY_H. The inner key (INNER_STATE_T or the raw key for
+// NO_INNER_CACHE) is only read, so it is shared by all threads.
+
+#ifndef __TREE_THREADS_H
+#define __TREE_THREADS_H
+#include <pthread.h>
+#include <stdlib.h>
+
+#ifndef TREE_WINDOW_PER_THREAD
+#define TREE_WINDOW_PER_THREAD 1024
+#endif
+
+// Messages with fewer full superblocks are always hashed on one thread.
+#ifndef TREE_MIN_SUPERBLOCKS
+#define TREE_MIN_SUPERBLOCKS 64
+#endif
+
+#ifndef TREE_MAX_THREADS
+#define TREE_MAX_THREADS 256
+#endif
+
+#ifndef TREE_INNER_KEY_T
+#if defined(NO_INNER_CACHE)
+#define TREE_INNER_KEY_T const unsigned char *
+#else
+#define TREE_INNER_KEY_T INNER_STATE_T *
+#endif
+#endif
+
+static unsigned int tree_threads = 1;
+
+void tree_set_threads(unsigned int threads) {
+    if (threads < 1)
+        threads = 1;
+    if (threads > TREE_MAX_THREADS)
+        threads = TREE_MAX_THREADS;
+    tree_threads = threads;
+}
+
+typedef struct tree_lookahead {
+    TREE_INNER_KEY_T key;
+    const unsigned char *end; // end of the message
+    unsigned long long stride; // distance between two superblocks
+    const unsigned char *first; // first superblock of the window
+    unsigned long long count; // number of superblocks in the window
+    unsigned int threads;
+    field_elem_t *res; // NULL if the lookahead is disabled
+} tree_lookahead_t;
+
+typedef struct tree_task {
+    TREE_INNER_KEY_T key;
+    const unsigned char *in;
+    unsigned long long stride;
+    unsigned long long count;
+    field_elem_t *res;
+} tree_task_t;
+
+static void *tree_run_task(void *arg) {
+    tree_task_t *task = arg;
+    const unsigned char *in = task->in;
+    for (unsigned long long i = 0; i < task->count; i++) {
+        INNERPOLY(task->res + i, in, SUPERBLOCKSIZE, task->key, 0);
+        in += task->stride;
+    }
+    return NULL;
+}
+
+// Superblocks start every stride bytes from in, in + inlen is the end of the
+// message.
+static inline void tree_lookahead_init(tree_lookahead_t *la,
+                                       const unsigned char *in,
+                                       unsigned long long inlen,
+                                       unsigned long long stride,
+                                       TREE_INNER_KEY_T key) {
+    la->key = key;
+    la->end = in + inlen;
+    la->stride = stride;
+    la->first = in;
+    la->count = 0;
+    la->threads = tree_threads;
+    la->res = NULL;
+    if (la->threads > 1 && inlen >= SUPERBLOCKSIZE &&
+        (inlen - SUPERBLOCKSIZE) / stride + 1 >= TREE_MIN_SUPERBLOCKS) {
+        la->res = malloc(la->threads * TREE_WINDOW_PER_THREAD *
+                         sizeof(field_elem_t));
+    }
+}
+
+static inline void tree_lookahead_free(tree_lookahead_t *la) {
+    free(la->res);
+    la->res = NULL;
+}
+
+// Computes the window of superblocks starting at in, the calling thread takes
+// the first share.
+static void tree_lookahead_fill(tree_lookahead_t *la,
+                                const unsigned char *in) {
+    unsigned long long left =
+        (unsigned long long)(la->end - in - SUPERBLOCKSIZE) / la->stride + 1;
+    unsigned long long count = la->threads * TREE_WINDOW_PER_THREAD;
+    if (count > left)
+        count = left;
+    unsigned long long share = (count + la->threads - 1) / la->threads;
+    tree_task_t tasks[TREE_MAX_THREADS] = {0};
+    pthread_t threads[TREE_MAX_THREADS];
+    int started[TREE_MAX_THREADS] = {0};
+    unsigned int n = 0;
+    for (unsigned long long i = 0; i < count; i += share, n++) {
+        tasks[n] = (tree_task_t){la->key, in + i * la->stride, la->stride,
+                                 count - i < share ? count - i : share,
+                                 la->res + i};
+        if (n > 0)
+            started[n] =
+                !pthread_create(threads + n, NULL, tree_run_task, tasks + n);
+    }
+    tree_run_task(tasks);
+    for (unsigned int t = 1; t < n; t++) {
+        // threads that could not be created are run here instead
+        if (started[t])
+            pthread_join(threads[t], NULL);
+        else
+            tree_run_task(tasks + t);
+    }
+    la->first = in;
+    la->count = count;
+}
+
+// Returns 1 and sets out to the inner polynomial of the superblock at in if
+// it can be taken from the lookahead.
+static inline int tree_lookahead_get(tree_lookahead_t *la, field_elem_t *out,
+                                     const unsigned char *in,
+                                     unsigned long long inlen, int last) {
+    if (!la->res || last || inlen != SUPERBLOCKSIZE)
+        return 0;
+    if (in < la->first || in >= la->first + la->count * la->stride ||
+        (in - la->first) % la->stride)
+        tree_lookahead_fill(la, in);
+    *out = la->res[(in - la->first) / la->stride];
+    return 1;
+}
+
+#define TREE_INNERPOLY(la, out, in, inlen, key, last)                         \
+    do {                                                                       \
+        if (!tree_lookahead_get(la, out, in, inlen, last))                     \
+            INNERPOLY(out, in, inlen, key, last);                              \
+    } while (0)
+
+#endif
@@ -20,8 +20,9 @@
 // OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 // SOFTWARE.
 
-#include "../field_arithmetic/field_arithmetic.h"
+#include "field_arithmetic.h"
 #include "../transform/transform.h"
+#include "v1NMH_Horner_2level_NB_Delay_b_test.h"
 #include "boost/preprocessor/arithmetic/add.hpp"
 #include "boost/preprocessor/arithmetic/div.hpp"
 #include "boost/preprocessor/arithmetic/mul.hpp"
@@ -283,3 +284,73 @@ void v1NMH_Horner_2level_NB_Delay_b_test(unsigned char *out,
         out, OUTPUTSIZE, tag_packed,
         BUFFSIZE); // transform from field element to byte missing?
 }
+
+// Streaming evaluation: chunks of whole groups of NB_BLOCK_FLVL blocks are
+// evaluated group by group as the remaining blocks above, and combined with
+// acc = acc * k^NB_BLOCK_FLVL + group.
+typedef struct v1NMH_Horner_2level_NB_Delay_b_test_keys {
+    field_elem_t k[NB_BLOCK_FLVL];
+} v1NMH_Horner_2level_NB_Delay_b_test_keys_t;
+
+static inline void v1NMH_Horner_2level_NB_Delay_b_test_keys_init(
+    v1NMH_Horner_2level_NB_Delay_b_test_keys_t *keys,
+    const unsigned char *key) {
+    unpack_and_encode_key(keys->k, (baseint_t *)key);
+    for (int j = 0; j < NB_BLOCK_FLVL - 1; ++j) {
+        field_mul(keys->k + j + 1, keys->k + j, keys->k);
+    }
+}
+
+static inline void v1NMH_Horner_2level_NB_Delay_b_test_chunk(
+    field_elem_t *out, const unsigned char *in, unsigned long long inlen,
+    const field_elem_t *k, int last) {
+    unsigned int nbBlockFlvl = NB_BLOCK_FLVL;
+    unsigned int i = 0, j = 0;
+    field_elem_t acc = {0};
+    DEFINE_D_ACC;
+    field_elem_t a[nbBlockFlvl];
+    unsigned long long nbBlockFlvl_blocksize = nbBlockFlvl * BLOCKSIZE;
+
+    while (inlen) {
+        // number of blocks of the group
+        i = inlen > nbBlockFlvl_blocksize ? nbBlockFlvl
+                                          : (inlen + BLOCKSIZE - 1) / BLOCKSIZE;
+        for (j = 0; j < i - 1; ++j) {
+            unpack_and_encode_field_elem(a + j, (baseint_t *)in);
+            in += BLOCKSIZE;
+            inlen -= BLOCKSIZE;
+        }
+        if (last && inlen <= BLOCKSIZE) {
+            unpack_and_encode_last_field_elem(a + j, (baseint_t *)in, inlen);
+            inlen = 0;
+        } else {
+            unpack_and_encode_field_elem(a + j, (baseint_t *)in);
+            in += BLOCKSIZE;
+            inlen -= BLOCKSIZE;
+        }
+
+        MULT_NEXT;
+        for (j = 0; j < i - 1; j += 2) {
+            field_add(a + j, a + j, k + j);
+            field_add(a + j + 1, a + j + 1, k + j + 1);
+            MULT_AND_ACC;
+        }
+        CARRY_D_ACC;
+        if (j == i - 1) {
+            field_add(&acc, &acc, a + j);
+            _carry_round(&acc, &acc);
+        }
+    }
+    *out = acc;
+}
+
+#define HORNER_STREAM_POLY v1NMH_Horner_2level_NB_Delay_b_test
+#define HORNER_STREAM_UNIT NB_BLOCK_FLVL
+#define HORNER_STREAM_BLOCKS (16 * NB_BLOCK_FLVL)
+#define HORNER_STREAM_INNER_STATE_T v1NMH_Horner_2level_NB_Delay_b_test_keys_t
+#define HORNER_STREAM_INNER_STATE_INIT                                         \
+    v1NMH_Horner_2level_NB_Delay_b_test_keys_init
+#define HORNER_STREAM_CHUNK(out, in, inlen, state, last)                       \
+    v1NMH_Horner_2level_NB_Delay_b_test_chunk(out, in, inlen,                  \
+                                              (state)->inner.k, last)
+#include "horner_stream.h"
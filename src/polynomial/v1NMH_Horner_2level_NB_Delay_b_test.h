@@ -31,4 +31,22 @@ void v1NMH_Horner_2level_NB_Delay_b_test(unsigned char *out,
                                         const unsigned char *key,
                                         unsigned long long keylen);
 
+typedef struct v1NMH_Horner_2level_NB_Delay_b_test_state
+    v1NMH_Horner_2level_NB_Delay_b_test_state_t;
+
+v1NMH_Horner_2level_NB_Delay_b_test_state_t *
+v1NMH_Horner_2level_NB_Delay_b_test_init(const unsigned char *key,
+                                         unsigned long long keylen);
+
+void v1NMH_Horner_2level_NB_Delay_b_test_update(
+    v1NMH_Horner_2level_NB_Delay_b_test_state_t *state, const unsigned char *in,
+    unsigned long long inlen);
+
+void v1NMH_Horner_2level_NB_Delay_b_test_final(
+    v1NMH_Horner_2level_NB_Delay_b_test_state_t *state, unsigned char *out);
+#define POLY_STREAM_STATE_T v1NMH_Horner_2level_NB_Delay_b_test_state_t
+#define POLY_STREAM_INIT v1NMH_Horner_2level_NB_Delay_b_test_init
+#define POLY_STREAM_UPDATE v1NMH_Horner_2level_NB_Delay_b_test_update
+#define POLY_STREAM_FINAL v1NMH_Horner_2level_NB_Delay_b_test_final
+
 #endif
@@ -0,0 +1,261 @@
+# MIT License
+#
+# Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Detection of performance regressions between two benchmark runs.
+
+The runs are aligned by configuration (the hash of the configuration appended to
+every results csv) and message length. For every message length the cycles of the
+samples of both runs are compared with a two-sided Mann-Whitney U test, the
+p-values of a configuration are adjusted with Benjamini-Hochberg. A message length
+regressed if the adjusted p-value is below alpha and the median cycles grew by more
+than threshold, relative to the baseline.
+"""
+
+import getopt
+import json
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from scipy.stats import false_discovery_control, mannwhitneyu
+
+from src.results_store import config_hash, read_config_comment
+
+REGRESSION = "regression"
+IMPROVEMENT = "improvement"
+UNCHANGED = "unchanged"
+
+
+@dataclass
+class RunResults:
+    """The results csv files of a benchmark run, keyed by config hash."""
+
+    path: Path
+    names: dict[str, str]
+    samples: dict[str, pd.DataFrame]
+
+
+@dataclass
+class LengthComparison:
+    MessageLength: int
+    baseline_median: float
+    current_median: float
+    change: float
+    effect_size: float
+    p_value: float
+    status: str
+
+
+@dataclass
+class ConfigComparison:
+    config_hash: str
+    name: str
+    baseline: str
+    current: str
+    status: str
+    lengths: list[LengthComparison] = field(default_factory=list)
+
+
+def resolve_run(run: str, bench_dir: Path = Path("bench")) -> Path:
+    """Returns the benchmark directory of a run given by path or by run id, the
+    timestamped directory name below bench_dir."""
+    for path in [Path(run), bench_dir / run]:
+        if path.is_dir():
+            return path
+    raise FileNotFoundError(f"no benchmark run {run} in {bench_dir}")
+
+
+def load_run(path: Path) -> RunResults:
+    names: dict[str, str] = {}
+    samples: dict[str, pd.DataFrame] = {}
+    for results in sorted(path.glob("*_results.csv")):
+        config = json.loads(read_config_comment(results) or "{}")
+        digest = config_hash(config)
+        names[digest] = results.name.removesuffix("_results.csv")
+        if config.get("name"):
+            names[digest] += f" ({config['name']})"
+        samples[digest] = pd.read_csv(
+            results, comment="#", usecols=["MessageLength", "cycles"]
+        )
+    return RunResults(path, names, samples)
+
+
+def relative_change(base_median: float, current_median: float) -> float:
+    """Change of the median relative to the baseline, a baseline median of 0
+    (all samples at most the timing overhead) changes infinitely if the current
+    median is not 0 as well."""
+    if base_median == 0:
+        return float("inf") if current_median > 0 else 0.0
+    return current_median / base_median - 1
+
+
+def compare_samples(
+    baseline: pd.DataFrame,
+    current: pd.DataFrame,
+    threshold: float = 0.05,
+    alpha: float = 0.01,
+) -> list[LengthComparison]:
+    """Compares the cycles of two runs of a config per message length.
+
+    The effect size is the rank-biserial correlation, positive if the current
+    run is slower.
+    """
+    base_groups = baseline.groupby("MessageLength")["cycles"]
+    current_groups = dict(list(current.groupby("MessageLength")["cycles"]))
+    lengths = []
+    p_values = []
+    for length, base in base_groups:
+        cur = current_groups.get(length)
+        if cur is None or len(base) < 2 or len(cur) < 2:
+            continue
+        u, p_value = mannwhitneyu(cur, base, alternative="two-sided")
+        base_median = float(np.median(base))
+        current_median = float(np.median(cur))
+        lengths.append(
+            LengthComparison(
+                MessageLength=int(length),
+                baseline_median=base_median,
+                current_median=current_median,
+                change=relative_change(base_median, current_median),
+                effect_size=2 * u / (len(base) * len(cur)) - 1,
+                p_value=float(p_value),
+                status=UNCHANGED,
+            )
+        )
+        p_values.append(p_value)
+    if not lengths:
+        return lengths
+    # identical samples give nan p-values, they are never significant
+    p_values = np.nan_to_num(np.asarray(p_values, dtype=float), nan=1.0)
+    for comparison, p_value in zip(lengths, false_discovery_control(p_values)):
+        comparison.p_value = float(p_value)
+        if p_value < alpha and comparison.change > threshold:
+            comparison.status = REGRESSION
+        elif p_value < alpha and comparison.change < -threshold:
+            comparison.status = IMPROVEMENT
+    return lengths
+
+
+def compare_runs(
+    baseline: Path,
+    current: Path,
+    threshold: float = 0.05,
+    alpha: float = 0.01,
+) -> dict:
+    """Compares two benchmark directories and returns the regression report.
+
+    Configs that are only benchmarked in one of the runs are listed as missing
+    or new, they are not counted as regressions.
+    """
+    base_run = load_run(baseline)
+    current_run = load_run(current)
+    configs: list[ConfigComparison] = []
+    for digest, base in base_run.samples.items():
+        if digest not in current_run.samples:
+            continue
+        lengths = compare_samples(base, current_run.samples[digest], threshold, alpha)
+        statuses = {comparison.status for comparison in lengths}
+        status = UNCHANGED
+        if REGRESSION in statuses:
+            status = REGRESSION
+        elif IMPROVEMENT in statuses:
+            status = IMPROVEMENT
+        configs.append(
+            ConfigComparison(
+                config_hash=digest,
+                name=current_run.names[digest],
+                baseline=base_run.names[digest],
+                current=current_run.names[digest],
+                status=status,
+                lengths=lengths,
+            )
+        )
+    return {
+        "baseline": str(baseline),
+        "current": str(current),
+        "threshold": threshold,
+        "alpha": alpha,
+        "regressions": sum(config.status == REGRESSION for config in configs),
+        "configs": [asdict(config) for config in configs],
+        "missing": [
+            base_run.names[digest]
+            for digest in base_run.samples
+            if digest not in current_run.samples
+        ],
+        "new": [
+            current_run.names[digest]
+            for digest in current_run.samples
+            if digest not in base_run.samples
+        ],
+    }
+
+
+def summary(report: dict) -> list[tuple[str, str]]:
+    """Returns the status and a line for every config that regressed or improved."""
+    lines = []
+    for config in report["configs"]:
+        if config["status"] == UNCHANGED:
+            continue
+        changed = [
+            length
+            for length in config["lengths"]
+            if length["status"] == config["status"]
+        ]
+        worst = max(changed, key=lambda length: abs(length["change"]))
+        lines.append(
+            (
+                config["status"],
+                f"{config['name']}: {config['status']} at {len(changed)} message"
+                f" lengths, {worst['change']:+.1%} at {worst['MessageLength']} B",
+            )
+        )
+    return lines
+
+
+def write_report(report: dict, path: Optional[Path]) -> None:
+    if path is None:
+        json.dump(report, sys.stdout, indent=4)
+        print()
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+
+
+if __name__ == "__main__":
+    # python -m src.regression [--threshold=<fraction>] [--alpha=<p>]
+    #     [--report=<file>] <baseline> <current>
+    opts, runs = getopt.getopt(sys.argv[1:], "", ["threshold=", "alpha=", "report="])
+    options = dict(opts)
+    report = compare_runs(
+        resolve_run(runs[0]),
+        resolve_run(runs[1]),
+        threshold=float(options.get("--threshold", 0.05)),
+        alpha=float(options.get("--alpha", 0.01)),
+    )
+    report_path = options.get("--report")
+    write_report(report, Path(report_path) if report_path else None)
+    for _, line in summary(report):
+        print(line, file=sys.stderr)
+    sys.exit(1 if report["regressions"] else 0)
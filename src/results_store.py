@@ -0,0 +1,317 @@
+# MIT License
+#
+# Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import json
+import math
+import sqlite3
+import subprocess
+import sys
+from functools import cache
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import pandas as pd
+
+from src.util import cpu_info
+
+# columns of a benchmark, every sample row of the results view carries them
+BENCHMARK_COLUMNS = [
+    "run_id",
+    "config_file",
+    "config_number",
+    "config_name",
+    "config_hash",
+    "host_cpu",
+    "compiler",
+    "compiler_flags",
+    "macro_defs",
+]
+
+
+def config_hash(config: dict[str, Any]) -> str:
+    canonical = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def flatten_config(config: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flattens a config into columns named by the dotted path of each field,
+    lists are stored as JSON."""
+    res: dict[str, Any] = {}
+    for key, value in config.items():
+        if isinstance(value, dict):
+            res.update(flatten_config(value, f"{prefix}{key}."))
+        elif isinstance(value, (list, tuple)):
+            res[f"{prefix}{key}"] = json.dumps(value)
+        else:
+            res[f"{prefix}{key}"] = value
+    return res
+
+
+def read_config_comment(filename: Path) -> Optional[str]:
+    """Returns the config JSON that run.py appends to a results csv as comments."""
+    lines = []
+    with open(filename, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#"):
+                lines.append(line[1:])
+    text = "".join(lines).strip()
+    return text or None
+
+
+@cache
+def compiler_version() -> str:
+    return subprocess.run(
+        "${CC:-gcc} --version",
+        shell=True,
+        capture_output=True,
+        text=True,
+        check=False,
+    ).stdout.split("\n", 1)[0]
+
+
+def quote(column: str) -> str:
+    return '"' + column.replace('"', '""') + '"'
+
+
+class ResultsStore:
+    """SQLite database of the samples of all benchmark runs.
+
+    The samples table holds the rows of the results csv files, the benchmarks
+    table the run id, host, compiler and config of each benchmarked config and the
+    configs table one row per distinct config, with a column per config field.
+    The results view joins the three, so every sample row carries the columns of
+    its benchmark and config. Columns are added as new csv or config fields
+    appear, query() only reads the requested columns and rows.
+    """
+
+    def __init__(self, path: Path = Path("bench/results.sqlite")) -> None:
+        self.path: Path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS configs (
+                config_hash TEXT PRIMARY KEY,
+                config TEXT
+            );
+            CREATE TABLE IF NOT EXISTS benchmarks (
+                benchmark INTEGER PRIMARY KEY,
+                run_id TEXT,
+                config_file TEXT,
+                config_number INTEGER,
+                config_name TEXT,
+                config_hash TEXT REFERENCES configs,
+                host_cpu TEXT,
+                compiler TEXT,
+                compiler_flags TEXT,
+                macro_defs TEXT,
+                UNIQUE (run_id, config_file, config_number)
+            );
+            CREATE TABLE IF NOT EXISTS samples (
+                benchmark INTEGER REFERENCES benchmarks
+            );
+            CREATE INDEX IF NOT EXISTS samples_benchmark ON samples (benchmark);
+            CREATE INDEX IF NOT EXISTS benchmarks_config ON benchmarks (config_hash);
+            """)
+        self._update_view()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def _columns(self, table: str) -> list[str]:
+        return [row[1] for row in self.db.execute(f"PRAGMA table_info({table})")]
+
+    def _add_columns(self, table: str, columns: Iterable[str]) -> bool:
+        existing = set(self._columns(table))
+        added = False
+        for column in columns:
+            if column not in existing:
+                self.db.execute(f"ALTER TABLE {table} ADD COLUMN {quote(column)}")
+                existing.add(column)
+                added = True
+        return added
+
+    def _update_view(self) -> None:
+        # the view lists its columns explicitly, so it is rebuilt with the tables
+        config_columns = [c for c in self._columns("configs") if c != "config_hash"]
+        sample_columns = [c for c in self._columns("samples") if c != "benchmark"]
+        columns = (
+            [f"s.{quote(c)}" for c in sample_columns]
+            + [f"b.{quote(c)}" for c in BENCHMARK_COLUMNS]
+            + [f"c.{quote(c)}" for c in config_columns]
+        )
+        self.db.executescript(f"""
+            DROP VIEW IF EXISTS results;
+            CREATE VIEW results AS SELECT {", ".join(columns)}
+            FROM samples s
+            JOIN benchmarks b ON s.benchmark = b.benchmark
+            JOIN configs c ON b.config_hash = c.config_hash;
+            """)
+
+    def add(
+        self,
+        run_id: str,
+        results: Path,
+        config_file: str,
+        config_number: int,
+        config_json: Optional[str] = None,
+        compiler_flags: Optional[str] = None,
+        macro_defs: Optional[str] = None,
+        host_cpu: Optional[str] = None,
+        compiler: Optional[str] = None,
+    ) -> None:
+        """Adds the samples of a results csv, replacing a previous import of the
+        same benchmark. The config is read from the comments of the csv if not
+        given."""
+        if config_json is None:
+            config_json = read_config_comment(results) or "{}"
+        config: dict[str, Any] = json.loads(config_json)
+        digest = config_hash(config)
+        fields = flatten_config(config)
+        samples = pd.read_csv(results, comment="#")
+
+        changed = self._add_columns("configs", fields)
+        changed |= self._add_columns("samples", samples.columns)
+        if changed:
+            self._update_view()
+        with self.db:
+            columns = ["config_hash", "config", *fields]
+            self.db.execute(
+                f"INSERT OR IGNORE INTO configs ({', '.join(map(quote, columns))}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                [digest, config_json, *fields.values()],
+            )
+            self.db.execute(
+                "DELETE FROM samples WHERE benchmark IN (SELECT benchmark FROM "
+                "benchmarks WHERE run_id = ? AND config_file = ? AND config_number = ?)",
+                (run_id, config_file, config_number),
+            )
+            self.db.execute(
+                "DELETE FROM benchmarks "
+                "WHERE run_id = ? AND config_file = ? AND config_number = ?",
+                (run_id, config_file, config_number),
+            )
+            benchmark = self.db.execute(
+                f"INSERT INTO benchmarks ({', '.join(BENCHMARK_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(BENCHMARK_COLUMNS))})",
+                (
+                    run_id,
+                    config_file,
+                    config_number,
+                    config.get("name"),
+                    digest,
+                    host_cpu,
+                    compiler,
+                    compiler_flags,
+                    macro_defs,
+                ),
+            ).lastrowid
+            columns = ["benchmark", *samples.columns]
+            self.db.executemany(
+                f"INSERT INTO samples ({', '.join(map(quote, columns))}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                (
+                    (benchmark, *(None if _isnan(v) else v for v in row))
+                    for row in samples.itertuples(index=False, name=None)
+                ),
+            )
+
+    def add_run(
+        self, run_dir: Path, compiler_flags: Optional[str] = None
+    ) -> list[Path]:
+        """Imports all results csv files of a benchmark directory, the directory
+        name is used as run id. Returns the imported files."""
+        imported = []
+        for results in sorted(run_dir.glob("*_results.csv")):
+            config_file, config_number = results.name.removesuffix(
+                "_results.csv"
+            ).rsplit("_", 1)
+            self.add(
+                run_dir.name,
+                results,
+                config_file,
+                int(config_number),
+                compiler_flags=compiler_flags,
+            )
+            imported.append(results)
+        return imported
+
+    def query(
+        self,
+        columns: Optional[list[str]] = None,
+        where: Optional[dict[str, Any]] = None,
+        **filters: Any,
+    ) -> pd.DataFrame:
+        """Returns the sample rows matching all filters, with the given columns only.
+
+        A filter compares a column to a value, or to any value of a list or tuple,
+        e.g. query(["MessageLength", "cycles"], run_id=["a", "b"], blocksize=16).
+        Config fields are named by their dotted path and are filtered with where,
+        e.g. where={"field.pi": 130}.
+        """
+        filters.update(where or {})
+        # sqlite reads unknown quoted identifiers as string literals
+        available = set(self._columns("results"))
+        unknown = [c for c in [*(columns or []), *filters] if c not in available]
+        if unknown:
+            raise KeyError(f"unknown result columns: {', '.join(unknown)}")
+        select = "*" if columns is None else ", ".join(map(quote, columns))
+        conditions = []
+        params: list[Any] = []
+        for column, value in filters.items():
+            if isinstance(value, (list, tuple)):
+                conditions.append(f"{quote(column)} IN ({', '.join('?' * len(value))})")
+                params.extend(value)
+            elif value is None:
+                conditions.append(f"{quote(column)} IS NULL")
+            else:
+                conditions.append(f"{quote(column)} = ?")
+                params.append(value)
+        sql = f"SELECT {select} FROM results"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return pd.read_sql_query(sql, self.db, params=params)
+
+    def runs(self) -> pd.DataFrame:
+        """Returns one row per benchmarked config of every run."""
+        return pd.read_sql_query(
+            f"SELECT {', '.join(BENCHMARK_COLUMNS)} FROM benchmarks "
+            "ORDER BY run_id, config_file, config_number",
+            self.db,
+        )
+
+
+def _isnan(value: Any) -> bool:
+    return isinstance(value, float) and math.isnan(value)
+
+
+def host_cpu() -> str:
+    return cpu_info().get("brand_raw", "")
+
+
+if __name__ == "__main__":
+    # imports benchmark directories written before the store existed
+    store = ResultsStore(Path(sys.argv[1]))
+    for run_dir in sys.argv[2:]:
+        for results in store.add_run(Path(run_dir)):
+            print(f"imported {results}")
+    store.close()
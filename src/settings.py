@@ -22,10 +22,24 @@
 # SOFTWARE.
 
 import getopt
+import os
 from pathlib import Path
 import sys
 from typing import Optional
 
+PLOT_FORMATS: list[str] = ["png", "svg", "pdf"]
+DEFAULT_PLOT_FORMATS: list[str] = ["png", "svg"]
+PLOT_VARIANTS: list[str] = [
+    "cycles",
+    "rate",
+    "rate_cut",
+    "rate_y_cut",
+    "ipc",
+    "misses",
+    "throughput",
+    "throughput_per_thread",
+]
+
 
 class Settings:
     def __init__(
@@ -61,6 +75,33 @@ class Settings:
         plot_dir=Path("plots"),
         test_steps: int = 1,
         fail_fast: bool = False,
+        jobs: int = 1,
+        test_processes: int = os.cpu_count() or 1,
+        arith_batch_size: int = 4096,
+        cache: bool = True,
+        cache_dir=Path("cache"),
+        cache_size: int = 256,
+        store: bool = True,
+        raw_samples: bool = False,
+        message_pool: int = 0,
+        adaptive_ci: Optional[float] = None,
+        time_budget: float = 10.0,
+        cpu: Optional[int] = None,
+        max_drift: Optional[float] = None,
+        perf_counters: bool = False,
+        uops_event: Optional[str] = None,
+        scaling: int = 0,
+        scaling_max_size: int = 1 << 30,
+        throughput: int = 0,
+        throughput_duration: float = 1.0,
+        throughput_max_size: int = 1 << 24,
+        compare_to: Optional[str] = None,
+        regression_threshold: float = 0.05,
+        regression_alpha: float = 0.01,
+        plot_processes: int = os.cpu_count() or 1,
+        plot_formats: Optional[list[str]] = None,
+        plot_variants: Optional[list[str]] = None,
+        replot: Optional[Path] = None,
     ) -> None:
         self.build: bool = build
         self.bench: bool = bench
@@ -92,6 +133,33 @@ class Settings:
         self.plot_dir: Path = plot_dir
         self.test_steps: int = test_steps
         self.fail_fast: bool = fail_fast
+        self.jobs: int = jobs
+        self.test_processes: int = test_processes
+        self.arith_batch_size: int = arith_batch_size
+        self.cache: bool = cache
+        self.cache_dir: Path = cache_dir
+        self.cache_size: int = cache_size
+        self.store: bool = store
+        self.raw_samples: bool = raw_samples
+        self.message_pool: int = message_pool
+        self.adaptive_ci: Optional[float] = adaptive_ci
+        self.time_budget: float = time_budget
+        self.cpu: Optional[int] = cpu
+        self.max_drift: Optional[float] = max_drift
+        self.perf_counters: bool = perf_counters
+        self.uops_event: Optional[str] = uops_event
+        self.scaling: int = scaling
+        self.scaling_max_size: int = scaling_max_size
+        self.throughput: int = throughput
+        self.throughput_duration: float = throughput_duration
+        self.throughput_max_size: int = throughput_max_size
+        self.compare_to: Optional[str] = compare_to
+        self.regression_threshold: float = regression_threshold
+        self.regression_alpha: float = regression_alpha
+        self.plot_processes: int = plot_processes
+        self.plot_formats: list[str] = plot_formats or DEFAULT_PLOT_FORMATS
+        self.plot_variants: list[str] = plot_variants or PLOT_VARIANTS
+        self.replot: Optional[Path] = replot
         if includes is None:
             self.includes: list[str] = []
         else:
@@ -122,6 +190,33 @@ class Settings:
         res += f"plot_dir = {self.plot_dir}"
         res += f"test_steps = {self.test_steps}"
         res += f"fail_fast = {self.fail_fast}"
+        res += f"jobs = {self.jobs}"
+        res += f"test_processes = {self.test_processes}"
+        res += f"arith_batch_size = {self.arith_batch_size}"
+        res += f"cache = {self.cache}"
+        res += f"cache_dir = {self.cache_dir}"
+        res += f"cache_size = {self.cache_size}"
+        res += f"store = {self.store}"
+        res += f"raw_samples = {self.raw_samples}"
+        res += f"message_pool = {self.message_pool}"
+        res += f"adaptive_ci = {self.adaptive_ci}"
+        res += f"time_budget = {self.time_budget}"
+        res += f"cpu = {self.cpu}"
+        res += f"max_drift = {self.max_drift}"
+        res += f"perf_counters = {self.perf_counters}"
+        res += f"uops_event = {self.uops_event}"
+        res += f"scaling = {self.scaling}"
+        res += f"scaling_max_size = {self.scaling_max_size}"
+        res += f"throughput = {self.throughput}"
+        res += f"throughput_duration = {self.throughput_duration}"
+        res += f"throughput_max_size = {self.throughput_max_size}"
+        res += f"compare_to = {self.compare_to}"
+        res += f"regression_threshold = {self.regression_threshold}"
+        res += f"regression_alpha = {self.regression_alpha}"
+        res += f"plot_processes = {self.plot_processes}"
+        res += f"plot_formats = {self.plot_formats}"
+        res += f"plot_variants = {self.plot_variants}"
+        res += f"replot = {self.replot}"
         res = f"{{{res}}}"
         return res
 
@@ -151,6 +246,9 @@ class Settings:
                 "full_logs",
                 "ctgrind",
                 "fail_fast",
+                "no_cache",
+                "no_store",
+                "raw_samples",
                 "ctgrind_bin=",
                 "iterations=",
                 "max_messagesize=",
@@ -162,6 +260,30 @@ class Settings:
                 "bench_dir=",
                 "plot_dir=",
                 "test_steps=",
+                "jobs=",
+                "test_processes=",
+                "arith_batch_size=",
+                "cache_dir=",
+                "cache_size=",
+                "scaling=",
+                "message_pool=",
+                "adaptive_ci=",
+                "time_budget=",
+                "cpu=",
+                "max_drift=",
+                "perf_counters",
+                "uops_event=",
+                "scaling_max_size=",
+                "throughput=",
+                "throughput_duration=",
+                "throughput_max_size=",
+                "compare_to=",
+                "regression_threshold=",
+                "regression_alpha=",
+                "plot_processes=",
+                "plot_formats=",
+                "plot_variants=",
+                "replot=",
             ],
         )
         return Settings.from_options(opts), config_files
@@ -188,6 +310,10 @@ class Settings:
             latex="--latex" in options,
             full_logs="--full_logs" in options,
             fail_fast="--fail_fast" in options,
+            cache="--no_cache" not in options,
+            store="--no_store" not in options,
+            raw_samples="--raw_samples" in options,
+            perf_counters="--perf_counters" in options,
         )
 
         if "--fontsize" in options:
@@ -265,6 +391,190 @@ class Settings:
             except ValueError:
                 print("--plot_dir should be a valid path")
                 exit(-1)
+        if "--jobs" in options:
+            try:
+                idx = options.index("--jobs")
+                settings.jobs = int(opts[idx][1])
+            except ValueError:
+                print("--jobs should be an integer")
+                exit(-1)
+            if settings.jobs < 1:
+                print("--jobs should be at least 1")
+                exit(-1)
+        if "--test_processes" in options:
+            try:
+                idx = options.index("--test_processes")
+                settings.test_processes = int(opts[idx][1])
+            except ValueError:
+                print("--test_processes should be an integer")
+                exit(-1)
+            if settings.test_processes < 1:
+                print("--test_processes should be at least 1")
+                exit(-1)
+        if "--arith_batch_size" in options:
+            try:
+                idx = options.index("--arith_batch_size")
+                settings.arith_batch_size = int(opts[idx][1])
+            except ValueError:
+                print("--arith_batch_size should be an integer")
+                exit(-1)
+            if settings.arith_batch_size < 0:
+                print("--arith_batch_size should not be negative")
+                exit(-1)
+        if "--cache_dir" in options:
+            idx = options.index("--cache_dir")
+            settings.cache_dir = Path(opts[idx][1])
+        if "--cache_size" in options:
+            try:
+                idx = options.index("--cache_size")
+                settings.cache_size = int(opts[idx][1])
+            except ValueError:
+                print("--cache_size should be an integer")
+                exit(-1)
+            if settings.cache_size < 1:
+                print("--cache_size should be at least 1")
+                exit(-1)
+        if "--message_pool" in options:
+            try:
+                idx = options.index("--message_pool")
+                settings.message_pool = int(opts[idx][1])
+            except ValueError:
+                print("--message_pool should be an integer")
+                exit(-1)
+            if settings.message_pool < 1:
+                print("--message_pool should be at least 1")
+                exit(-1)
+        if "--adaptive_ci" in options:
+            try:
+                idx = options.index("--adaptive_ci")
+                settings.adaptive_ci = float(opts[idx][1])
+            except ValueError:
+                print("--adaptive_ci should be a number")
+                exit(-1)
+            if settings.adaptive_ci <= 0:
+                print("--adaptive_ci should be positive")
+                exit(-1)
+        if "--time_budget" in options:
+            try:
+                idx = options.index("--time_budget")
+                settings.time_budget = float(opts[idx][1])
+            except ValueError:
+                print("--time_budget should be a number")
+                exit(-1)
+        if "--cpu" in options:
+            try:
+                idx = options.index("--cpu")
+                settings.cpu = int(opts[idx][1])
+            except ValueError:
+                print("--cpu should be an integer")
+                exit(-1)
+            if settings.cpu < 0:
+                print("--cpu should not be negative")
+                exit(-1)
+        if "--max_drift" in options:
+            try:
+                idx = options.index("--max_drift")
+                settings.max_drift = float(opts[idx][1])
+            except ValueError:
+                print("--max_drift should be a number")
+                exit(-1)
+        if "--uops_event" in options:
+            idx = options.index("--uops_event")
+            try:
+                int(opts[idx][1], 0)
+            except ValueError:
+                print("--uops_event should be an integer, e.g. 0x010e")
+                exit(-1)
+            settings.uops_event = opts[idx][1]
+        if "--scaling" in options:
+            try:
+                idx = options.index("--scaling")
+                settings.scaling = int(opts[idx][1])
+            except ValueError:
+                print("--scaling should be an integer")
+                exit(-1)
+            if settings.scaling < 1:
+                print("--scaling should be at least 1")
+                exit(-1)
+        if "--scaling_max_size" in options:
+            try:
+                idx = options.index("--scaling_max_size")
+                settings.scaling_max_size = int(opts[idx][1])
+            except ValueError:
+                print("--scaling_max_size should be an integer")
+                exit(-1)
+        if "--throughput" in options:
+            try:
+                idx = options.index("--throughput")
+                settings.throughput = int(opts[idx][1])
+            except ValueError:
+                print("--throughput should be an integer")
+                exit(-1)
+            if settings.throughput < 1:
+                print("--throughput should be at least 1")
+                exit(-1)
+        if "--throughput_duration" in options:
+            try:
+                idx = options.index("--throughput_duration")
+                settings.throughput_duration = float(opts[idx][1])
+            except ValueError:
+                print("--throughput_duration should be a number")
+                exit(-1)
+        if "--throughput_max_size" in options:
+            try:
+                idx = options.index("--throughput_max_size")
+                settings.throughput_max_size = int(opts[idx][1])
+            except ValueError:
+                print("--throughput_max_size should be an integer")
+                exit(-1)
+        if "--compare_to" in options:
+            idx = options.index("--compare_to")
+            settings.compare_to = opts[idx][1]
+        if "--regression_threshold" in options:
+            try:
+                idx = options.index("--regression_threshold")
+                settings.regression_threshold = float(opts[idx][1])
+            except ValueError:
+                print("--regression_threshold should be a number")
+                exit(-1)
+            if settings.regression_threshold < 0:
+                print("--regression_threshold should not be negative")
+                exit(-1)
+        if "--regression_alpha" in options:
+            try:
+                idx = options.index("--regression_alpha")
+                settings.regression_alpha = float(opts[idx][1])
+            except ValueError:
+                print("--regression_alpha should be a number")
+                exit(-1)
+            if not 0 < settings.regression_alpha < 1:
+                print("--regression_alpha should be between 0 and 1")
+                exit(-1)
+        if "--plot_processes" in options:
+            try:
+                idx = options.index("--plot_processes")
+                settings.plot_processes = int(opts[idx][1])
+            except ValueError:
+                print("--plot_processes should be an integer")
+                exit(-1)
+            if settings.plot_processes < 1:
+                print("--plot_processes should be at least 1")
+                exit(-1)
+        if "--plot_formats" in options:
+            idx = options.index("--plot_formats")
+            settings.plot_formats = opts[idx][1].split(",")
+            if not set(settings.plot_formats) <= set(PLOT_FORMATS):
+                print(f"--plot_formats should be a list of {', '.join(PLOT_FORMATS)}")
+                exit(-1)
+        if "--plot_variants" in options:
+            idx = options.index("--plot_variants")
+            settings.plot_variants = opts[idx][1].split(",")
+            if not set(settings.plot_variants) <= set(PLOT_VARIANTS):
+                print(f"--plot_variants should be a list of {', '.join(PLOT_VARIANTS)}")
+                exit(-1)
+        if "--replot" in options:
+            idx = options.index("--replot")
+            settings.replot = Path(opts[idx][1])
 
         if settings.plot and not settings.bench and "--bench_dir" not in options:
             print(
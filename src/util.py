@@ -20,6 +20,16 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from functools import cache
+
+
+@cache
+def cpu_info() -> dict:
+    """py-cpuinfo's description of the host CPU, computed once per process."""
+    from cpuinfo import get_cpu_info
+
+    return get_cpu_info()
+
 
 def hex_to_integer(m: str) -> int:
     return int.from_bytes(bytes.fromhex(m), byteorder="little")
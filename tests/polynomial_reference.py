@@ -0,0 +1,710 @@
+# MIT License
+#
+# Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+"""Reference implementations of the polynomials in polynomial.sage without sage.
+
+Field elements are plain integers (gmpy2 integers if gmpy2 is installed) that are
+reduced after every operation. Binary field elements store one bit per byte, so a
+carry-less product is an integer product whose bytes are reduced modulo 2.
+The classes mirror polynomial.sage, so tests/test_polynomial.py can use this module
+in place of the preparsed sage module.
+"""
+
+from abc import abstractmethod
+from math import ceil, comb
+from typing import Callable, TypeVar
+
+try:
+    from gmpy2 import mpz
+except ModuleNotFoundError:
+    mpz = int
+
+T = TypeVar("T")
+K = TypeVar("K")
+Self = TypeVar("Self")
+MSG = TypeVar("M")
+
+
+class FieldElement:
+    __slots__ = ("value", "field")
+
+    def __init__(self, value, field) -> None:
+        self.value = value
+        self.field = field
+
+    def _other(self, other):
+        if isinstance(other, FieldElement):
+            return other.value
+        return self.field(other).value
+
+    def __add__(self, other) -> "FieldElement":
+        return FieldElement(self.field.add(self.value, self._other(other)), self.field)
+
+    __radd__ = __add__
+
+    def __mul__(self, other) -> "FieldElement":
+        return FieldElement(self.field.mul(self.value, self._other(other)), self.field)
+
+    __rmul__ = __mul__
+
+    def __pow__(self, exponent: int) -> "FieldElement":
+        return FieldElement(self.field.pow(self.value, exponent), self.field)
+
+    def __eq__(self, other) -> bool:
+        return self.value == self._other(other)
+
+    def __int__(self) -> int:
+        return self.field.to_integer(self.value)
+
+    def __repr__(self) -> str:
+        return hex(int(self))
+
+
+class BinaryField:
+    _SPREAD = bytes.maketrans(b"01", b"\x00\x01")
+    _PARITY = bytes(0x30 + (i & 1) for i in range(256))
+
+    def __init__(self, fieldsize: int, polynomial: list[int]):
+        self.fieldsize: int = fieldsize
+        self.polynomial: list[int] = polynomial
+        # all values below are in the spread form of from_integer, 8 bits per bit
+        self.shift: int = 8 * fieldsize
+        self.mask: int = (1 << self.shift) - 1
+        # products have up to 2 * fieldsize - 1 coefficients, each below 256
+        self.ones: int = int.from_bytes(b"\x01" * 2 * fieldsize, "big")
+        # x^fieldsize = sum of the other terms, as polynomial.sage builds the modulus
+        self.terms: list[int] = [8 * t for t in set(polynomial) if t != fieldsize]
+        self.F = self
+
+    def __call__(self, value) -> FieldElement:
+        if isinstance(value, FieldElement):
+            return value
+        return self.from_integer(int(value))
+
+    def zero(self) -> FieldElement:
+        return FieldElement(0, self)
+
+    def spread(self, value: int) -> int:
+        if value == 0:
+            return 0
+        return int.from_bytes(
+            format(value, "b").encode().translate(self._SPREAD), "big"
+        )
+
+    def to_integer(self, value: int) -> int:
+        if value == 0:
+            return 0
+        length = (value.bit_length() + 7) // 8
+        return int(value.to_bytes(length, "big").translate(self._PARITY), 2)
+
+    def from_integer(self, value: int) -> FieldElement:
+        return FieldElement(self.reduce(self.spread(value)), self)
+
+    def reduce(self, value: int) -> int:
+        while value >> self.shift:
+            high = value >> self.shift
+            value &= self.mask
+            for term in self.terms:
+                value ^= high << term
+        return value
+
+    def add(self, a: int, b: int) -> int:
+        return a ^ b
+
+    def mul(self, a: int, b: int) -> int:
+        # no coefficient of the integer product reaches 256, so no byte carries
+        return self.reduce(a * b & self.ones)
+
+    def pow(self, a: int, exponent: int) -> int:
+        res = 1
+        while exponent:
+            if exponent & 1:
+                res = self.mul(res, a)
+            a = self.mul(a, a)
+            exponent >>= 1
+        return res
+
+    def parse_key(self, key, keybits, key_transform):
+        if isinstance(key, str):
+            k = hex_to_integer(key)
+        else:
+            k = key
+        if self.fieldsize < keybits:
+            k = k & ((1 << self.fieldsize) - 1)
+        return self.from_integer(key_transform(k))
+
+    def parse_field_elems(self, blocks) -> list:
+        return list(map(lambda x: self.from_integer(hex_to_integer(x)), blocks))
+
+    def tag_as_int(self, tag, tagbits) -> int:
+        return int(tag)
+
+
+class PrimeField:
+    def __init__(self, pi, delta):
+        self.pi = pi
+        self.delta = delta
+        self.p = mpz(2**pi - delta)
+        self.F = self
+
+    def __call__(self, value) -> FieldElement:
+        return FieldElement(mpz(value) % self.p, self)
+
+    def zero(self) -> FieldElement:
+        return FieldElement(mpz(0), self)
+
+    def to_integer(self, value) -> int:
+        return int(value)
+
+    def add(self, a, b):
+        return (a + b) % self.p
+
+    def mul(self, a, b):
+        return a * b % self.p
+
+    def pow(self, a, exponent: int):
+        return pow(a, exponent, self.p)
+
+    def parse_key(self, key, keybits, key_transform):
+        if isinstance(key, str):
+            k = hex_to_integer(key)
+        else:
+            k = key
+        if self.pi < keybits:
+            k = k & ((1 << self.pi) - 1)
+        return self(key_transform(k))
+
+    def parse_field_elems(self, blocks) -> list:
+        return list(map(lambda x: self(hex_to_integer(x)), blocks))
+
+    def tag_as_int(self, tag, tagbits) -> int:
+        return int(tag) % 2**tagbits
+
+
+def vector_add(a: list, b: list) -> list:
+    if len(a) != len(b):
+        raise ValueError("vectors of different length")
+    return [x + y for x, y in zip(a, b)]
+
+
+def dot_product(field, a: list, b: list):
+    if len(a) != len(b):
+        raise ValueError("vectors of different length")
+    res = field.F.zero()
+    for x, y in zip(a, b):
+        res = res + x * y
+    return res
+
+
+def floor_log_ratio(n: int, d: int, base: int) -> int:
+    """floor(log(n / d, base)) for n >= d > 0, without rounding errors."""
+    f = 0
+    while d * base ** (f + 1) <= n:
+        f += 1
+    return f
+
+
+def binomial(n: int, k: int) -> int:
+    if k == 0:
+        return 1
+    return comb(n, k)
+
+
+class TestPolynomial:
+    def __init__(
+        self,
+        field,
+        tagbytes,
+        keybytes,
+        blockbytes,
+        transform,
+        key_transform,
+        hash_transform=None,
+    ):
+        self.field: PrimeField | BinaryField = field
+        self.tagbytes = tagbytes
+        self.keybytes = keybytes
+        self.blockbytes = blockbytes
+        self.transform = transform
+        self.key_transform = key_transform
+        if hash_transform is not None:
+            self.hash_transform: Callable[[Self, T, K, MSG], T] = (
+                self.hash_transform_table[hash_transform]
+            )
+        else:
+            self.hash_transform = self.identity
+        self.tagbits = 8 * tagbytes
+        self.keybits = 8 * keybytes
+        self.blockbits = 8 * blockbytes
+
+    def horner(self, coeffs: list, x):
+        """The polynomial with coefficients coeffs (highest degree first) at x."""
+        res = self.field.F.zero()
+        for c in coeffs:
+            res = res * x + c
+        return res
+
+    def additive_length_encoding(self, tag: T, keys: K, message: MSG) -> T:
+        l = int(ceil(len(message) / 2))
+        l_bytes = l.to_bytes(length=self.blockbytes, byteorder="little").hex()
+        l_elem = self.field.parse_field_elems([l_bytes])
+        res = tag * keys[-2] + l_elem[0] * keys[-1]
+        return res
+
+    def multiplicative_length_encoding(self, tag: T, keys: K, message: MSG) -> T:
+        l = int(ceil(len(message) / 2))
+        l_bytes = l.to_bytes(length=self.blockbytes, byteorder="little").hex()
+        l_elem = self.field.parse_field_elems([l_bytes])
+        res = (tag + keys[-2]) * (l_elem[0] + keys[-1])
+        return res
+
+    def key_reuse_length_encoding(self, tag: T, keys: K, message: MSG) -> T:
+        l = int(ceil(len(message) / 2))
+        l_bytes = l.to_bytes(length=self.blockbytes, byteorder="little").hex()
+        l_elem = self.field.parse_field_elems([l_bytes])
+        res = (tag + keys[-1]) * (l_elem[0] + keys[0])
+        return res
+
+    def simple_key_reuse_length_encoding(self, tag: T, keys: K, message: MSG) -> T:
+        l = int(ceil(len(message) / 2))
+        l_bytes = l.to_bytes(length=self.blockbytes, byteorder="little").hex()
+        l_elem = self.field.parse_field_elems([l_bytes])
+        res = ((tag * keys[0]) + l_elem[0]) * keys[0]
+        return res
+
+    def identity(self, sself, tag: T, keys: K, message: MSG) -> T:
+        return tag
+
+    hash_transform_table: dict[str, Callable[[Self, T, K, MSG], T]] = {
+        "additive_length_encoding": additive_length_encoding,
+        "multiplicative_length_encoding": multiplicative_length_encoding,
+        "key_reuse_length_encoding": key_reuse_length_encoding,
+        "simple_key_reuse_length_encoding": simple_key_reuse_length_encoding,
+    }
+
+    def get_message_blocks(self, message) -> list:
+        blocks = [
+            message[i : i + self.blockbytes * 2]
+            for i in range(0, len(message), self.blockbytes * 2)
+        ]
+        return self.field.parse_field_elems(self.transform(blocks))
+
+    def get_key_blocks(self, key) -> list:
+        return [
+            self.field.parse_key(
+                key[i : i + self.keybytes * 2], self.keybits, self.key_transform
+            )
+            for i in range(0, len(key), self.keybytes * 2)
+        ]
+
+    def eval(self, message, key) -> int:
+        msg_blocks = self.get_message_blocks(message)
+        key_blocks = self.get_key_blocks(key)
+        tag = self.eval_elems(msg_blocks, key_blocks)
+
+        tag = self.hash_transform(self, tag, key_blocks, message)
+        return self.field.tag_as_int(tag, self.tagbits)
+
+    @abstractmethod
+    def eval_elems(self, M, r, outerSB=1):
+        pass
+
+
+class classical_polynomial(TestPolynomial):
+    def eval_elems(self, M, r, outerSB=1):
+        return self.horner(M, r[0])
+
+
+class MMH(TestPolynomial):
+    def eval_elems(self, M, r, outerSB=1):
+        if len(M) == 0:
+            return self.field.F.zero()
+        if len(r) == 1 and len(M) > 2:
+            r = [r[0] ** i for i in range(1, len(M))]
+        coeffs = M[:-1]
+        tag = dot_product(self.field, coeffs, r[: len(coeffs)]) + M[-1]
+        return tag
+
+
+class NMH(TestPolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        if len(r) == 1 and len(M) > 1 and outerSB > 1:
+            powers = [r[0] ** i for i in range(1, outerSB + 1)]
+            r = [None] * outerSB
+            r[::2] = powers[: outerSB // 2]
+            r[1::2] = reversed(powers[outerSB // 2 :])
+        if len(M) % 2 == 0:
+            tag = dot_product(
+                self.field,
+                vector_add(M[::2], r[: len(M) : 2]),
+                vector_add(M[1::2], r[1 : len(M) : 2]),
+            )
+        else:
+            tag = (
+                dot_product(
+                    self.field,
+                    vector_add(M[:-1:2], r[: len(M) - 1 : 2]),
+                    vector_add(M[1:-1:2], r[1 : len(M) - 1 : 2]),
+                )
+                + M[-1]
+            )
+        return tag
+
+
+class SQH(TestPolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        if len(M) == 0:
+            return self.field.F.zero()
+        if len(r) == 1 and len(M) > 2:
+            r = [r[0] ** i for i in range(1, len(M))]
+        v = vector_add(M[:-1], r[: len(M) - 1])
+        tag = dot_product(self.field, v, v) + M[-1]
+        return tag
+
+
+class uSQH(TestPolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        r = r[0]
+
+        def usqh(m):
+            if len(m) == 0:
+                return self.field.F.zero()
+            elif len(m) == 1:
+                return m[0]
+            elif len(m) == 2:
+                return (m[0] + r) ** 2 + m[1]
+            elif len(m) == 3:
+                i = 1 << ((len(m) - 1).bit_length() - 1)
+                return usqh(m[:i]) ** 2 + usqh(m[i:])
+
+        tag = usqh(M)
+        return tag
+
+
+class DCHM(TestPolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        r = r[0]
+        if len(M) % 2 == 0:
+            key_blocks = [r**i for i in range(1, len(M) + 1)]
+            tag = dot_product(
+                self.field,
+                vector_add(M[::2], key_blocks[: len(M) : 2]),
+                vector_add(M[1::2], key_blocks[1 : len(M) : 2]),
+            )
+        else:
+            key_blocks = [r**i for i in range(1, len(M))]
+            tag = (
+                dot_product(
+                    self.field,
+                    vector_add(M[:-1:2], key_blocks[: len(M) - 1 : 2]),
+                    vector_add(M[1:-1:2], key_blocks[1 : len(M) - 1 : 2]),
+                )
+                + M[-1]
+            )
+        return tag
+
+
+class BRW(TestPolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        r = r[0]
+
+        def brw(m):
+            if len(m) == 0:
+                return self.field.F.zero()
+            elif len(m) == 1:
+                return m[0]
+            elif len(m) == 2:
+                return m[0] * r + m[1]
+            elif len(m) == 3:
+                return (r + m[0]) * (r**2 + m[1]) + m[2]
+            else:
+                i = 1 << (len(m).bit_length() - 1)
+                return brw(m[: i - 1]) * (r**i + m[i - 1]) + brw(m[i:])
+
+        tag = brw(M)
+        return tag
+
+
+class HKM(TestPolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        if len(r) == 1 and len(M) // 2 + 1 > 1:
+            r = [r[0] ** i for i in range(1, len(M) // 2 + 2)]
+
+        def hkm(m, r):
+            if len(m) == 0:
+                return self.field.F.zero()
+            if len(m) == 1:
+                return r[0] + m[0]
+            if len(m) == 2:
+                return (r[0] + m[0]) * (r[1] + m[1])
+            p = len(m) // 2
+            if len(m) % 2 == 1:
+                return m[2 * p] + (r[p] + m[2 * p - 1]) * hkm(m[: 2 * p - 1], r[:p])
+            else:
+                return (r[p] + m[2 * p - 1]) * hkm(m[: 2 * p - 1], r[:p])
+
+        tag = hkm(M, r)
+        return tag
+
+
+class TestTreePolynomial(TestPolynomial):
+    def __init__(
+        self,
+        inner_polynomial: TestPolynomial,
+        superblocksize: int,
+        superkeysize: int,
+        *args,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.inner: TestPolynomial = inner_polynomial
+        self.superblocksize: int = superblocksize
+        self.superkeysize: int = superkeysize
+
+
+class tHorner(TestTreePolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        B: int = self.superblocksize
+        b: int = self.superkeysize
+
+        def thorner(m, r):
+            n = len(m)
+            if n == 0:
+                return self.field.F.zero()
+            if n <= B:
+                return self.inner.eval_elems(m, r[:b], outerSB=self.superblocksize)
+            else:
+                i = B * ((len(m) - 1) // B)
+                return thorner(m[:i], r) * r[0] ** B + thorner(m[i:], r)
+
+        return thorner(M, r)
+
+
+class tMMH(TestTreePolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        B: int = self.superblocksize
+        b: int = self.superkeysize
+
+        def tmmh(m, r):
+            n = len(m)
+            if n == 0:
+                return self.field.F.zero()
+            if n <= B:
+                return self.inner.eval_elems(m, r[:b], outerSB=self.superblocksize)
+            else:
+                f = floor_log_ratio(len(m) - 1, B, 2)
+                i = B * 2**f
+                v = b + f
+                return tmmh(m[:i], r[:v]) * r[v] + tmmh(m[i:], r[:v])
+
+        return tmmh(M, r)
+
+
+class tSQH(TestTreePolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        B: int = self.superblocksize
+        b: int = self.superkeysize
+
+        def tsqh(m, r):
+            n = len(m)
+            if n == 0:
+                return self.field.F.zero()
+            if n <= B:
+                return self.inner.eval_elems(m, r[:b], outerSB=self.superblocksize)
+            else:
+                f = floor_log_ratio(len(m) - 1, B, 2)
+                i = B * 2**f
+                v = b + f
+                return (tsqh(m[:i], r[:v]) + r[v]) ** 2 + tsqh(m[i:], r[:v])
+
+        return tsqh(M, r)
+
+
+class tNMH(TestTreePolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        B: int = self.superblocksize
+        b: int = self.superkeysize
+
+        def tnmh(m, r):
+            n = len(m)
+            if n == 0:
+                return self.field.F.zero()
+            if n <= B:
+                return self.inner.eval_elems(m, r[:b], outerSB=self.superblocksize)
+            else:
+                f = floor_log_ratio(len(m) - 1, B, 3)
+                i = B * 3**f
+                v = b + 2 * f
+                return (tnmh(m[:i], r[:v]) + r[v]) * (
+                    tnmh(m[i : 2 * i], r[:v]) + r[v + 1]
+                ) + tnmh(m[2 * i :], r[:v])
+
+        return tnmh(M, r)
+
+
+class tHKM(TestTreePolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        B: int = self.superblocksize
+        b: int = self.superkeysize
+
+        def thkm(m, r):
+            n = len(m)
+            if n == 0:
+                return self.field.F.zero()
+            if n <= B:
+                return self.inner.eval_elems(m, r[:b], outerSB=self.superblocksize)
+            else:
+                f = floor_log_ratio(len(m) - 1, B, 3)
+                i = B * 3**f
+                v = b + f
+                return thkm(m[:i], r[:v]) * (thkm(m[i : 2 * i], r[:v]) + r[v]) + thkm(
+                    m[2 * i :], r[:v]
+                )
+
+        return thkm(M, r)
+
+
+class tBRW(TestTreePolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        B: int = self.superblocksize
+        b: int = self.superkeysize
+
+        def tbrw(m, r):
+            n = len(m)
+            if n == 0:
+                return self.field.F.zero()
+            if n <= B:
+                return self.inner.eval_elems(m, r[:b])
+            else:
+                f = floor_log_ratio(len(m), B + 1, 2)
+                i = (B + 1) * 2**f
+                v = b + f
+                return tbrw(m[: i - 1], r[:v]) * (r[v] + m[i - 1]) + tbrw(m[i:], r[:v])
+
+        return tbrw(M, r)
+
+
+class MHP(TestTreePolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        B: int = self.superblocksize
+        b: int = self.superkeysize
+        if b == 0:
+            b = 1
+            r = [r[0]] + r
+
+        def mhp(m, r):
+            n = len(m)
+            if n == 0:
+                return self.field.F.zero()
+            if n <= B:
+                return self.inner.eval_elems(m, r[:b], outerSB=self.superblocksize)
+            else:
+                v = len(r)
+                l = -(-n // B)
+                x = 0
+                i = 0
+                while x < l:
+                    idx = x
+                    x = binomial(v - b + i - 1, v - b)
+                    i += 1
+                idx *= B
+            return r[-1] * mhp(m[:idx], r) + mhp(m[idx:], r[:-1])
+
+        return mhp(M, r)
+
+
+class d2LHP(TestTreePolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        B: int = self.superblocksize
+        b: int = self.superkeysize
+        if b == 0:
+            b = 1
+            r = [r[0]] + r
+        if len(M) == 0:
+            return self.field.F.zero()
+        ms = [
+            M[i : i + self.superblocksize]
+            for i in range(0, len(M), self.superblocksize)
+        ]
+        if len(ms[-1]) < self.superblocksize:
+            lastBlocks = ms[-1]
+            ms = ms[:-1]
+        else:
+            lastBlocks = []
+        blocks = list(
+            map(
+                lambda x: self.inner.eval_elems(x, r, outerSB=self.superblocksize),
+                ms,
+            )
+        )
+        deg = 2 ** B.bit_length() - 1
+        V = self.horner(blocks, r[0] ** (deg + 1))
+        return self.horner([V] + lastBlocks, r[0])
+
+
+class v1NMH_HORNER(TestTreePolynomial):
+    def eval_elems(self, M, r, outerSB=1) -> int:
+        B: int = self.superblocksize
+        r = r[0]
+
+        def v1NMH(m):
+            if len(m) % 2 == 0:
+                key_blocks = [r**i for i in range(1, len(m) + 1)]
+                tag = dot_product(
+                    self.field,
+                    vector_add(m[::2], key_blocks[: len(m) : 2]),
+                    vector_add(m[1::2], key_blocks[1 : len(m) : 2]),
+                )
+            else:
+                key_blocks = [r**i for i in range(1, len(m))]
+                tag = (
+                    dot_product(
+                        self.field,
+                        vector_add(m[:-1:2], key_blocks[: len(m) - 1 : 2]),
+                        vector_add(m[1:-1:2], key_blocks[1 : len(m) - 1 : 2]),
+                    )
+                    + m[-1]
+                )
+            return tag
+
+        def two_level(m):
+            n = len(m)
+            if n == 0:
+                return self.field.F.zero()
+            if n <= B:
+                return v1NMH(m)
+            else:
+                k = r**B
+                idx = -(-n // B) - 1
+                idx *= B
+                return two_level(m[:idx]) * k + two_level(m[idx:])
+
+        return two_level(M)
+
+
+def hex_to_integer(m):
+    return int.from_bytes(bytes.fromhex(m), byteorder="little")
+
+
+def integer_to_hex(n, bytes):
+    return int(n).to_bytes(bytes, byteorder="little").hex()
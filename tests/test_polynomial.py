@@ -22,26 +22,64 @@
 # SOFTWARE.
 
 from abc import abstractmethod
+from contextlib import contextmanager
+from functools import cache
+from itertools import islice
 from math import ceil
 from typing import Optional
 from typing_extensions import override
 import unittest
 import pathlib
 import ctypes
+import errno
+import os
+import multiprocessing
 import random
 import importlib.util
+import subprocess
+from src.hash_library import HashLibrary
 from tests.transform import MessageTransform, KeyTransform, identity
 
-try:
-    import sage
+SAGE_SOURCE = pathlib.Path("tests/polynomial.sage")
+SAGE_PREPARSED = pathlib.Path("tests/polynomial.sage.py")
 
+
+@cache
+def reference_module():
+    """Returns the module with the reference implementations of the polynomials.
+
+    With sage, polynomial.sage is only preparsed again if it is newer than the
+    preparsed file. Without sage, the pure Python implementations are used.
+    """
+    try:
+        import sage
+    except ModuleNotFoundError:
+        import tests.polynomial_reference as mod
+
+        return mod
+    if (
+        not SAGE_PREPARSED.exists()
+        or SAGE_PREPARSED.stat().st_mtime < SAGE_SOURCE.stat().st_mtime
+    ):
+        subprocess.run(["sage", "--preparse", str(SAGE_SOURCE)], check=True)
     spec = importlib.util.spec_from_file_location(
-        name="polynomial", location="tests/polynomial.sage.py"
+        name="polynomial", location=SAGE_PREPARSED
     )
     mod = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(mod)
-except ModuleNotFoundError:
-    pass
+    return mod
+
+
+# number of cases whose expected tags are evaluated together
+CASE_BATCH_SIZE = 4096
+
+# the hash function evaluated by the worker processes of Polynomial._testPool
+_pool_hash_fun = None
+
+
+def _eval_expected(arg: tuple[str, str]) -> int:
+    message_hex, key_hex = arg
+    return int(_pool_hash_fun.eval(message_hex, key_hex))
 
 
 class Polynomial(unittest.TestCase):
@@ -65,6 +103,7 @@ class Polynomial(unittest.TestCase):
         numKeys=1,
         le_extra_key=0,
         le_min_key=0,
+        processes=1,
     ) -> None:
         super().__init__(name)
         self.blocksize: int = blocksize
@@ -84,16 +123,19 @@ class Polynomial(unittest.TestCase):
         self.numKeys = numKeys
         self.le_extra_key: int = le_extra_key
         self.le_min_key: int = le_min_key
+        self.processes: int = processes
+        self._pool: Optional[multiprocessing.pool.Pool] = None
 
     @abstractmethod
     def getField(self):
         pass
 
     def setUp(self) -> None:
-        self.lib = ctypes.CDLL(self.libname)
+        self.lib = ctypes.CDLL(self.libname, use_errno=True)
+        self.hash_lib = HashLibrary(self.libname.stem, bindir=self.libname.parent)
 
     def test_classical_polynomial(self) -> None:
-        hash = mod.classical_polynomial(
+        hash = reference_module().classical_polynomial(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -105,7 +147,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=False)
 
     def test_DCHM(self) -> None:
-        hash = mod.DCHM(
+        hash = reference_module().DCHM(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -117,7 +159,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=False)
 
     def test_v1NMH_HORNER(self) -> None:
-        inner = mod.__getattribute__(self.innerpoly)(
+        inner = getattr(reference_module(), self.innerpoly)(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -126,7 +168,7 @@ class Polynomial(unittest.TestCase):
             key_transform=self.key_transform,
             hash_transform=self.hash_transform,
         )
-        hash = mod.v1NMH_HORNER(
+        hash = reference_module().v1NMH_HORNER(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -141,7 +183,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=False)
 
     def test_BRW(self) -> None:
-        hash = mod.BRW(
+        hash = reference_module().BRW(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -153,7 +195,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=False)
 
     def test_uSQH(self) -> None:
-        hash = mod.uSQH(
+        hash = reference_module().uSQH(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -165,7 +207,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=False)
 
     def test_MMH(self) -> None:
-        hash = mod.MMH(
+        hash = reference_module().MMH(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -177,7 +219,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=False)
 
     def test_MMH_KG(self) -> None:
-        hash = mod.MMH(
+        hash = reference_module().MMH(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -189,7 +231,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=True)
 
     def test_NMH(self) -> None:
-        hash = mod.NMH(
+        hash = reference_module().NMH(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -201,7 +243,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=False)
 
     def test_NMH_KG(self) -> None:
-        hash = mod.NMH(
+        hash = reference_module().NMH(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -213,7 +255,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=True)
 
     def test_SQH(self) -> None:
-        hash = mod.SQH(
+        hash = reference_module().SQH(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -225,7 +267,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=False)
 
     def test_SQH_KG(self) -> None:
-        hash = mod.SQH(
+        hash = reference_module().SQH(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -237,7 +279,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=True)
 
     def test_HKM(self) -> None:
-        hash = mod.HKM(
+        hash = reference_module().HKM(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -249,7 +291,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=False)
 
     def test_HKM_KG(self) -> None:
-        hash = mod.HKM(
+        hash = reference_module().HKM(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -261,7 +303,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=True)
 
     def test_tHorner(self) -> None:
-        inner = mod.__getattribute__(self.innerpoly)(
+        inner = getattr(reference_module(), self.innerpoly)(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -270,7 +312,7 @@ class Polynomial(unittest.TestCase):
             key_transform=self.key_transform,
             hash_transform=self.hash_transform,
         )
-        hash = mod.tHorner(
+        hash = reference_module().tHorner(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -285,7 +327,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=False)
 
     def test_tMMH(self) -> None:
-        inner = mod.__getattribute__(self.innerpoly)(
+        inner = getattr(reference_module(), self.innerpoly)(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -294,7 +336,7 @@ class Polynomial(unittest.TestCase):
             key_transform=self.key_transform,
             hash_transform=self.hash_transform,
         )
-        hash = mod.tMMH(
+        hash = reference_module().tMMH(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -309,7 +351,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=True)
 
     def test_tSQH(self) -> None:
-        inner = mod.__getattribute__(self.innerpoly)(
+        inner = getattr(reference_module(), self.innerpoly)(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -318,7 +360,7 @@ class Polynomial(unittest.TestCase):
             key_transform=self.key_transform,
             hash_transform=self.hash_transform,
         )
-        hash = mod.tSQH(
+        hash = reference_module().tSQH(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -333,7 +375,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=True)
 
     def test_tNMH(self) -> None:
-        inner = mod.__getattribute__(self.innerpoly)(
+        inner = getattr(reference_module(), self.innerpoly)(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -342,7 +384,7 @@ class Polynomial(unittest.TestCase):
             key_transform=self.key_transform,
             hash_transform=self.hash_transform,
         )
-        hash = mod.tNMH(
+        hash = reference_module().tNMH(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -357,7 +399,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=True)
 
     def test_tHKM(self) -> None:
-        inner = mod.__getattribute__(self.innerpoly)(
+        inner = getattr(reference_module(), self.innerpoly)(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -366,7 +408,7 @@ class Polynomial(unittest.TestCase):
             key_transform=self.key_transform,
             hash_transform=self.hash_transform,
         )
-        hash = mod.tHKM(
+        hash = reference_module().tHKM(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -381,7 +423,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=True)
 
     def test_tBRW(self) -> None:
-        inner = mod.__getattribute__(self.innerpoly)(
+        inner = getattr(reference_module(), self.innerpoly)(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -390,7 +432,7 @@ class Polynomial(unittest.TestCase):
             key_transform=self.key_transform,
             hash_transform=self.hash_transform,
         )
-        hash = mod.tBRW(
+        hash = reference_module().tBRW(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -405,7 +447,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=True)
 
     def test_MHP(self) -> None:
-        inner = mod.__getattribute__(self.innerpoly)(
+        inner = getattr(reference_module(), self.innerpoly)(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -415,7 +457,7 @@ class Polynomial(unittest.TestCase):
             hash_transform=self.hash_transform,
         )
         superkeysize = self.superkeysize // self.keysize
-        hash = mod.MHP(
+        hash = reference_module().MHP(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -435,7 +477,7 @@ class Polynomial(unittest.TestCase):
         self._runTestBattery(hash, keyGen=False, numKeys=numKeys)
 
     def test_d2LHP(self) -> None:
-        inner = mod.__getattribute__(self.innerpoly)(
+        inner = getattr(reference_module(), self.innerpoly)(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -445,7 +487,7 @@ class Polynomial(unittest.TestCase):
             hash_transform=self.hash_transform,
         )
         superkeysize = self.superkeysize // self.keysize
-        hash = mod.d2LHP(
+        hash = reference_module().d2LHP(
             field=self.getField(),
             tagbytes=self.tagsize,
             keybytes=self.keysize,
@@ -508,18 +550,11 @@ class Polynomial(unittest.TestCase):
             message = bytes.fromhex(message_str)
         return message
 
-    def _runOnce(self, hash_fun, message, messagesize, key_bytes, keylength) -> None:
+    def _checkTag(
+        self, expected: bytes, message, messagesize, key_bytes, keylength
+    ) -> None:
         maxPrintSize: int = 128
-        res = hash_fun.eval(message.hex(), key_bytes.hex())
-        tag_l = [0] * self.tagsize
-        tag = (ctypes.c_uint8 * len(tag_l))(*tag_l)
-        self.lib.hash(
-            ctypes.pointer(tag),
-            (ctypes.c_uint8 * len(message))(*message),
-            len(message),
-            (ctypes.c_uint8 * len(key_bytes))(*key_bytes),
-            len(key_bytes),
-        )
+        tag = self.hash_lib.hash(key_bytes, message)
         pretty_message = (
             message.hex()[: (maxPrintSize // 2 - 1) * 2]
             + ".." * (2 + maxPrintSize % 2)
@@ -535,61 +570,115 @@ class Polynomial(unittest.TestCase):
             else key_bytes.hex()
         )
         self.assertEqual(
-            bytes(tag).hex(),
-            int(res).to_bytes(self.tagsize, byteorder="little").hex(),
-            f'expected {int(res).to_bytes(self.tagsize, byteorder="little").hex()}\n'
+            tag.hex(),
+            expected.hex(),
+            f"expected {expected.hex()}\n"
             + f"\nkey:\t\t\t{pretty_key}\nmessage:\t{pretty_message}",
         )
 
-    def _runOneMessageRange(
+    @contextmanager
+    def _testPool(self, hash_fun):
+        """Worker processes evaluating hash_fun for _expectedTags.
+
+        The workers are forked, so they inherit sage and hash_fun instead of
+        loading them for every evaluation.
+        """
+        global _pool_hash_fun
+        _pool_hash_fun = hash_fun
+        if self.processes > 1:
+            self._pool = multiprocessing.get_context("fork").Pool(self.processes)
+        try:
+            yield
+        finally:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool = None
+            _pool_hash_fun = None
+
+    def _expectedTags(self, hash_fun, inputs: list[tuple[bytes, bytes]]) -> list[bytes]:
+        """Evaluates hash_fun on (message, key) pairs, in the test pool if there is one."""
+        args = [(message.hex(), key_bytes.hex()) for message, key_bytes in inputs]
+        if self._pool is None:
+            results = [int(hash_fun.eval(*arg)) for arg in args]
+        else:
+            chunksize = max(1, len(args) // (4 * self.processes))
+            results = self._pool.map(_eval_expected, args, chunksize=chunksize)
+        return [res.to_bytes(self.tagsize, byteorder="little") for res in results]
+
+    def _cases(
         self,
-        hash_fun,
-        maxMessageSize,
-        keyGen: bool = False,
-        numKeys=1,
-    ) -> None:
-        for messagesize in range(0, maxMessageSize, self.stepsize):
+        messagesizes,
+        getMessage,
+        getKey,
+        keyGen: bool,
+        numKeys,
+        keyPerSize: bool = False,
+    ):
+        """Yields numtests (messagesize, iteration, message, key, keylength) per size.
+
+        With keyPerSize, the numtests messages of a size share one key.
+        """
+        for messagesize in messagesizes:
             for it in range(self.numtests):
-                with self.subTest(
-                    messagesize=messagesize,
-                    iteration=it,
-                    msg="One element Message, Random Key",
-                ):
-                    message = self._getOneMessage(messagesize=messagesize)
-                    key_bytes, keylength = self._getRandomKey(
+                message = getMessage(messagesize=messagesize)
+                if it == 0 or not keyPerSize:
+                    key_bytes, keylength = getKey(
                         message, keyGen=keyGen, numKeys=numKeys
                     )
-                    self._runOnce(
-                        hash_fun,
+                yield messagesize, it, message, key_bytes, keylength
+
+    def _runCases(self, hash_fun, cases, msg: str, checks=()) -> None:
+        """Checks the tags of cases against hash_fun, a subtest per case.
+
+        The expected tags are evaluated in batches, so that the test pool is kept
+        busy without holding all messages in memory. Each of checks is called with
+        every batch and its expected tags, to check other ways of hashing the cases.
+        """
+        while batch := list(islice(cases, CASE_BATCH_SIZE)):
+            expected = self._expectedTags(
+                hash_fun, [(case[2], case[3]) for case in batch]
+            )
+            for check in checks:
+                check(batch, expected)
+            for (messagesize, it, message, key_bytes, keylength), tag in zip(
+                batch, expected
+            ):
+                with self.subTest(messagesize=messagesize, iteration=it, msg=msg):
+                    self._checkTag(
+                        tag,
                         message=message,
                         messagesize=messagesize,
                         key_bytes=key_bytes,
                         keylength=keylength,
                     )
 
+    def _runOneMessageRange(
+        self,
+        hash_fun,
+        maxMessageSize,
+        keyGen: bool = False,
+        numKeys=1,
+    ) -> None:
+        cases = self._cases(
+            range(0, maxMessageSize, self.stepsize),
+            self._getOneMessage,
+            self._getRandomKey,
+            keyGen=keyGen,
+            numKeys=numKeys,
+        )
+        self._runCases(hash_fun, cases, msg="One element Message, Random Key")
+
     def _runOneKeyRange(
         self, hash_fun, maxMessageSize, keyGen: bool = False, numKeys=1
     ) -> None:
-        for messagesize in range(0, maxMessageSize, self.stepsize):
-            for it in range(self.numtests):
-                with self.subTest(
-                    messagesize=messagesize,
-                    iteration=it,
-                    msg="Random Message, One element Key",
-                ):
-                    message = self._getRandomMessage(messagesize=messagesize)
-                    key_bytes, keylength = self._getOneKey(
-                        message,
-                        keyGen=keyGen,
-                        numKeys=numKeys,
-                    )
-                    self._runOnce(
-                        hash_fun,
-                        message=message,
-                        messagesize=messagesize,
-                        key_bytes=key_bytes,
-                        keylength=keylength,
-                    )
+        cases = self._cases(
+            range(0, maxMessageSize, self.stepsize),
+            self._getRandomMessage,
+            self._getOneKey,
+            keyGen=keyGen,
+            numKeys=numKeys,
+        )
+        self._runCases(hash_fun, cases, msg="Random Message, One element Key")
 
     def _runOneKeyOneMessageRange(
         self,
@@ -598,26 +687,14 @@ class Polynomial(unittest.TestCase):
         keyGen: bool = False,
         numKeys=1,
     ) -> None:
-        for messagesize in range(0, maxMessageSize, self.stepsize):
-            for it in range(self.numtests):
-                with self.subTest(
-                    messagesize=messagesize,
-                    iteration=it,
-                    msg="One Element Message and Key",
-                ):
-                    message = self._getOneMessage(messagesize=messagesize)
-                    key_bytes, keylength = self._getOneKey(
-                        message,
-                        keyGen=keyGen,
-                        numKeys=numKeys,
-                    )
-                    self._runOnce(
-                        hash_fun,
-                        message=message,
-                        messagesize=messagesize,
-                        key_bytes=key_bytes,
-                        keylength=keylength,
-                    )
+        cases = self._cases(
+            range(0, maxMessageSize, self.stepsize),
+            self._getOneMessage,
+            self._getOneKey,
+            keyGen=keyGen,
+            numKeys=numKeys,
+        )
+        self._runCases(hash_fun, cases, msg="One Element Message and Key")
 
     def _runFuzzRange(
         self,
@@ -626,24 +703,23 @@ class Polynomial(unittest.TestCase):
         keyGen: bool = False,
         numKeys=1,
     ) -> None:
-        for messagesize in range(0, maxMessageSize, self.stepsize):
-            for it in range(self.numtests):
-                with self.subTest(
-                    messagesize=messagesize, iteration=it, msg="Random Message"
-                ):
-                    message = self._getRandomMessage(messagesize=messagesize)
-                    key_bytes, keylength = self._getRandomKey(
-                        message,
-                        keyGen=keyGen,
-                        numKeys=numKeys,
-                    )
-                    self._runOnce(
-                        hash_fun,
-                        message=message,
-                        messagesize=messagesize,
-                        key_bytes=key_bytes,
-                        keylength=keylength,
-                    )
+        """Checks random messages with hash, hash_many and the streaming functions.
+
+        The messages of a size share a key, so that they are hashed in one batch.
+        """
+        checks = [self._checkMany]
+        with self.subTest(msg="Streamed Message"):
+            if self._streamAvailable(keyGen=keyGen, numKeys=numKeys):
+                checks.append(self._checkStream)
+        cases = self._cases(
+            range(0, maxMessageSize, self.stepsize),
+            self._getRandomMessage,
+            self._getRandomKey,
+            keyGen=keyGen,
+            numKeys=numKeys,
+            keyPerSize=True,
+        )
+        self._runCases(hash_fun, cases, msg="Random Message", checks=checks)
 
     def _runFuzzLarge(
         self,
@@ -651,60 +727,194 @@ class Polynomial(unittest.TestCase):
         keyGen: bool = False,
         numKeys=1,
     ) -> None:
-        for messagesize in [2**13]:
-            for it in range(self.numtests):
+        cases = self._cases(
+            [2**13],
+            self._getRandomMessage,
+            self._getRandomKey,
+            keyGen=keyGen,
+            numKeys=numKeys,
+        )
+        self._runCases(hash_fun, cases, msg="Large Random Message")
+
+    def _checkMany(self, batch, expected: list[bytes]) -> None:
+        """Hashes the cases of a batch that share a key with one hash_many call."""
+        groups: dict[bytes, list[tuple[tuple, bytes]]] = {}
+        for case, res in zip(batch, expected):
+            groups.setdefault(case[3], []).append((case, res))
+        for key_bytes, group in groups.items():
+            tags = self.hash_lib.hash_many(key_bytes, [case[2] for case, _ in group])
+            for tag, ((messagesize, it, *_), res) in zip(tags, group):
                 with self.subTest(
-                    messagesize=messagesize, iteration=it, msg="Large Random Message"
+                    messagesize=messagesize, iteration=it, msg="Batched Messages"
                 ):
-                    message = self._getRandomMessage(messagesize=messagesize)
-                    key_bytes, keylength = self._getRandomKey(
-                        message,
-                        keyGen=keyGen,
-                        numKeys=numKeys,
+                    self.assertEqual(
+                        tag.hex(),
+                        res.hex(),
+                        f"key:\t\t\t{key_bytes.hex()}",
                     )
-                    self._runOnce(
-                        hash_fun,
-                        message=message,
-                        messagesize=messagesize,
-                        key_bytes=key_bytes,
-                        keylength=keylength,
+
+    def _runParallel(
+        self,
+        maxMessageSize,
+        keyGen: bool = False,
+        numKeys=1,
+    ) -> None:
+        messages = [
+            self._getRandomMessage(messagesize=messagesize)
+            for messagesize in range(0, maxMessageSize, self.stepsize)
+        ]
+        key_bytes, keylength = self._getRandomKey(
+            messages[-1],
+            keyGen=keyGen,
+            numKeys=numKeys,
+        )
+        expected = self.hash_lib.hash_many(key_bytes, messages)
+        for processes in (False, True):
+            with self.subTest(processes=processes, msg="Parallel Messages"):
+                tags = self.hash_lib.hash_parallel(
+                    key_bytes, messages, workers=2, processes=processes, chunksize=3
+                )
+                self.assertEqual(
+                    [tag.hex() for tag in tags],
+                    [tag.hex() for tag in expected],
+                    f"key:\t\t\t{key_bytes.hex()}",
+                )
+
+    def _runShortKey(self, maxMessageSize, keyGen: bool = False, numKeys=1) -> None:
+        message = self._getRandomMessage(messagesize=maxMessageSize - 1)
+        key_bytes, keylength = self._getRandomKey(
+            message,
+            keyGen=keyGen,
+            numKeys=numKeys,
+        )
+        with self.subTest(msg="Short Key"):
+            self.assertEqual(self.hash_lib.keylength(len(message)), keylength)
+            with self.assertRaises(ValueError):
+                self.hash_lib.hash(key_bytes[:-1], message)
+            with self.assertRaises(ValueError):
+                self.hash_lib.hash_many(key_bytes[:-1], [bytes(), message])
+
+    def _runThreaded(self, keyGen: bool = False, numKeys=1) -> None:
+        # large enough to be split into several windows of superblocks
+        if self.superblocksize is None or not self.hash_lib.set_threads(3):
+            return
+        for messagesize in (
+            self.superblocksize * 100 + 1,
+            self.superblocksize * 3100 + self.blocksize,
+        ):
+            with self.subTest(messagesize=messagesize, msg="Threaded Message"):
+                message = self._getRandomMessage(messagesize=messagesize)
+                key_bytes, keylength = self._getRandomKey(
+                    message,
+                    keyGen=keyGen,
+                    numKeys=numKeys,
+                )
+                self.hash_lib.set_threads(3)
+                tag = self.hash_lib.hash(key_bytes, message)
+                self.hash_lib.set_threads(1)
+                self.assertEqual(
+                    tag.hex(),
+                    self.hash_lib.hash(key_bytes, message).hex(),
+                    f"key:\t\t\t{key_bytes.hex()}",
+                )
+
+    def _streamAvailable(self, keyGen: bool = False, numKeys=1) -> bool:
+        """Returns whether the polynomial has a streaming form.
+
+        hash_init only fails with ENOSYS for polynomials without one, any other
+        failure is an error. Without one, the current subtest is skipped.
+        """
+        self.lib.hash_init.restype = ctypes.c_void_p
+        key_bytes, _ = self._getRandomKey(bytes(), keyGen=keyGen, numKeys=numKeys)
+        key = (ctypes.c_uint8 * len(key_bytes))(*key_bytes)
+        ctypes.set_errno(0)
+        state = self.lib.hash_init(key, ctypes.c_ulonglong(len(key_bytes)))
+        if state is None:
+            if ctypes.get_errno() == errno.ENOSYS:
+                self.skipTest("the polynomial has no streaming form")
+            self.fail(f"hash_init failed: {os.strerror(ctypes.get_errno())}")
+        tag = (ctypes.c_uint8 * self.tagsize)()
+        self.lib.hash_final(ctypes.c_void_p(state), tag)
+        return True
+
+    def _checkStream(self, batch, expected: list[bytes]) -> None:
+        """Hashes each case of a batch in random pieces with the streaming functions."""
+        for (messagesize, it, message, key_bytes, _), res in zip(batch, expected):
+            with self.subTest(
+                messagesize=messagesize, iteration=it, msg="Streamed Message"
+            ):
+                key = (ctypes.c_uint8 * len(key_bytes))(*key_bytes)
+                state = ctypes.c_void_p(
+                    self.lib.hash_init(key, ctypes.c_ulonglong(len(key_bytes)))
+                )
+                self.assertIsNotNone(state.value, "hash_init failed")
+                start = 0
+                while start < len(message):
+                    end = min(
+                        len(message),
+                        start + random.randint(1, 3 * self.blocksize),
                     )
+                    self.lib.hash_update(
+                        state,
+                        message[start:end],
+                        ctypes.c_ulonglong(end - start),
+                    )
+                    start = end
+                tag = (ctypes.c_uint8 * self.tagsize)()
+                self.lib.hash_final(state, tag)
+                self.assertEqual(
+                    bytes(tag).hex(),
+                    res.hex(),
+                    f"key:\t\t\t{key_bytes.hex()}\nmessage:\t{message.hex()}",
+                )
 
     def _runTestBattery(self, hash_fun, keyGen: bool = False, numKeys=1) -> None:
-        if self.superblocksize is None:
-            maxMessageSize: int = self.blocksize * 16 + 1
-        else:
-            maxMessageSize: int = self.superblocksize * 16 + 1
-        if self.debug:
-            self._runOneKeyOneMessageRange(
+        with self._testPool(hash_fun):
+            if self.superblocksize is None:
+                maxMessageSize: int = self.blocksize * 16 + 1
+            else:
+                maxMessageSize: int = self.superblocksize * 16 + 1
+            if self.debug:
+                self._runOneKeyOneMessageRange(
+                    hash_fun,
+                    maxMessageSize=maxMessageSize,
+                    keyGen=keyGen,
+                    numKeys=numKeys,
+                )
+                self._runOneMessageRange(
+                    hash_fun,
+                    maxMessageSize=maxMessageSize,
+                    keyGen=keyGen,
+                    numKeys=numKeys,
+                )
+                self._runOneKeyRange(
+                    hash_fun,
+                    maxMessageSize=maxMessageSize,
+                    keyGen=keyGen,
+                    numKeys=numKeys,
+                )
+            self._runFuzzRange(
                 hash_fun,
                 maxMessageSize=maxMessageSize,
                 keyGen=keyGen,
                 numKeys=numKeys,
             )
-            self._runOneMessageRange(
+            self._runFuzzLarge(
                 hash_fun,
+                keyGen=keyGen,
+                numKeys=numKeys,
+            )
+            self._runParallel(
                 maxMessageSize=maxMessageSize,
                 keyGen=keyGen,
                 numKeys=numKeys,
             )
-            self._runOneKeyRange(
-                hash_fun,
+            self._runShortKey(
                 maxMessageSize=maxMessageSize,
                 keyGen=keyGen,
                 numKeys=numKeys,
             )
-        self._runFuzzRange(
-            hash_fun,
-            maxMessageSize=maxMessageSize,
-            keyGen=keyGen,
-            numKeys=numKeys,
-        )
-        self._runFuzzLarge(
-            hash_fun,
-            keyGen=keyGen,
-            numKeys=numKeys,
-        )
+            self._runThreaded(keyGen=keyGen, numKeys=numKeys)
 
 
 class PfPolynomial(Polynomial):
@@ -722,7 +932,7 @@ class PfPolynomial(Polynomial):
 
     @override
     def getField(self):
-        return mod.PrimeField(
+        return reference_module().PrimeField(
             pi=self.pi,
             delta=self.delta,
         )
@@ -769,7 +979,7 @@ class BfPolynomial(Polynomial):
 
     @override
     def getField(self):
-        return mod.BinaryField(
+        return reference_module().BinaryField(
             fieldsize=self.fieldsize,
             polynomial=self.polynomial,
         )
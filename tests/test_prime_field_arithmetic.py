@@ -28,6 +28,8 @@ import unittest
 from functools import reduce
 from math import ceil, log2
 
+import numpy as np
+
 
 def cumsum(arr):
     return reduce((lambda x, y: x + [x[-1] + y]), arr, [0])
@@ -48,6 +50,7 @@ class TestArith(unittest.TestCase):
         primename=None,
         blocksize=16,
         keysize=16,
+        batch_size=4096,
     ):
         super(TestArith, self).__init__(name)
         self.binname = binname
@@ -59,6 +62,8 @@ class TestArith(unittest.TestCase):
         self.iterations = iterations
         self.blocksize = blocksize
         self.keysize = keysize
+        # operands per call to the *_batch functions, 0 calls the library per operand
+        self.batch_size = batch_size
         if wordsize == 64:
             self.base_int = ctypes.c_uint64
 
@@ -84,6 +89,9 @@ class TestArith(unittest.TestCase):
             self.from_long_int = from_long_int64
             self.Field_Elem = Field_Elem64
             self.DField_Elem = DField_Elem64
+            self.np_base_int = np.uint64
+            # uint128 limbs as (lower, upper) pairs
+            self.dfield_shape = (len(limbsizes), 2)
         else:
             self.base_int = ctypes.c_uint32
             self.long_int = ctypes.c_uint64
@@ -104,6 +112,8 @@ class TestArith(unittest.TestCase):
             self.from_long_int = from_long_int32
             self.Field_Elem = Field_Elem32
             self.DField_Elem = DField_Elem32
+            self.np_base_int = np.uint32
+            self.dfield_shape = (len(limbsizes),)
 
         self.libname = pathlib.Path().absolute() / "bin" / f"{binname}_arithmetic.so"
         # if primetype == "0":
@@ -173,7 +183,251 @@ class TestArith(unittest.TestCase):
             res += a * 2 ** (self.wordsize * i)
         return res
 
+    def batches(self):
+        for start in range(0, self.iterations, self.batch_size):
+            yield min(self.batch_size, self.iterations - start)
+
+    def call_batch(self, fname, res, *operands, words=None):
+        args = [x.ctypes.data_as(ctypes.c_void_p) for x in (res, *operands)]
+        if words is not None:
+            args.append(ctypes.c_size_t(words))
+        getattr(self.lib, fname)(*args, ctypes.c_size_t(len(res)))
+        return res
+
+    def ints_to_field_elems(self, values):
+        res = np.empty((len(values), len(self.limbsizes)), dtype=self.np_base_int)
+        for n, (size, shift) in enumerate(zip(self.limbsizes, cumsum(self.limbsizes))):
+            res[:, n] = [(a >> shift) % 2**size for a in values]
+        return res
+
+    def limbs_to_ints(self, limbs):
+        res = [0] * len(limbs[0])
+        for column, shift in zip(limbs, cumsum(self.limbsizes)):
+            res = [r + (c << shift) for r, c in zip(res, column)]
+        return res
+
+    def field_elems_to_ints(self, elems):
+        return self.limbs_to_ints(elems.T.tolist())
+
+    def empty_field_elems(self, count):
+        return np.zeros((count, len(self.limbsizes)), dtype=self.np_base_int)
+
+    def dfield_limbs(self, elems):
+        if self.wordsize == 64:
+            return [
+                [lower + (upper << 64) for lower, upper in zip(lowers, uppers)]
+                for lowers, uppers in zip(
+                    elems[..., 0].T.tolist(), elems[..., 1].T.tolist()
+                )
+            ]
+        return elems.T.tolist()
+
+    def limbs_to_dfield_elems(self, limbs):
+        res = self.empty_dfield_elems(len(limbs[0]))
+        for n, column in enumerate(limbs):
+            if self.wordsize == 64:
+                res[:, n, 0] = [c % 2**64 for c in column]
+                res[:, n, 1] = [c >> 64 for c in column]
+            else:
+                res[:, n] = column
+        return res
+
+    def empty_dfield_elems(self, count):
+        return np.zeros((count,) + self.dfield_shape, dtype=np.uint64)
+
+    def rand_dfield_limbs(self, count, full=True):
+        if full:
+            sizes = [self.wordsize - 1] * len(self.limbsizes)
+        else:
+            sizes = [2 * x for x in self.limbsizes]
+        return [[random.getrandbits(i) for _ in range(count)] for i in sizes]
+
+    def ints_to_arrays(self, values):
+        words = ceil(self.pi / self.wordsize)
+        res = np.empty((len(values), words), dtype=self.np_base_int)
+        for n in range(words):
+            res[:, n] = [(a >> (n * self.wordsize)) % 2**self.wordsize for a in values]
+        return res
+
+    def assertBatchEqual(self, results, expected, description, *operands):
+        self.assertEqual(
+            len(results), len(expected), f"{description}: number of results"
+        )
+        if results == expected:
+            return
+        for n, (res, ref) in enumerate(zip(results, expected)):
+            if res != ref:
+                ops = ", ".join(str(op[n]) for op in operands)
+                self.fail(f"{description}({ops}) = {res} not {ref}")
+
+    def batch_mul(self, fname, bound, no_carry=False):
+        for t, count in enumerate(self.batches()):
+            with self.subTest(batch=t):
+                a = [random.randrange(0, bound) for _ in range(count)]
+                b = [random.randrange(0, bound) for _ in range(count)]
+                if no_carry:
+                    res = self.empty_dfield_elems(count)
+                else:
+                    res = self.empty_field_elems(count)
+                self.call_batch(
+                    fname, res, self.ints_to_field_elems(a), self.ints_to_field_elems(b)
+                )
+                if no_carry:
+                    res = self.limbs_to_ints(self.dfield_limbs(res))
+                else:
+                    res = self.field_elems_to_ints(res)
+                self.assertBatchEqual(
+                    [x % self.p for x in res],
+                    [x * y % self.p for x, y in zip(a, b)],
+                    fname,
+                    a,
+                    b,
+                )
+
+    def batch_sqr(self, fname, bound, no_carry=False):
+        for t, count in enumerate(self.batches()):
+            with self.subTest(batch=t):
+                a = [random.randrange(0, bound) for _ in range(count)]
+                if no_carry:
+                    res = self.empty_dfield_elems(count)
+                else:
+                    res = self.empty_field_elems(count)
+                self.call_batch(fname, res, self.ints_to_field_elems(a))
+                if no_carry:
+                    res = self.limbs_to_ints(self.dfield_limbs(res))
+                else:
+                    res = self.field_elems_to_ints(res)
+                self.assertBatchEqual(
+                    [x % self.p for x in res],
+                    [x * x % self.p for x in a],
+                    fname,
+                    a,
+                )
+
+    def batch_add_limbs(self, fname, mixed):
+        for t, count in enumerate(self.batches()):
+            with self.subTest(batch=t):
+                a = self.rand_dfield_limbs(count, full=False)
+                if mixed:
+                    b = self.ints_to_field_elems(
+                        [random.randrange(0, self.p) for _ in range(count)]
+                    )
+                    b_limbs = b.T.tolist()
+                else:
+                    b_limbs = self.rand_dfield_limbs(count, full=False)
+                    b = self.limbs_to_dfield_elems(b_limbs)
+                res = self.call_batch(
+                    fname,
+                    self.empty_dfield_elems(count),
+                    self.limbs_to_dfield_elems(a),
+                    b,
+                )
+                for n, (res_limbs, x, y) in enumerate(
+                    zip(self.dfield_limbs(res), a, b_limbs)
+                ):
+                    self.assertBatchEqual(
+                        res_limbs,
+                        [i + j for i, j in zip(x, y)],
+                        f"{fname}[{n}]",
+                        x,
+                        y,
+                    )
+
+    def batch_unpack(self, fname, bytesize):
+        for t, count in enumerate(self.batches()):
+            with self.subTest(batch=t):
+                bound = min(2 ** (bytesize * 8), self.p)
+                a = [random.randrange(0, bound) for _ in range(count)]
+                arr = self.ints_to_arrays(a)
+                res = self.call_batch(
+                    fname, self.empty_field_elems(count), arr, words=arr.shape[1]
+                )
+                ref = self.ints_to_field_elems(a)
+                self.assertBatchEqual(res.tolist(), ref.tolist(), fname, a)
+
+    def batch_add(self):
+        for t, count in enumerate(self.batches()):
+            with self.subTest(batch=t):
+                a = self.ints_to_field_elems(
+                    [random.randrange(0, self.p) for _ in range(count)]
+                )
+                b = self.ints_to_field_elems(
+                    [random.randrange(0, self.p) for _ in range(count)]
+                )
+                res = self.call_batch(
+                    "field_add_batch", self.empty_field_elems(count), a, b
+                )
+                self.assertBatchEqual(
+                    res.tolist(),
+                    (a + b).tolist(),
+                    "field_add_batch",
+                    a.tolist(),
+                    b.tolist(),
+                )
+
+    def batch_reduce(self):
+        for t, count in enumerate(self.batches()):
+            with self.subTest(batch=t):
+                a = [random.randrange(0, self.p) for _ in range(count)]
+                a += [random.randrange(self.p, 2**self.pi) for _ in range(count)]
+                res = self.call_batch(
+                    "reduce_batch",
+                    self.empty_field_elems(len(a)),
+                    self.ints_to_field_elems(a),
+                )
+                self.assertBatchEqual(
+                    self.field_elems_to_ints(res),
+                    [x % self.p for x in a],
+                    "reduce_batch",
+                    a,
+                )
+
+    def batch_carry_round(self):
+        for t, count in enumerate(self.batches()):
+            with self.subTest(batch=t):
+                # count elements: reduced integers split as in int_to_dfield_elem,
+                # then random limbs
+                reduced = count // 2
+                rest = [random.randrange(0, self.p) for _ in range(reduced)]
+                limbs = []
+                for size in self.limbsizes:
+                    limbs.append([x % 2 ** (2 * size) for x in rest])
+                    rest = [(x - x % 2 ** (2 * size)) >> size for x in rest]
+                limbs = [
+                    x + y
+                    for x, y in zip(limbs, self.rand_dfield_limbs(count - reduced))
+                ]
+                a = self.limbs_to_ints(limbs)
+                res = self.call_batch(
+                    "carry_round_batch",
+                    self.empty_field_elems(count),
+                    self.limbs_to_dfield_elems(limbs),
+                )
+                self.assertBatchEqual(
+                    self.field_elems_to_ints(res),
+                    [(x >> self.pi) * self.delta + x % 2**self.pi for x in a],
+                    "carry_round_batch",
+                    a,
+                )
+
+    def batch_pack(self):
+        for t, count in enumerate(self.batches()):
+            with self.subTest(batch=t):
+                a = [random.randrange(0, self.p) for _ in range(count)]
+                ref = self.ints_to_arrays(a)
+                res = self.call_batch(
+                    "pack_field_elem_batch",
+                    np.zeros_like(ref),
+                    self.ints_to_field_elems(a),
+                    words=ref.shape[1],
+                )
+                self.assertBatchEqual(
+                    res.tolist(), ref.tolist(), "pack_field_elem_batch", a
+                )
+
     def test_mul(self):
+        if self.batch_size:
+            return self.batch_mul("field_mul_batch", self.p)
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, self.p)
@@ -191,6 +445,8 @@ class TestArith(unittest.TestCase):
                 #     self.assertEqual(i, j, f"{a}*{b} = {j} not {i}")
 
     def test_add(self):
+        if self.batch_size:
+            return self.batch_add()
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, self.p)
@@ -212,6 +468,8 @@ class TestArith(unittest.TestCase):
                     self.assertEqual(i, j, f"({a}+{b})[{n}] = {j} not {i}")
 
     def test_sqr(self):
+        if self.batch_size:
+            return self.batch_sqr("field_sqr_batch", self.p)
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, self.p)
@@ -225,6 +483,8 @@ class TestArith(unittest.TestCase):
                 #     self.assertEqual(i, j, f"{a}^2 = {j} not {i}")
 
     def test_mul_no_carry(self):
+        if self.batch_size:
+            return self.batch_mul("field_mul_no_carry_batch", 2**self.pi, no_carry=True)
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, 2**self.pi)
@@ -243,6 +503,8 @@ class TestArith(unittest.TestCase):
                 )
 
     def test_add_mix(self):
+        if self.batch_size:
+            return self.batch_add_limbs("field_add_mix_batch", mixed=True)
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 b = random.randrange(0, self.p)
@@ -264,6 +526,8 @@ class TestArith(unittest.TestCase):
                     )
 
     def test_add_dbl(self):
+        if self.batch_size:
+            return self.batch_add_limbs("field_add_dbl_batch", mixed=False)
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 arr1, _ = self.rand_dfield_elem(full=False)
@@ -286,6 +550,8 @@ class TestArith(unittest.TestCase):
                     )
 
     def test_sqr_no_carry(self):
+        if self.batch_size:
+            return self.batch_sqr("field_sqr_no_carry_batch", 2**self.pi, no_carry=True)
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, 2**self.pi)
@@ -302,6 +568,8 @@ class TestArith(unittest.TestCase):
                 )
 
     def test_reduce(self):
+        if self.batch_size:
+            return self.batch_reduce()
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, self.p)
@@ -323,6 +591,8 @@ class TestArith(unittest.TestCase):
                 )
 
     def test_carry_round(self):
+        if self.batch_size:
+            return self.batch_carry_round()
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, self.p)
@@ -342,6 +612,8 @@ class TestArith(unittest.TestCase):
                 self.assertEqual(res, ref, f"expected {ref}, got {res}.")
 
     def test_unpack_msg(self):
+        if self.batch_size:
+            return self.batch_unpack("unpack_field_elem_batch", self.blocksize)
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, min(2 ** (self.blocksize * 8), self.p))
@@ -353,6 +625,8 @@ class TestArith(unittest.TestCase):
                     self.assertEqual(i, j)
 
     def test_unpack_key(self):
+        if self.batch_size:
+            return self.batch_unpack("unpack_key_batch", self.keysize)
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, min(2 ** (self.keysize * 8), self.p))
@@ -364,6 +638,8 @@ class TestArith(unittest.TestCase):
                     self.assertEqual(i, j)
 
     def test_pack(self):
+        if self.batch_size:
+            return self.batch_pack()
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, self.p)
@@ -377,6 +653,8 @@ class TestArith(unittest.TestCase):
                     self.assertEqual(i, j)
 
     def test_mul_precomputed(self):
+        if self.batch_size:
+            return self.batch_mul("field_mul_precomputed_batch", self.p)
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, self.p)
@@ -394,6 +672,10 @@ class TestArith(unittest.TestCase):
                 #     self.assertEqual(i, j, f"{a}*{b} = {j} not {i}")
 
     def test_mul_precomputed_no_carry(self):
+        if self.batch_size:
+            return self.batch_mul(
+                "field_mul_precomputed_no_carry_batch", 2**self.pi, no_carry=True
+            )
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, 2**self.pi)
@@ -412,6 +694,8 @@ class TestArith(unittest.TestCase):
                 )
 
     def test_sqr_precomputed(self):
+        if self.batch_size:
+            return self.batch_sqr("field_sqr_precomputed_batch", self.p)
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, self.p)
@@ -427,6 +711,10 @@ class TestArith(unittest.TestCase):
                 #     self.assertEqual(i, j, f"{a}^2 = {j} not {i}")
 
     def test_sqr_precomputed_no_carry(self):
+        if self.batch_size:
+            return self.batch_sqr(
+                "field_sqr_precomputed_no_carry_batch", 2**self.pi, no_carry=True
+            )
         for t in range(0, self.iterations):
             with self.subTest(t=t):
                 a = random.randrange(0, 2**self.pi)
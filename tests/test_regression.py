@@ -0,0 +1,142 @@
+# MIT License
+#
+# Copyright (c) 2026 Jan Gilcher, Jérôme Govinden
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.regression import (
+    IMPROVEMENT,
+    REGRESSION,
+    UNCHANGED,
+    compare_runs,
+    relative_change,
+    summary,
+)
+
+LENGTHS = [16, 1024, 16384]
+SAMPLES = 30
+
+
+class TestRegression(unittest.TestCase):
+    """Compares synthetic benchmark runs, written the way run.py writes results."""
+
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.baseline = Path(self.tmp.name) / "baseline"
+        self.current = Path(self.tmp.name) / "current"
+        self.baseline.mkdir()
+        self.current.mkdir()
+        self.rng = random.Random(0)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def writeRun(self, run: Path, config: str, cycles: dict[int, list[float]]) -> None:
+        with open(run / f"{config}_0_results.csv", "w", encoding="utf-8") as f:
+            print("MessageLength,cycles", file=f)
+            for length, samples in cycles.items():
+                for sample in samples:
+                    print(f"{length},{sample}", file=f)
+            print("#", file=f)
+            print("#" + json.dumps({"name": config}), file=f)
+
+    def noisy(self, scale: float) -> dict[int, list[float]]:
+        return {
+            length: [
+                scale * length * self.rng.uniform(0.99, 1.01) for _ in range(SAMPLES)
+            ]
+            for length in LENGTHS
+        }
+
+    def constant(self, value: float) -> dict[int, list[float]]:
+        return {length: [value] * SAMPLES for length in LENGTHS}
+
+    def compare(self) -> dict:
+        return compare_runs(self.baseline, self.current, threshold=0.05, alpha=0.01)
+
+    def config(self, report: dict, name: str) -> dict:
+        (config,) = [c for c in report["configs"] if c["current"].startswith(name)]
+        return config
+
+    def test_regression(self) -> None:
+        self.writeRun(self.baseline, "slow", self.noisy(1.0))
+        self.writeRun(self.current, "slow", self.noisy(1.5))
+        report = self.compare()
+        config = self.config(report, "slow")
+        self.assertEqual(report["regressions"], 1)
+        self.assertEqual(config["status"], REGRESSION)
+        for length in config["lengths"]:
+            self.assertEqual(length["status"], REGRESSION)
+            self.assertAlmostEqual(length["change"], 0.5, delta=0.05)
+            self.assertGreater(length["effect_size"], 0)
+        self.assertEqual([status for status, _ in summary(report)], [REGRESSION])
+
+    def test_improvement(self) -> None:
+        self.writeRun(self.baseline, "fast", self.noisy(1.0))
+        self.writeRun(self.current, "fast", self.noisy(0.5))
+        report = self.compare()
+        config = self.config(report, "fast")
+        self.assertEqual(report["regressions"], 0)
+        self.assertEqual(config["status"], IMPROVEMENT)
+        for length in config["lengths"]:
+            self.assertEqual(length["status"], IMPROVEMENT)
+            self.assertLess(length["effect_size"], 0)
+
+    def test_identical_samples(self) -> None:
+        # the Mann-Whitney U test gives nan p-values for identical samples
+        self.writeRun(self.baseline, "same", self.constant(100))
+        self.writeRun(self.current, "same", self.constant(100))
+        report = self.compare()
+        config = self.config(report, "same")
+        self.assertEqual(config["status"], UNCHANGED)
+        self.assertEqual(len(config["lengths"]), len(LENGTHS))
+        for length in config["lengths"]:
+            self.assertEqual(length["change"], 0)
+            self.assertEqual(length["p_value"], 1)
+        self.assertEqual(summary(report), [])
+
+    def test_config_in_one_run(self) -> None:
+        self.writeRun(self.baseline, "both", self.noisy(1.0))
+        self.writeRun(self.current, "both", self.noisy(1.0))
+        self.writeRun(self.baseline, "removed", self.noisy(1.0))
+        self.writeRun(self.current, "added", self.noisy(2.0))
+        report = self.compare()
+        self.assertEqual(report["regressions"], 0)
+        self.assertEqual([c["current"] for c in report["configs"]], ["both_0 (both)"])
+        self.assertEqual(report["missing"], ["removed_0 (removed)"])
+        self.assertEqual(report["new"], ["added_0 (added)"])
+
+    def test_zero_baseline(self) -> None:
+        self.writeRun(self.baseline, "zero", self.constant(0))
+        self.writeRun(self.current, "zero", self.noisy(1.0))
+        config = self.config(self.compare(), "zero")
+        self.assertEqual(config["status"], REGRESSION)
+        self.assertEqual(relative_change(0, 0), 0)
+        self.assertEqual(relative_change(0, 10), float("inf"))
+        self.assertEqual(relative_change(10, 15), 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()